@@ -16,6 +16,7 @@ setup(name='sfa',
       	  'six',
           'future',
           'numpy',
+          'scipy',
           'networkx',
           'pandas',
       ],
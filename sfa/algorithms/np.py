@@ -5,11 +5,16 @@ import sys
 if sys.version_info <= (2, 8):
     from builtins import super
 
+import os
 
 import numpy as np
+import scipy.sparse
 import pandas as pd
 
+import sfa.backends
 import sfa.base
+import sfa.plan
+import sfa.stats
 import sfa.utils
 
 
@@ -25,7 +30,17 @@ class NetworkPropagationParameterSet(sfa.base.ParameterSet):
     apply_weight_norm : bool
     use_rel_change : bool
     exsol_forbidden : bool
+    exsol_method : str
+    refresh_ratio : float
+    krylov_method : str
+    acceleration : str
+    anderson_depth : int
     no_inputs : bool
+    backend : str
+    use_sparse : bool
+    use_cache : bool
+    output_only : bool
+    dtype : numpy.dtype
     """
 
     def __init__(self):
@@ -40,7 +55,16 @@ class NetworkPropagationParameterSet(sfa.base.ParameterSet):
         self._apply_weight_norm = False
         self._use_rel_change = False
         self._exsol_forbidden = False
+        self._exsol_method = 'auto'
+        self._refresh_ratio = 0.1
+        self._krylov_method = None
+        self._acceleration = None
+        self._anderson_depth = 5
         self._no_inputs = False
+        self._backend = 'dense'
+        self._use_cache = False
+        self._output_only = False
+        self._dtype = np.dtype(np.float64)
 
     @property
     def alpha(self):
@@ -91,6 +115,13 @@ class NetworkPropagationParameterSet(sfa.base.ParameterSet):
     @property
     def use_rel_change(self):
         """Use relative change for prediction.
+           With the exact solution, the relative changes are computed
+           from the changes in the basal activity
+           (see ``NetworkPropagation._compute_batch_rel_change``),
+           which gives exactly zero for the outputs whose responses
+           to the perturbations cancel out. The difference of
+           two steady-states leaves rounding errors of about 1e-17
+           in such outputs instead, whose signs count in the accuracy.
         """
 
         return self._use_rel_change
@@ -116,6 +147,106 @@ class NetworkPropagationParameterSet(sfa.base.ParameterSet):
 
         self._exsol_forbidden = val
 
+    @property
+    def exsol_method(self):
+        """Method for obtaining the exact solution:
+           'inv' (matrix inversion), 'lu' (LU factorization), or 'auto'.
+           In 'auto' mode, the inverse matrix is computed only if
+           the expected number of solutions is large enough to
+           compensate the cost of inversion.
+           The two methods agree up to rounding errors (about 1e-16
+           relative to the activities), so the signs of the results
+           that are zero in exact arithmetic may differ between them.
+           The default value is 'auto'.
+        """
+        return self._exsol_method
+
+    @exsol_method.setter
+    def exsol_method(self, val):
+        if not isinstance(val, str):
+            raise TypeError("exsol_method should be a str type value.")
+        elif val not in ('auto', 'inv', 'lu'):
+            raise ValueError("exsol_method should be one of "
+                             "'auto', 'inv', or 'lu'.")
+        self._exsol_method = val
+
+    @property
+    def refresh_ratio(self):
+        """Maximum rank of the change in the weight matrix,
+           relative to the number of nodes, for refreshing
+           the exact solution by a low-rank update.
+           If only a few rows or columns of W are changed
+           after the exact solution is prepared, the solution is
+           updated in O(N^2*k) instead of being prepared again.
+           Setting 0.0 disables the low-rank refresh.
+           The default value is 0.1.
+        """
+        return self._refresh_ratio
+
+    @refresh_ratio.setter
+    def refresh_ratio(self, val):
+        if not isinstance(val, float):
+            raise TypeError("refresh_ratio should be a float type value.")
+        elif (val < 0.0) or (val > 1.0):
+            raise ValueError("refresh_ratio should be within [0,1].")
+        self._refresh_ratio = val
+
+    @property
+    def krylov_method(self):
+        """Krylov subspace method for solving (I-aW)x = (1-a)b:
+           'gmres', 'bicgstab', or None.
+           If a method is designated, the steady-state is computed by
+           the Krylov subspace method instead of the exact solution
+           or the iterative method, and the perturbed conditions
+           are computed starting from the steady-state of the control.
+           The default value is None.
+        """
+        return self._krylov_method
+
+    @krylov_method.setter
+    def krylov_method(self, val):
+        if val is not None and not isinstance(val, str):
+            raise TypeError("krylov_method should be a str type value "
+                            "or None.")
+        elif val not in (None, 'gmres', 'bicgstab'):
+            raise ValueError("krylov_method should be one of "
+                             "'gmres', 'bicgstab', or None.")
+        self._krylov_method = val
+
+    @property
+    def acceleration(self):
+        """Acceleration of the iterative method: 'anderson' or None.
+           Anderson mixing extrapolates the next state
+           from the recent states, which reduces the number of iterations
+           if the spectral radius of aW is close to 1.
+           The default value is None.
+        """
+        return self._acceleration
+
+    @acceleration.setter
+    def acceleration(self, val):
+        if val is not None and not isinstance(val, str):
+            raise TypeError("acceleration should be a str type value "
+                            "or None.")
+        elif val not in (None, 'anderson'):
+            raise ValueError("acceleration should be 'anderson' or None.")
+        self._acceleration = val
+
+    @property
+    def anderson_depth(self):
+        """Number of the recent states used in Anderson mixing.
+           The default value is 5.
+        """
+        return self._anderson_depth
+
+    @anderson_depth.setter
+    def anderson_depth(self, val):
+        if not isinstance(val, int):
+            raise TypeError("anderson_depth should be a int type value.")
+        elif val < 1:
+            raise ValueError("anderson_depth should be greater than 0.")
+        self._anderson_depth = val
+
     @property
     def no_inputs(self):
         """Do not apply the effects of inputs in a given network.
@@ -127,6 +258,103 @@ class NetworkPropagationParameterSet(sfa.base.ParameterSet):
         if not isinstance(val, bool):
             raise TypeError("no_inputs is bool type.")
         self._no_inputs = val
+
+    @property
+    def backend(self):
+        """Name of the compute backend registered in ``sfa.backends``:
+           'dense', 'sparse', 'numba', or 'auto'.
+           In 'auto' mode, a backend is selected from the number of nodes,
+           the density of links, and the number of conditions
+           (see ``sfa.backends.select_backend``).
+           The default value is 'dense'.
+        """
+        return self._backend
+
+    @backend.setter
+    def backend(self, val):
+        if not isinstance(val, str):
+            raise TypeError("backend should be a str type value.")
+        elif val != 'auto' \
+                and val not in sfa.backends.get_backend_names(False):
+            raise ValueError("Unknown backend: %s" % (val))
+        self._backend = val
+
+    @property
+    def use_sparse(self):
+        """Use a sparse weight matrix (scipy.sparse CSR format)
+           for the computation. The exact solution is obtained from
+           a sparse LU factorization instead of the matrix inversion,
+           which is suitable for large networks.
+           It is the same as setting ``backend`` to 'sparse'.
+        """
+        return self._backend == 'sparse'
+
+    @use_sparse.setter
+    def use_sparse(self, val):
+        if not isinstance(val, bool):
+            raise TypeError("use_sparse should be a bool type value.")
+        self._backend = 'sparse' if val else 'dense'
+
+    @property
+    def use_cache(self):
+        """Use the cache of the matrices for the exact solution
+           (see ``sfa.cache.get_default_cache``), which is shared by
+           the algorithm objects. The matrices are not computed again
+           for the same weight matrix and parameters.
+           The sparse LU factorization is not cached.
+           The default value is False.
+        """
+        return self._use_cache
+
+    @use_cache.setter
+    def use_cache(self, val):
+        if not isinstance(val, bool):
+            raise TypeError("use_cache should be a bool type value.")
+        self._use_cache = val
+
+    @property
+    def output_only(self):
+        """Compute only the outputs (i.e., the nodes in the columns
+           of data.df_exp) in compute_batch.
+           The output rows of the exact solution are obtained
+           by solving the transposed system for each output
+           (see ``NetworkPropagation.compute_response_kernel``),
+           and then each condition costs O(m*k) for m outputs and
+           k perturbed nodes, instead of a solution of N nodes.
+           It is applied to the data including node type perturbations
+           only, when the exact solution is available.
+           The default value is False.
+        """
+        return self._output_only
+
+    @output_only.setter
+    def output_only(self, val):
+        if not isinstance(val, bool):
+            raise TypeError("output_only should be a bool type value.")
+        self._output_only = val
+
+    @property
+    def dtype(self):
+        """Floating-point type of the computation:
+           numpy.float64 or numpy.float32.
+           Single precision halves the memory and its bandwidth,
+           which is usually enough for the signs of the results
+           (see ``NetworkPropagation.check_precision``).
+           The default value is numpy.float64.
+        """
+        return self._dtype
+
+    @dtype.setter
+    def dtype(self, val):
+        try:
+            dtype = np.dtype(val)
+        except TypeError:
+            raise TypeError("dtype should be a numpy data type.")
+
+        if dtype not in (np.float32, np.float64):
+            raise ValueError("dtype should be numpy.float32 "
+                             "or numpy.float64.")
+        self._dtype = dtype
 # end of def class ParameterSet
 
 
@@ -151,10 +379,22 @@ class NetworkPropagation(sfa.base.Algorithm):
         self._W = None
         self._b = None
 
+        self._backend = sfa.backends.get_backend('dense')
+
         self._exsol_avail = False  # The exact solution is available.
         self._M = None  # A matrix for getting the exact solution.
         self._weight_matrix_invalidated = True
 
+        # Response kernel of the outputs: (key, kernel)
+        self._kernel = None
+
+        # Number of solutions expected with the current weight matrix,
+        # which helps to choose how to prepare the exact solution.
+        self._num_solves_expected = 1
+
+        # Number of iterations performed by the iterative method
+        self._num_iter = 0
+
         self._result = sfa.base.Result()
 
     # end of def __init__
@@ -175,33 +415,93 @@ class NetworkPropagation(sfa.base.Algorithm):
     def W(self, mat):
         self._W = mat
         self._weight_matrix_invalidated = True
+        self._kernel = None
 
     # end of _W.setter
 
+    @property
+    def backend(self):
+        """Compute backend selected in initialize_network.
+        """
+        return self._backend
+
+    @property
+    def num_iter(self):
+        """Total number of iterations performed by the iterative method
+           (or the Krylov subspace method, counting the inner iterations)
+           in the last compute_batch (or in compute calls after that).
+        """
+        return self._num_iter
+
     def initialize_network(self):
 
+        self._backend = self._select_backend()
+        A = self._backend.asmatrix(self.data.A, dtype=self._params.dtype)
+
         # Matrix normalization for getting transition matrix
         if self._params.apply_weight_norm:
-            self.W = sfa.utils.normalize(self.data.A)
+            self.W = sfa.utils.normalize(A)
         else:
-            self.W = np.array(self.data.A, dtype=np.float)
+            self.W = A
 
         self._check_dimension(self.W, "transition matrix")
+        self._prepare_solution()
+
+    # end of def _initialize_network
 
-        if not self.params.exsol_forbidden:
+    def _prepare_solution(self):
+        """Prepare the exact solution for the current W and alpha
+           if it is available, or the iterative solution otherwise.
+        """
+        self._exsol_avail = False
+        if not self.params.exsol_forbidden \
+                and self.params.krylov_method is None:
             # Try to prepare the exact solution
             try:
                 self.prepare_exact_solution()
-                self._check_dimension(self._M, "exact solution matrix")
+                if self._M is not None:
+                    self._check_dimension(self._M, "exact solution matrix")
                 self._exsol_avail = True
-            except np.linalg.LinAlgError:
+            except (np.linalg.LinAlgError, RuntimeError):
+                # RuntimeError is raised by the sparse LU factorization
+                # for a singular matrix.
                 pass
 
         if not self._exsol_avail:
             self.prepare_iterative_solution()
-            self._exsol_avail = False
 
-    # end of def _initialize_network
+    # end of def _prepare_solution
+
+    def _select_backend(self):
+        name = self._params.backend
+        if name != 'auto':
+            return sfa.backends.get_backend(name)
+
+        A = self.data.A
+        N = A.shape[0]
+        if scipy.sparse.issparse(A):
+            num_links = A.nnz
+        else:
+            num_links = np.count_nonzero(np.asarray(A))
+
+        num_conds = 1
+        if getattr(self.data, 'names_ptb', None) is not None:
+            num_conds = max(len(self.data.names_ptb), 1)
+
+        iterative = self._params.exsol_forbidden \
+                    or self._params.krylov_method is not None
+        return sfa.backends.select_backend(N, num_links / float(N*N),
+                                           num_conds, iterative)
+
+    @property
+    def uses_exact_solution(self):
+        """Whether compute() uses the exact solution
+           (i.e., it is available and neither forbidden
+           nor replaced by the Krylov subspace method).
+        """
+        return self._exsol_avail \
+               and not self._params.exsol_forbidden \
+               and self._params.krylov_method is None
 
     def _check_dimension(self, mat, mat_name):
         """Check whether a given matrix is a square matrix.
@@ -210,11 +510,51 @@ class NetworkPropagation(sfa.base.Algorithm):
             raise ValueError("The %s should be square matrix." % (mat_name))
     # end of def _check_dimension
 
-    def initialize_basal_activity(self):
+    def create_basal_activity(self):
+        """Create a new basal activity without the inputs,
+           which initialize_basal_activity assigns to the algorithm.
+        """
         N = self.data.A.shape[0]  # Number of state variables
-        self._b = np.zeros(N)
+        return np.zeros(N, dtype=self._params.dtype)
+
+    def initialize_basal_activity(self):
+        self._b = self.create_basal_activity()
     # end of def
 
+    def _freeze_model(self):
+        if self._W is None:
+            raise ValueError("The algorithm should be initialized "
+                             "before it is compiled.")
+
+        if self._exsol_avail and self._weight_matrix_invalidated:
+            self.prepare_exact_solution()
+
+        if self._exsol_avail and not scipy.sparse.issparse(self._W):
+            # The contexts should not prepare the solution again
+            # by choosing the other method for more solutions.
+            self._params.exsol_method = 'lu' if self._M is None else 'inv'
+
+        # The shared weight matrix cannot be modified in place.
+        W = self._W.copy()
+        if scipy.sparse.issparse(W):
+            W = scipy.sparse.csr_matrix(W)
+            for arr in (W.data, W.indices, W.indptr):
+                arr.flags.writeable = False
+        else:
+            W.flags.writeable = False
+        self._W = W
+
+        # Compile the lazy members of the data in advance.
+        if self.data is not None and self.data.names_ptb is not None:
+            self.ptb_plan
+
+    def _create_run_state(self):
+        super()._create_run_state()
+        if self._b is not None:
+            self._b = self._b.copy()
+        self._num_iter = 0
+        self._num_solves_expected = 1
+
     def apply_inputs(self, inds, vals):
         """
 
@@ -226,58 +566,276 @@ class NetworkPropagation(sfa.base.Algorithm):
             return
 
         # Input condition
-        if hasattr(self.data, 'inputs') and self.data.inputs:
-            inds_inputs = [self.data.n2i[inp] for inp in self.data.inputs]
-            vals_inputs = [val for val in self.data.inputs.values()]
-            inds.extend(inds_inputs)
-            vals.extend(vals_inputs)
-            # end of if
+        plan = self.ptb_plan
+        inds.extend(plan.input_inds.tolist())
+        vals.extend(plan.input_vals.tolist())
 
     # end of def apply_inputs
 
+    @property
+    def ptb_plan(self):
+        """Perturbation plan of the data (``sfa.plan.PerturbationPlan``),
+           which is compiled once for each data object.
+        """
+        return sfa.plan.get_plan(self.data)
+
+    def _get_perturbation(self, target):
+        """Get the type and value of perturbation for a given target.
+        """
+        _, type_ptb, val_ptb = self.ptb_plan.lookup(target)
+        return type_ptb, val_ptb
+
     def apply_perturbations(self, targets, inds, vals, W_ptb=None):
         if self.data.has_link_perturb and W_ptb is None:
             raise ValueError("Weight matrix for perturbation is necessary for "
                              "the data including link type perturbations.")
 
+        plan = self.ptb_plan
         for target in targets:
-            if self.data.df_ptb is not None:
-                type_ptb = self.data.df_ptb.loc[target, "Type"]
-                val_ptb = self.data.df_ptb.loc[target, "Value"]
-            else:
-                type_ptb = 'node'
-                val_ptb = -1
+            idx, type_ptb, val_ptb = plan.lookup(target)
 
             if type_ptb == 'node':
-                inds.append(self.data.n2i[target])
+                inds.append(idx)
                 vals.append(val_ptb)
             elif type_ptb == 'link':
-                idx = self.data.n2i[target]
-                W_ptb[:, idx] *= val_ptb
+                _scale_column(W_ptb, idx, val_ptb)
             elif type_ptb == 'isolation':
-                idx = self.data.n2i[target]
-                W_ptb[:, idx] *= val_ptb
-                W_ptb[idx, :] *= val_ptb
-            else:
-                raise ValueError("Undefined perturbation type: %s" % (type_ptb))
+                _scale_column(W_ptb, idx, val_ptb)
+                _scale_row(W_ptb, idx, val_ptb)
 
     # end of def apply_perturbations
 
+    def apply_perturbations_lowrank(self, targets, inds, vals):
+        """Apply the perturbations as apply_perturbations() does,
+           but the changes in the weight matrix are not applied to a copy
+           of the weight matrix. Instead, they are returned
+           as a low-rank update: W_ptb = W + U*V^T.
+
+        Parameters
+        ----------
+        targets : list
+            List of the names of perturbation targets.
+        inds : list
+            Indices of nodes whose basal activities are perturbed.
+        vals : list
+            Values of the perturbed basal activities.
+
+        Returns
+        -------
+        U : numpy.ndarray
+            2D array of (N x k), where k is the rank of the update.
+        V : numpy.ndarray
+            2D array of (N x k).
+        """
+        cols = {}  # Scales of columns (link and isolation)
+        rows = {}  # Scales of rows (isolation)
+        plan = self.ptb_plan
+        for target in targets:
+            idx, type_ptb, val_ptb = plan.lookup(target)
+
+            if type_ptb == 'node':
+                inds.append(idx)
+                vals.append(val_ptb)
+            elif type_ptb == 'link':
+                cols[idx] = cols.get(idx, 1.0) * val_ptb
+            elif type_ptb == 'isolation':
+                cols[idx] = cols.get(idx, 1.0) * val_ptb
+                rows[idx] = rows.get(idx, 1.0) * val_ptb
+
+        return _lowrank_factors(self.W, rows, cols)
+
+    # end of def apply_perturbations_lowrank
+
     def compute_batch(self):
 
         df_exp = self.data.df_exp  # Result of experiment
 
+        self._num_iter = 0
+        if self.data.has_link_perturb:
+            sim_result = self._compute_batch_link()
+        else:
+            sim_result = self._compute_batch_node()
+
+        df_sim = pd.DataFrame(sim_result,
+                              index=df_exp.index,
+                              columns=df_exp.columns)
+
+        # Get the result of elements in the columns of df_exp.
+        self._result.df_sim = df_sim[df_exp.columns]
+
+    # end of def compute_batch
+
+    def check_precision(self):
+        """Check whether the reduced precision (see ``params.dtype``)
+           changes the signs of the result of compute_batch.
+           The conditions are computed again in double precision
+           with the current weight matrix.
+
+        Returns
+        -------
+        df_changed : pandas.DataFrame
+            Boolean DataFrame where True denotes the element
+            whose sign differs from the result in double precision.
+        """
+        df_sim = self._result.df_sim
+        if df_sim is None:
+            raise ValueError("compute_batch should be called "
+                             "before checking the precision.")
+
+        dtype = self._params.dtype
+        W = self.W
+        b = self._b
+        try:
+            self._params.dtype = np.float64
+            self.W = W.astype(np.float64)
+            if self._b is not None:
+                self._b = np.asarray(b, dtype=np.float64)
+            self.compute_batch()
+            df_ref = self._result.df_sim
+        finally:
+            self._params.dtype = dtype
+            self.W = W
+            self._b = b
+            self._result.df_sim = df_sim
+
+        return sfa.stats.find_sign_changes(df_ref, df_sim)
+
+    # end of def check_precision
+
+    def _compute_control(self, b):
+        """Compute the activity at steady-state under the input condition,
+           which is the control of the relative change.
+        """
+        inds_ba = []  # Indices of nodes to be perturbed
+        vals_ba = []  # Basal activity
+        self.apply_inputs(inds_ba, vals_ba)
+        b[inds_ba] = vals_ba
+        return self.compute(b)
+
+    def create_basal_batch(self, b=None):
+        """Create the basal activities of all conditions in data.
+
+        Parameters
+        ----------
+        b : numpy.ndarray, optional
+            1D array of basal activity to be perturbed.
+            The basal activity of the algorithm is used by default.
+
+        Returns
+        -------
+        B : numpy.ndarray
+            2D array where the i-th row represents the basal activity
+            of the i-th condition (i.e., data.names_ptb[i]).
+        """
+        if b is None:
+            b = self._b
+
+        # The perturbations are applied after the inputs
+        # so that they override the input condition.
+        return self.ptb_plan.create_basal_batch(
+                    np.asarray(b, dtype=self._params.dtype),
+                    inputs=not self._params.no_inputs)
+
+    def _compute_batch_node(self):
+        """Compute all conditions at once, which is possible
+           for the data including node type perturbations only.
+           Every condition is a different basal activity
+           with the same weight matrix.
+        """
+        b = self._b
+
+        if self._params.output_only and self.uses_exact_solution:
+            return self._compute_batch_outputs(b)
+
+        if self._params.use_rel_change and self.uses_exact_solution:
+            return self._compute_batch_rel_change(b)
+
+        x_cnt = None
+        if self._params.use_rel_change or self._params.krylov_method:
+            x_cnt = self._compute_control(b)
+
+        B = self.create_basal_batch(b)
+
+        # Each column of X is the steady-state of a condition.
+        if self._params.krylov_method:
+            X = self.compute(B.T, x0=x_cnt)  # Warm start from the control
+        else:
+            X = self.compute(B.T)
+        if self._params.use_rel_change:  # Use relative change
+            X = X - x_cnt[:, np.newaxis]
+
+        return X[self.data.iadj_to_idf, :].T
+
+    def _compute_batch_rel_change(self, b):
+        """Compute the relative changes of all conditions
+           from the changes in the basal activity, D = B - b_cnt,
+           using (I-aW)^-1 = I + a*(I-aW)^-1*W:
+
+           X - x_cnt = M*D = (1-a)*D + a*M*(W*D).
+
+           The perturbations whose effects cancel out in W*D
+           (e.g., two nodes linked to the same target with opposite
+           signs) give exactly zero changes, rather than the rounding
+           errors of the difference of two solutions,
+           whose signs would count in the accuracy.
+        """
+        inds_ba = []
+        vals_ba = []
+        self.apply_inputs(inds_ba, vals_ba)
+        b[inds_ba] = vals_ba  # The control as in _compute_control
+
+        a = self._params.alpha
+        D = (self.create_basal_batch(b) - b).T
+        X = (1-a)*D + a*self.compute(np.asarray(self._W.dot(D)))
+        return X[self.data.iadj_to_idf, :].T
+
+    def _compute_batch_outputs(self, b):
+        """Compute the outputs of all conditions with the response kernel.
+           Each condition differs from the control in a few nodes
+           of the basal activity, so the outputs are those of the control
+           plus the kernel columns of the perturbed nodes
+           multiplied by the changes.
+        """
+        b_cnt = np.array(b, dtype=self._params.dtype)
+        inds_ba = []
+        vals_ba = []
+        self.apply_inputs(inds_ba, vals_ba)
+        b_cnt[inds_ba] = vals_ba
+
+        R = self.compute_response_kernel()
+        D = self.ptb_plan.create_basal_delta(b_cnt)
+        Y = np.asarray(D.dot(R.T))
+        if not self._params.use_rel_change:
+            Y += R.dot(b_cnt)
+
+        return Y
+
+    def _compute_batch_link(self):
+        """Compute the conditions one by one, since the weight matrix
+           is changed by the link type perturbations.
+           If the exact solution is available, each perturbed
+           weight matrix is handled as a low-rank update of the control,
+           which does not require preparing the exact solution again.
+        """
+        df_exp = self.data.df_exp
+
         # Simulation result
-        sim_result = np.zeros(df_exp.shape, dtype=np.float)
+        sim_result = np.zeros(df_exp.shape, dtype=self._params.dtype)
 
         b = self._b
 
-        if self._params.use_rel_change:
-            inds_ba = []  # Indices of nodes to be perturbed
-            vals_ba = []  # Basal activity
-            self.apply_inputs(inds_ba, vals_ba)
-            b[inds_ba] = vals_ba
-            x_cnt = self.compute(b)
+        use_lowrank = not self._params.exsol_forbidden and self._exsol_avail
+        if use_lowrank:
+            # Every condition solves the system of the control
+            # for the basal activity and the columns of the update.
+            num_solves = len(self.data.names_ptb)
+            for targets_ptb in self.data.names_ptb:
+                num_solves += len(targets_ptb)
+            self._num_solves_expected = num_solves + 1
+
+        x_cnt = None
+        if self._params.use_rel_change or self._params.krylov_method:
+            x_cnt = self._compute_control(b)
 
         W_cnt = self.W
 
@@ -287,16 +845,22 @@ class NetworkPropagation(sfa.base.Algorithm):
             vals_ba = []  # Basal activity
             self.apply_inputs(inds_ba, vals_ba)  # Apply the input condition
 
-            if self.data.has_link_perturb:
+            if use_lowrank:
+                U, V = self.apply_perturbations_lowrank(targets_ptb,
+                                                        inds_ba, vals_ba)
+            else:
                 W_ptb = W_cnt.copy()
                 self.apply_perturbations(targets_ptb, inds_ba, vals_ba, W_ptb)
                 self.W = W_ptb
-            else:
-                self.apply_perturbations(targets_ptb, inds_ba, vals_ba)
 
             b_store = b[inds_ba]
             b[inds_ba] = vals_ba
-            x_exp = self.compute(b)
+            if use_lowrank:
+                x_exp = self.propagate_exact_lowrank(b, U, V)
+            elif self._params.krylov_method:
+                x_exp = self.compute(b, x0=x_cnt)
+            else:
+                x_exp = self.compute(b)
 
             # Result of a single condition
             if self._params.use_rel_change:  # Use relative change
@@ -310,16 +874,11 @@ class NetworkPropagation(sfa.base.Algorithm):
             b[inds_ba] = b_store
         # end of for
 
-        self.W = W_cnt
+        if not use_lowrank:
+            self.W = W_cnt
+        self._num_solves_expected = 1
+        return sim_result
 
-        df_sim = pd.DataFrame(sim_result,
-                              index=df_exp.index,
-                              columns=df_exp.columns)
-
-        # Get the result of elements in the columns of df_exp.
-        self._result.df_sim = df_sim[df_exp.columns]
-
-    # end of def compute_batch
 
     def prepare_exact_solution(self):
         """Prepare to get the matrix for the exact solution.
@@ -331,14 +890,42 @@ class NetworkPropagation(sfa.base.Algorithm):
         """
     # end of def _prepare_iterative_solution
 
-    def compute(self, b):
-        if self.params.exsol_forbidden is True \
+    def compute(self, b, x0=None):
+        """Compute the activity at steady-state.
+           If b is a 2D array, each column is regarded as
+           the basal activity of a condition,
+           and the steady-states are returned in the columns.
+
+        Parameters
+        ----------
+        b : numpy.ndarray
+            1D or 2D array of basal activity.
+        x0 : numpy.ndarray, optional
+            Initial state for the Krylov subspace method
+            or the iterative method (b is used by default).
+        """
+        if x0 is None:
+            x0 = b
+
+        if self.params.krylov_method is not None:
+            x_ss, num_iter = self.propagate_krylov(
+                                self.W, x0, b,
+                                a=self._params.alpha,
+                                lim_iter=self._params.lim_iter,
+                                method=self.params.krylov_method)
+            self._num_iter += int(np.sum(num_iter))
+            return x_ss
+        elif self.params.exsol_forbidden is True \
                 or self._exsol_avail is False:
             alpha = self._params.alpha
             W = self.W
             lim_iter = self._params.lim_iter
-            x_ss, _ = self.propagate_iterative(W, b, b, a=alpha,
-                                               lim_iter=lim_iter)
+            x_ss, num_iter = self.propagate_iterative(
+                                W, x0, b, a=alpha,
+                                lim_iter=lim_iter,
+                                acceleration=self._params.acceleration,
+                                depth=self._params.anderson_depth)
+            self._num_iter += int(np.sum(num_iter))
             return x_ss  # x at steady-state (i.e., stationary state)
         else:
             return self.propagate_exact(b)
@@ -349,10 +936,83 @@ class NetworkPropagation(sfa.base.Algorithm):
         """Obtain the activity at steady-state
         based on the exact solution of network propagation.
 
+        Parameters
+        ----------
+        b : numpy.ndarray
+            1D array of basal activity, or 2D array whose columns
+            are the basal activities of multiple conditions.
+
+        Returns
+        -------
+        x : numpy.ndarray
+            The exact solution of the activity at steady-state
+            in 1D array (or 2D array for multiple conditions).
+        """
+        raise NotImplementedError("propagate_exact is not implemented")
+
+    def propagate_exact_transposed(self, c):
+        """Multiply c by the transpose of the exact solution matrix,
+        M^T, without forming M, where x = M*b is the exact solution.
+
+        Parameters
+        ----------
+        c : numpy.ndarray
+            1D array, or 2D array whose columns are multiplied.
+
+        Returns
+        -------
+        y : numpy.ndarray
+            M^T*c in 1D array (or 2D array for multiple columns).
+        """
+        raise NotImplementedError("propagate_exact_transposed "
+                                  "is not implemented")
+
+    def compute_response_kernel(self, inds=None):
+        """Compute the rows of the exact solution matrix, M,
+        for the given nodes, which is the response of the nodes
+        at steady-state to the basal activity: x[inds] = R*b.
+        The kernel is computed by the transposed solutions
+        for the m nodes, and is reused until W is changed.
+
+        Parameters
+        ----------
+        inds : list of int, optional
+            Indices of the nodes. The indices of the outputs
+            (i.e., data.iadj_to_idf) are used by default.
+
+        Returns
+        -------
+        R : numpy.ndarray
+            2D array of (m x N).
+        """
+        if inds is None:
+            inds = self.data.iadj_to_idf
+
+        inds = np.asarray(inds, dtype=np.int64)
+        key = (self._params.alpha, inds.tobytes())
+        if self._kernel is not None and self._kernel[0] == key:
+            return self._kernel[1]
+
+        N = self._W.shape[0]
+        E = np.zeros((N, inds.size), dtype=self._params.dtype)
+        E[inds, np.arange(inds.size)] = 1
+        R = np.ascontiguousarray(self.propagate_exact_transposed(E).T)
+        self._kernel = (key, R)
+        return R
+
+    def propagate_exact_lowrank(self, b, U, V):
+        """Obtain the exact solution of the activity at steady-state
+        for the weight matrix updated by a low-rank matrix, W + U*V^T,
+        using the exact solution prepared for W.
+
         Parameters
         ----------
         b : numpy.ndarray
             1D array of basal activity.
+        U : numpy.ndarray
+            2D array of (N x k) for the low-rank update.
+        V : numpy.ndarray
+            2D array of (N x k) for the low-rank update.
 
         Returns
         -------
@@ -360,7 +1020,7 @@ class NetworkPropagation(sfa.base.Algorithm):
             The exact solution of the activity at steady-state
             in 1D array.
         """
-        raise NotImplementedError("propagate_exact is not implemented")
+        raise NotImplementedError("propagate_exact_lowrank is not implemented")
 
     def propagate_iterative(self,
                             W,
@@ -369,7 +1029,12 @@ class NetworkPropagation(sfa.base.Algorithm):
                             a=0.5,
                             lim_iter=1000,
                             tol=1e-5,
-                            get_trj=False):
+                            get_trj=False,
+                            trj_stride=1,
+                            trj_fpath=None,
+                            check_interval=1,
+                            acceleration=None,
+                            depth=5):
 
         r"""Compute network propagation based on the iterative method.
         This method should be used if we want to obtain the trajectory.
@@ -382,6 +1047,10 @@ class NetworkPropagation(sfa.base.Algorithm):
             1D array for initial state.
         b: numpy.ndarray
             1D array for basal activity.
+            If b is a 2D array, each column is regarded as the basal
+            activity of a condition, and all conditions are computed
+            together. In this case, xi should be a 2D array
+            of the same shape (or a 1D array for all conditions).
         a: real number, optional
             Hyperparameter, :math:`\alpha`, ~ (0, 1).
             The default value is 0.5.
@@ -393,17 +1062,44 @@ class NetworkPropagation(sfa.base.Algorithm):
             Tolerance for terminating iteration.
             Iteration continues, if Frobenius norm of
             :math:`x(t+1)-x(t)` is greater than ``tol``.
+            For multiple conditions, the norm is checked for each column,
+            and the converged columns are not updated anymore.
             The default value is 1e-5.
         get_trj: bool, optional
             Determine whether the trajectory of the state is returned.
             If get_trj is true, the trajectory is returned.
+        trj_stride: int, optional
+            Record the state of every trj_stride-th iteration
+            in the trajectory. The default value is 1.
+        trj_fpath: str, optional
+            Path of the file where the trajectory is recorded
+            as numpy.memmap, which is useful for large networks.
+            The trajectory is kept in memory by default.
+        check_interval: int, optional
+            Check the termination condition
+            every check_interval iterations.
+            The default value is 1.
+        acceleration: str, optional
+            Acceleration method: 'anderson' or None.
+            In Anderson mixing, the trajectory consists of
+            the extrapolated states, and check_interval is ignored.
+        depth: int, optional
+            Number of the recent states used in Anderson mixing.
+            The default value is 5.
 
         Returns
         -------
         x : numpy.ndarray
-            1D array of the activity after the computation.
+            1D array of the activity after the computation
+            (2D array for multiple conditions).
+        num_iter : int or numpy.ndarray
+            Number of iterations, which is returned if get_trj is false.
+            For multiple conditions, 1D array of the number of iterations
+            for each column is returned.
         trj : numpy.ndarray
-            2D array where the row represents a state of the activity.
+            2D array where the row represents a state of the activity,
+            which is returned if get_trj is true.
+            For multiple conditions, 3D array of (T x N x K).
 
         See also
         --------
@@ -411,4 +1107,196 @@ class NetworkPropagation(sfa.base.Algorithm):
         raise NotImplementedError("propagate_iterative is not implemented")
     # end of def propagate_iterative
 
+    def propagate_krylov(self,
+                         W,
+                         xi,
+                         b,
+                         a=0.5,
+                         lim_iter=1000,
+                         tol=1e-8,
+                         method='gmres'):
+        r"""Compute the activity at steady-state
+        based on a Krylov subspace method.
+
+        Parameters
+        ----------
+        W: numpy.ndarray or scipy.sparse.spmatrix
+            2D array for weight matrix.
+        xi: numpy.ndarray
+            1D array for initial guess (e.g., the steady-state of control).
+        b: numpy.ndarray
+            1D array for basal activity (or 2D array for multiple
+            conditions in the columns).
+        a: real number, optional
+            Hyperparameter, :math:`\alpha`, ~ (0, 1).
+            The default value is 0.5.
+        lim_iter: int, optional
+            Number of maximum iterations of the Krylov subspace method.
+            For GMRES, it limits the number of restart cycles,
+            each of which consists of 20 inner iterations
+            (i.e., the iterations counted in num_iter).
+            RuntimeWarning is issued if the method does not converge
+            within the limit. The default value is 1000.
+        tol: float, optional
+            Relative tolerance of the residual.
+            The default value is 1e-8.
+        method: str, optional
+            'gmres' (restarted GMRES) or 'bicgstab'.
+            The default value is 'gmres'.
+
+        Returns
+        -------
+        x : numpy.ndarray
+            1D array of the activity at steady-state
+            (2D array for multiple conditions).
+        num_iter : int or numpy.ndarray
+            Number of iterations (for each column).
+        """
+        raise NotImplementedError("propagate_krylov is not implemented")
+    # end of def propagate_krylov
+
 # end of def class NetworkPropagation
+
+
+class TrajectoryBuffer(object):
+    """A buffer for recording the trajectory of states.
+       The buffer is preallocated and grows geometrically,
+       so that a state is copied only once when it is recorded.
+       If a file path is given, the buffer is a numpy.memmap on the disk.
+
+    Parameters
+    ----------
+    shape : tuple
+        Shape of a state.
+    lim_size : int
+        Maximum number of states to be recorded.
+    fpath : str, optional
+        Path of the file for numpy.memmap.
+    dtype : data-type, optional
+        Data type of the states.
+    """
+
+    def __init__(self, shape, lim_size, fpath=None, dtype=np.float64):
+        self._shape = tuple(shape)
+        self._lim_size = lim_size
+        self._fpath = fpath
+        self._dtype = np.dtype(dtype)
+        self._size = 0
+        self._buf = None
+        self._resize(min(lim_size, 16))
+
+    def __len__(self):
+        return self._size
+
+    def _resize(self, capacity):
+        if self._fpath is None:
+            buf = np.empty((capacity,) + self._shape, dtype=self._dtype)
+            if self._buf is not None:
+                buf[:self._size] = self._buf[:self._size]
+            self._buf = buf
+            return
+
+        if self._buf is not None:
+            self._buf.flush()
+            self._buf = None  # Release the mapping before resizing the file.
+
+        nbytes = capacity * self._dtype.itemsize
+        for dim in self._shape:
+            nbytes *= dim
+
+        mode = 'ab' if os.path.exists(self._fpath) else 'wb'
+        with open(self._fpath, mode) as fout:
+            fout.truncate(nbytes)
+
+        self._buf = np.memmap(self._fpath, dtype=self._dtype, mode='r+',
+                              shape=(capacity,) + self._shape)
+
+    def append(self, x):
+        if self._size == self._buf.shape[0]:
+            self._resize(min(2*self._size, self._lim_size))
+
+        self._buf[self._size] = x
+        self._size += 1
+
+    def to_array(self):
+        """Get the recorded states. The states are
+           in the rows of the returned array.
+        """
+        if self._fpath is not None:
+            self._resize(self._size)  # Shrink the file
+            return self._buf
+
+        return self._buf[:self._size]
+
+# end of class TrajectoryBuffer
+
+
+def _float_dtype(W):
+    """Get the floating-point type of the computation with W.
+    """
+    if np.issubdtype(W.dtype, np.floating):
+        return W.dtype
+    return np.dtype(np.float64)
+
+
+def _to_dense(mat):
+    if scipy.sparse.issparse(mat):
+        return mat.toarray()
+    return np.asarray(mat)
+
+
+def _lowrank_factors(W, rows, cols):
+    """Get U and V satisfying D_r*W*D_c = W + U*V^T,
+       where D_r and D_c are diagonal matrices of the scales
+       for the rows and columns.
+
+    Parameters
+    ----------
+    W : numpy.ndarray or scipy.sparse.spmatrix
+        Weight matrix.
+    rows : dict
+        Scales of the rows (index -> scale).
+    cols : dict
+        Scales of the columns (index -> scale).
+    """
+    N = W.shape[0]
+    ic = np.array(sorted(cols), dtype=np.int64)
+    ir = np.array(sorted(rows), dtype=np.int64)
+    sc = np.array([cols[i] for i in ic], dtype=np.float64)
+    sr = np.ones((N,), dtype=np.float64)
+    sr[ir] = [rows[i] for i in ir]
+
+    # Changes in the scaled columns (including the scaled rows)
+    W_cols = _to_dense(W[:, ic])
+    U_cols = (sr[:, np.newaxis]*sc - 1) * W_cols
+    V_cols = np.zeros((N, ic.size), dtype=np.float64)
+    V_cols[ic, np.arange(ic.size)] = 1
+
+    # Changes in the scaled rows except the scaled columns
+    W_rows = _to_dense(W[ir, :])
+    W_rows[:, ic] = 0
+    U_rows = np.zeros((N, ir.size), dtype=np.float64)
+    U_rows[ir, np.arange(ir.size)] = 1
+    V_rows = ((sr[ir] - 1)[:, np.newaxis] * W_rows).T
+
+    U = np.hstack([U_cols, U_rows])
+    V = np.hstack([V_cols, V_rows])
+    return U, V
+
+
+def _scale_column(W, idx, val):
+    """Multiply the idx-th column of W by val in place.
+    """
+    if scipy.sparse.issparse(W) and W.format == 'csr':
+        W.data[W.indices == idx] *= val
+    else:
+        W[:, idx] *= val
+
+
+def _scale_row(W, idx, val):
+    """Multiply the idx-th row of W by val in place.
+    """
+    if scipy.sparse.issparse(W) and W.format == 'csr':
+        W.data[W.indptr[idx]:W.indptr[idx+1]] *= val
+    else:
+        W[idx, :] *= val
@@ -4,10 +4,21 @@ import sys
 if sys.version_info <= (2, 8):
     from builtins import super
 
+import inspect
+import warnings
+
 import numpy as np
+import pandas as pd
+import scipy.linalg
+import scipy.sparse
+import scipy.sparse.linalg
 
+import sfa.cache
+import sfa.stats
 from .np import NetworkPropagation
 from .np import NetworkPropagationParameterSet
+from .np import TrajectoryBuffer
+from .np import _float_dtype
 
 
 def create_algorithm(abbr):
@@ -26,6 +37,17 @@ class SignalPropagation(NetworkPropagation):
     def __init__(self, abbr):
         super().__init__(abbr)
         self._name = "Signal propagation algorithm"
+        self._lu = None  # LU factorization of (I-aW)
+
+        # Low-rank correction of the LU factorization: (Z, LU of C, V^T)
+        self._lowrank = None
+
+        # Weight matrix and solution of the last full preparation,
+        # which are the base of the low-rank refresh.
+        self._W_base = None
+        self._alpha_base = None
+        self._M_base = None
+        self._lu_base = None
     # end of def __init__
 
     def prepare_exact_solution(self):
@@ -44,14 +66,199 @@ class SignalPropagation(NetworkPropagation):
               s = (I-aW)^-1 * (1-a)b
               s = M*b, where M is (1-a)(I-aW)^-1.
 
-        This method is to get the matrix, M for preparing the exact solution
+        This method is to get the matrix, M for preparing the exact solution.
+        However, M is computed only if it is worth the cost of inversion
+        (see ``exsol_method`` parameter). Otherwise, the LU factorization
+        of (I-aW) is prepared, and the exact solution is obtained
+        by solving the linear system with the factorization.
+        If W is a sparse matrix, the sparse LU factorization is always used,
+        since the inverse of a sparse matrix is usually dense.
+        If ``use_cache`` parameter is true, the matrices are
+        taken from the cache if they were computed for the same W.
+        If W differs from that of the last preparation in a few
+        rows or columns (see ``refresh_ratio`` parameter),
+        the last solution is refreshed by a low-rank update.
         """
         W = self._W
         a = self._params.alpha
-        M0 = np.eye(W.shape[0]) - a*W
-        self._M = (1-a)*np.linalg.inv(M0)
+        self._M = None
+        self._lu = None
+        self._lowrank = None
+        dtype = _float_dtype(W)
+        if scipy.sparse.issparse(W):
+            M0 = scipy.sparse.identity(W.shape[0], dtype=dtype,
+                                       format='csc') - a*W
+            self._lu = scipy.sparse.linalg.splu(scipy.sparse.csc_matrix(M0))
+            self._weight_matrix_invalidated = False
+            return
+
+        use_inverse = self._use_inverse()
+        if self._refresh_exact_solution(use_inverse):
+            self._weight_matrix_invalidated = False
+            return
+
+        if self._params.use_cache:
+            cache = sfa.cache.get_default_cache()
+            key = cache.make_key(
+                        W,
+                        alpha=a,
+                        apply_weight_norm=self._params.apply_weight_norm,
+                        method='inv' if use_inverse else 'lu')
+            item = cache.get(key)
+            if item is not None:
+                if use_inverse:
+                    self._M = item[0]
+                else:
+                    self._lu = item
+
+        if self._M is None and self._lu is None:
+            M0 = np.eye(W.shape[0], dtype=dtype) - a*W
+            if use_inverse:
+                self._M = (1-a)*np.linalg.inv(M0)
+            else:
+                self._lu = _lu_factor(M0)
+
+            if self._params.use_cache:
+                cache.put(key, (self._M,) if use_inverse else self._lu)
+
+        # The base of the low-rank refresh, which keeps a copy of W
+        # only if the refresh is enabled.
+        self._W_base = W.copy() if self._params.refresh_ratio > 0 else None
+        self._alpha_base = a
+        self._M_base = self._M
+        self._lu_base = self._lu
+
+        self._weight_matrix_invalidated = False
     # end of def _prepare_exact_solution
 
+    def _refresh_exact_solution(self, use_inverse):
+        """Refresh the base solution for the current W
+           by Sherman-Morrison-Woodbury formula, if the change in W
+           is restricted to k rows or columns, where k is at most
+           refresh_ratio*N. It returns False if the refresh is not
+           possible (or disabled), so that the solution should be
+           prepared again.
+        """
+        W = self._W
+        W_base = self._W_base
+        a = self._params.alpha
+        if self._params.refresh_ratio == 0 \
+                or W_base is None or W_base.shape != W.shape \
+                or W_base.dtype != W.dtype \
+                or self._alpha_base != a \
+                or (self._M_base is not None) != use_inverse:
+            return False
+
+        N = W.shape[0]
+        D = W - W_base
+        mask = (D != 0)
+        rows = np.flatnonzero(mask.any(axis=1))
+        cols = np.flatnonzero(mask.any(axis=0))
+        k = min(rows.size, cols.size)
+        if k > self._params.refresh_ratio * N:
+            return False
+
+        self._M = self._M_base
+        self._lu = self._lu_base
+        if k == 0:
+            return True
+
+        # D = U*V^T, where either U or V selects the changed vectors.
+        if cols.size <= rows.size:
+            U = D[:, cols]
+            Vt = np.zeros((k, N), dtype=D.dtype)
+            Vt[np.arange(k), cols] = 1
+        else:
+            U = np.zeros((N, k), dtype=D.dtype)
+            U[rows, np.arange(k)] = 1
+            Vt = D[rows, :]
+
+        if use_inverse:
+            Z = self._M_base.dot(U) / (1-a)  # (I-aW)^-1 * U
+            C = np.eye(k) - a*Vt.dot(Z)
+            self._M = self._M_base \
+                      + a*Z.dot(np.linalg.solve(C, Vt.dot(self._M_base)))
+        else:
+            Z = _lu_solve(self._lu_base, U)
+            C = np.eye(k) - a*Vt.dot(Z)
+            self._lowrank = (Z, _lu_factor(C), Vt)
+
+        return True
+
+    # end of def _refresh_exact_solution
+
+    def _freeze_model(self):
+        super()._freeze_model()
+
+        # The run contexts share the dense solutions read-only,
+        # which are copied once from the algorithm
+        # (see _lu_solve for the pivot indices).
+        frozen = {}
+
+        def freeze(arr):
+            if not isinstance(arr, np.ndarray):
+                return arr
+            if id(arr) not in frozen:
+                arr_frozen = arr.copy()
+                arr_frozen.flags.writeable = False
+                frozen[id(arr)] = arr_frozen
+            return frozen[id(arr)]
+
+        def freeze_lu(lu_and_piv):
+            if lu_and_piv is None:
+                return None
+            return tuple(freeze(arr) for arr in lu_and_piv)
+
+        lu_shared = self._lu_base is self._lu
+        self._lu = freeze_lu(self._lu)
+        self._lu_base = self._lu if lu_shared else freeze_lu(self._lu_base)
+        self._M = freeze(self._M)
+        self._M_base = freeze(self._M_base)
+        if self._lowrank is not None:
+            Z, lu_C, Vt = self._lowrank
+            self._lowrank = (freeze(Z), freeze_lu(lu_C), freeze(Vt))
+
+    def propagate_exact_lowrank(self, b, U, V):
+        """
+        Get the exact solution for the weight matrix, W + U*V^T,
+        based on Sherman-Morrison-Woodbury formula:
+
+        .. :math
+            (I - a(W + UV^T))^-1 = P + aPU(I - aV^T*P*U)^-1 V^T*P,
+            where P is (I-aW)^-1.
+
+        Only k solutions with the prepared exact solution of W
+        are required for the rank-k update,
+        instead of preparing the exact solution again.
+        """
+        y = self.propagate_exact(b)
+        if U.shape[1] == 0:
+            return y
+
+        a = self._params.alpha
+        Z = self.propagate_exact(U) / (1-a)  # P*U
+        C = np.eye(U.shape[1]) - a*V.T.dot(Z)
+        return y + a*Z.dot(np.linalg.solve(C, V.T.dot(y)))
+
+    def _use_inverse(self):
+        """Decide whether M, the inverse of (I-aW), is computed
+           for the exact solution.
+        """
+        if scipy.sparse.issparse(self._W):
+            return False
+
+        method = self._params.exsol_method
+        if method == 'inv':
+            return True
+        elif method == 'lu':
+            return False
+
+        # The inversion costs about twice of the LU factorization,
+        # while the matrix-vector product is cheaper than the two
+        # triangular solves only by a constant factor.
+        # Therefore, the inversion pays off only for a lot of solutions.
+        return self._num_solves_expected > self._W.shape[0]
+
     def prepare_iterative_solution(self):
         pass  # Nothing...
     # end of def prepare_iterative_solution
@@ -59,10 +266,46 @@ class SignalPropagation(NetworkPropagation):
     def propagate_exact(self, b):
         if self._weight_matrix_invalidated:
             self.prepare_exact_solution()
-            
-        return self._M.dot(b)
+        elif self._M is None and self._use_inverse():
+            # More solutions are expected than when the LU factorization
+            # was prepared, so the inversion is worth the cost now.
+            self.prepare_exact_solution()
+
+        b = np.asarray(b, dtype=_float_dtype(self._W))
+        if self._M is not None:
+            return self._M.dot(b)
+
+        a = self._params.alpha
+        if scipy.sparse.issparse(self._W):
+            return (1-a)*self._lu.solve(b)
+
+        x = (1-a)*_lu_solve(self._lu, b)
+        if self._lowrank is not None:
+            Z, lu_C, Vt = self._lowrank
+            x = x + a*Z.dot(_lu_solve(lu_C, Vt.dot(x)))
+        return x
     # end of def propagate_exact
 
+    def propagate_exact_transposed(self, c):
+        if self._weight_matrix_invalidated:
+            self.prepare_exact_solution()
+
+        c = np.asarray(c, dtype=_float_dtype(self._W))
+        if self._M is not None:
+            return self._M.T.dot(c)
+
+        a = self._params.alpha
+        if scipy.sparse.issparse(self._W):
+            return (1-a)*self._lu.solve(c, trans='T')
+
+        if self._lowrank is not None:
+            # The transpose of the Woodbury correction in propagate_exact
+            Z, lu_C, Vt = self._lowrank
+            c = c + a*Vt.T.dot(_lu_solve(lu_C, Z.T.dot(c), trans=1))
+
+        return (1-a)*_lu_solve(self._lu, c, trans=1)
+    # end of def propagate_exact_transposed
+
     def propagate_iterative(self,
                             W,
                             xi,
@@ -70,45 +313,488 @@ class SignalPropagation(NetworkPropagation):
                             a=0.5,
                             lim_iter=1000,
                             tol=1e-5,
-                            get_trj=False):
+                            get_trj=False,
+                            trj_stride=1,
+                            trj_fpath=None,
+                            check_interval=1,
+                            acceleration=None,
+                            depth=5):
 
+        if trj_stride < 1:
+            raise ValueError("trj_stride should be a positive integer.")
 
-        n = W.shape[0]
-        # Initial values
+        if check_interval < 1:
+            raise ValueError("check_interval should be a positive integer.")
 
-        #x0 = np.zeros((n,), dtype=np.float)
-        #x0[:] = xi
-        x0 = np.array(xi, dtype=np.float64)
+        if acceleration == 'anderson':
+            return self._propagate_anderson(W, xi, b, a, lim_iter, tol,
+                                            depth, get_trj,
+                                            trj_stride, trj_fpath)
+        elif acceleration is not None:
+            raise ValueError("Unknown acceleration: %s" % (acceleration))
 
-        x_t1 = x0.copy()
+        if np.ndim(b) == 2:
+            return self._propagate_iterative_batch(W, xi, b, a,
+                                                   lim_iter, tol, get_trj,
+                                                   trj_stride, trj_fpath,
+                                                   check_interval)
+
+        # Initial values
+        dtype = _float_dtype(W)
+        x_t1 = np.array(xi, dtype=dtype)
+        x_t2 = np.empty_like(x_t1)
+        diff = np.empty_like(x_t1)
+
+        # The basal term is the same in all iterations.
+        b_t = ((1-a)*np.asarray(b)).astype(dtype, copy=False)
 
         if get_trj:
             # Record the initial states
-            trj_x = []
-            trj_x.append(x_t1.copy())
+            trj_x = TrajectoryBuffer(x_t1.shape, lim_iter//trj_stride + 1,
+                                     trj_fpath, dtype)
+            trj_x.append(x_t1)
 
         # Main loop
         num_iter = 0
         for i in range(lim_iter):
-            # Main formula
-            x_t2 = a*W.dot(x_t1) + (1-a)*b
+            # Main formula: x(t+1) = a*W*x(t) + (1-a)*b
+            self._backend.matvec(W, x_t1, x_t2)
+            x_t2 *= a
+            x_t2 += b_t
             num_iter += 1
+
             # Check termination condition
-            if np.linalg.norm(x_t2 - x_t1) <= tol:
-                break
+            if num_iter % check_interval == 0:
+                np.subtract(x_t2, x_t1, out=diff)
+                if np.sqrt(diff.dot(diff)) <= tol:
+                    break
 
             # Add the current state to the trajectory
-            if get_trj:
+            if get_trj and num_iter % trj_stride == 0:
                 trj_x.append(x_t2)
 
-            # Update the state
-            x_t1 = x_t2.copy()
+            # Update the state by swapping the buffers
+            x_t1, x_t2 = x_t2, x_t1
+        else:
+            x_t2 = x_t1  # The latest state after the last swapping
         # end of for
 
         if get_trj is False:
             return x_t2, num_iter
         else:
-            return x_t2, np.array(trj_x)
+            return x_t2, trj_x.to_array()
 
     # end of def propagate_iterative
+
+    def _propagate_iterative_batch(self, W, xi, b, a, lim_iter, tol, get_trj,
+                                   trj_stride=1, trj_fpath=None,
+                                   check_interval=1):
+        """Iterate all columns of b together by matrix-matrix products.
+           A column is excluded from the computation once it converges,
+           so each column has the same result as it is computed alone.
+        """
+        dtype = _float_dtype(W)
+        b = np.asarray(b, dtype=dtype)
+        n, k = b.shape
+
+        x = np.empty((n, k), dtype=dtype)
+        x[:, :] = np.array(xi, dtype=dtype).reshape(n, -1)
+        num_iter = np.zeros((k,), dtype=np.int64)
+
+        active = np.arange(k)  # Indices of the columns not converged
+        x_t1 = x.copy()
+        b_act = ((1-a)*b).astype(dtype, copy=False)
+
+        if get_trj:
+            # Record the initial states
+            trj_x = TrajectoryBuffer(x.shape, lim_iter//trj_stride + 1,
+                                     trj_fpath, dtype)
+            trj_x.append(x)
+
+        # Main loop
+        for i in range(lim_iter):
+            # Main formula
+            x_t2 = a*W.dot(x_t1) + b_act
+            num_iter[active] += 1
+            x[:, active] = x_t2
+
+            if (i+1) % check_interval != 0:
+                if get_trj and (i+1) % trj_stride == 0:
+                    trj_x.append(x)
+                x_t1 = x_t2
+                continue
+
+            # Check termination condition for each column
+            diff = x_t2 - x_t1
+            norms = np.sqrt(np.einsum('ij,ij->j', diff, diff))
+            not_conv = norms > tol
+            if not not_conv.any():
+                break
+
+            # Add the current state to the trajectory
+            if get_trj and (i+1) % trj_stride == 0:
+                trj_x.append(x)
+
+            # Update the states of the columns not converged
+            active = active[not_conv]
+            x_t1 = x_t2[:, not_conv]
+            b_act = b_act[:, not_conv]
+        # end of for
+
+        if get_trj is False:
+            return x, num_iter
+        else:
+            return x, trj_x.to_array()
+
+    # end of def _propagate_iterative_batch
+
+    def _propagate_anderson(self, W, xi, b, a, lim_iter, tol, depth,
+                            get_trj, trj_stride=1, trj_fpath=None):
+        """Iterate the fixed-point map, g(x) = a*W*x + (1-a)*b,
+           with Anderson mixing of the recent depth states.
+           The termination condition is the same as propagate_iterative.
+        """
+        if np.ndim(b) == 2:
+            return self._propagate_anderson_batch(W, xi, b, a, lim_iter, tol,
+                                                  depth, get_trj,
+                                                  trj_stride, trj_fpath)
+
+        dtype = _float_dtype(W)
+        x = np.array(xi, dtype=dtype)
+        n = x.shape[0]
+        b_t = ((1-a)*np.asarray(b)).astype(dtype, copy=False)
+
+        g = np.empty_like(x)
+        f = np.empty_like(x)
+        f_prev = np.empty_like(x)
+        g_prev = np.empty_like(x)
+
+        # Differences of the residuals and the mapped states
+        dF = np.empty((n, depth), dtype=dtype)
+        dG = np.empty((n, depth), dtype=dtype)
+        num_hist = 0
+        pos = 0  # Position of the oldest difference in the history
+
+        if get_trj:
+            # Record the initial states
+            trj_x = TrajectoryBuffer(x.shape, lim_iter//trj_stride + 1,
+                                     trj_fpath, dtype)
+            trj_x.append(x)
+
+        # Main loop
+        num_iter = 0
+        for i in range(lim_iter):
+            self._backend.matvec(W, x, g)
+            g *= a
+            g += b_t
+            num_iter += 1
+
+            # Check termination condition
+            np.subtract(g, x, out=f)
+            if np.sqrt(f.dot(f)) <= tol:
+                break
+
+            if i > 0:
+                np.subtract(f, f_prev, out=dF[:, pos])
+                np.subtract(g, g_prev, out=dG[:, pos])
+                pos = (pos + 1) % depth
+                num_hist = min(num_hist + 1, depth)
+
+            f_prev[:] = f
+            g_prev[:] = g
+
+            if num_hist > 0:
+                # Find the mixing coefficients minimizing the residual
+                gamma = np.linalg.lstsq(dF[:, :num_hist], f, rcond=None)[0]
+                x = g - dG[:, :num_hist].dot(gamma.astype(dtype))
+            else:
+                x = g.copy()
+
+            # Add the current state to the trajectory
+            if get_trj and num_iter % trj_stride == 0:
+                trj_x.append(x)
+        # end of for
+
+        if get_trj is False:
+            return g, num_iter
+        else:
+            return g, trj_x.to_array()
+
+    # end of def _propagate_anderson
+
+    def _propagate_anderson_batch(self, W, xi, b, a, lim_iter, tol, depth,
+                                  get_trj, trj_stride=1, trj_fpath=None):
+        """Apply Anderson mixing to each column of b,
+           since the mixing coefficients differ in each condition.
+        """
+        dtype = _float_dtype(W)
+        b = np.asarray(b, dtype=dtype)
+        n, k = b.shape
+
+        x0 = np.empty((n, k), dtype=dtype)
+        x0[:, :] = np.array(xi, dtype=dtype).reshape(n, -1)
+
+        x = np.empty((n, k), dtype=dtype)
+        num_iter = np.zeros((k,), dtype=np.int64)
+        trjs = []
+        for j in range(k):
+            x[:, j], res = self._propagate_anderson(W, x0[:, j], b[:, j], a,
+                                                    lim_iter, tol, depth,
+                                                    get_trj, trj_stride)
+            if get_trj:
+                trjs.append(res)
+            else:
+                num_iter[j] = res
+        # end of for
+
+        if get_trj is False:
+            return x, num_iter
+
+        # The converged columns stay at their last states
+        # as in _propagate_iterative_batch.
+        size = max(trj.shape[0] for trj in trjs)
+        trj_x = TrajectoryBuffer((n, k), size, trj_fpath, dtype)
+        for t in range(size):
+            trj_x.append(np.stack([trj[min(t, trj.shape[0] - 1)]
+                                   for trj in trjs], axis=1))
+        return x, trj_x.to_array()
+
+    # end of def _propagate_anderson_batch
+
+    def propagate_krylov(self,
+                         W,
+                         xi,
+                         b,
+                         a=0.5,
+                         lim_iter=1000,
+                         tol=1e-8,
+                         method='gmres'):
+        """
+        Solve (I-aW)x = (1-a)b with a Krylov subspace method,
+        which only requires the products of W and vectors.
+        Thus, it works for both dense and sparse W
+        without preparing the exact solution.
+        RuntimeWarning is issued for the solution not converged
+        within lim_iter iterations, which are the restart cycles
+        (of 20 inner iterations each) in GMRES.
+        The solver works in float64, and the solution is cast
+        to the dtype of the parameters.
+        """
+        if method == 'gmres':
+            solver = scipy.sparse.linalg.gmres
+        elif method == 'bicgstab':
+            solver = scipy.sparse.linalg.bicgstab
+        else:
+            raise ValueError("Unknown Krylov subspace method: %s" % (method))
+
+        n = W.shape[0]
+        A = scipy.sparse.linalg.LinearOperator((n, n),
+                                               matvec=lambda x: x - a*W.dot(x),
+                                               dtype=np.float64)
+
+        dtype = self._params.dtype
+        b = np.asarray(b, dtype=np.float64)
+        if b.ndim == 1:
+            xi = np.asarray(xi, dtype=np.float64)
+            x, num_iter = _solve_krylov(solver, A, (1-a)*b, xi,
+                                        tol, lim_iter)
+            return x.astype(dtype, copy=False), num_iter
+
+        # Multiple conditions
+        xi = np.asarray(xi, dtype=np.float64).reshape(n, -1)
+        x = np.zeros(b.shape, dtype=dtype)
+        num_iter = np.zeros((b.shape[1],), dtype=np.int64)
+        for j in range(b.shape[1]):
+            x0 = xi[:, j] if xi.shape[1] > 1 else xi[:, 0]
+            x[:, j], num_iter[j] = _solve_krylov(solver, A, (1-a)*b[:, j],
+                                                 x0, tol, lim_iter)
+        return x, num_iter
+
+    # end of def propagate_krylov
+
+    def propagate_alphas(self, alphas, b, W=None):
+        """
+        Get the exact solutions for multiple values of alpha
+        based on a single Schur decomposition of W:
+
+        .. :math
+            W = ZTZ^H, where T is an upper triangular matrix.
+            (I-aW)^-1 = Z(I-aT)^-1 Z^H
+
+        Each value of alpha requires only a triangular solve
+        instead of a new inversion.
+
+        Parameters
+        ----------
+        alphas : sequence of float
+            Values of alpha.
+        b : numpy.ndarray
+            1D array of basal activity (or 2D array for multiple
+            conditions in the columns).
+        W : numpy.ndarray, optional
+            Weight matrix. The weight matrix of the algorithm
+            is used by default.
+
+        Returns
+        -------
+        X : numpy.ndarray
+            The i-th item is the activity at steady-state
+            for alphas[i] (i.e., X[i] has the same shape of b)
+            in the dtype of the parameters.
+        """
+        if W is None:
+            W = self._W
+
+        if scipy.sparse.issparse(W):
+            W = W.toarray()
+
+        T, Z = scipy.linalg.schur(W, output='complex')
+        c = Z.conj().T.dot(b)
+        I = np.eye(T.shape[0])
+
+        X = np.zeros((len(alphas),) + np.shape(b), dtype=self._params.dtype)
+        for i, a in enumerate(alphas):
+            M0 = I - a*T
+            if np.any(np.diag(M0) == 0):
+                raise np.linalg.LinAlgError("Singular matrix for alpha=%f"
+                                            % (a))
+            y = scipy.linalg.solve_triangular(M0, c, check_finite=False)
+            X[i] = (1-a)*Z.dot(y).real
+        # end of for
+
+        return X
+
+    # end of def propagate_alphas
+
+    def compute_batch_alphas(self, alphas):
+        """Compute the batch for multiple values of alpha.
+        For the data including node type perturbations only,
+        all conditions are computed for all values of alpha with
+        a single Schur decomposition (see propagate_alphas()).
+        Otherwise, compute_batch() is called for each value of alpha.
+        The current weight matrix is used for all values of alpha,
+        and the alpha of the parameters is not changed
+        after the computation.
+
+        Parameters
+        ----------
+        alphas : sequence of float
+            Values of alpha.
+
+        Returns
+        -------
+        results : dict
+            pandas.DataFrame of the simulation result for each alpha.
+        acc : pandas.Series
+            Accuracy of the simulation result for each alpha.
+        """
+        df_exp = self.data.df_exp
+        results = {}
+
+        if self.data.has_link_perturb:
+            # The current W (e.g., assigned by the user) is used
+            # for all values of alpha, and the solution is prepared
+            # again for each of them.
+            alpha_org = self._params.alpha
+            W_org = self.W
+            try:
+                for a in alphas:
+                    self._params.alpha = float(a)
+                    self.W = W_org
+                    self._prepare_solution()
+                    self.compute_batch()
+                    results[a] = self._result.df_sim
+            finally:
+                self._params.alpha = alpha_org
+                self.W = W_org
+                self._prepare_solution()
+        else:
+            b = self._b.copy()
+            inds_ba = []
+            vals_ba = []
+            self.apply_inputs(inds_ba, vals_ba)
+            b_cnt = b.copy()
+            b_cnt[inds_ba] = vals_ba
+
+            # The last column is the control.
+            B = np.column_stack([self.create_basal_batch(b).T, b_cnt])
+            X = self.propagate_alphas(alphas, B)
+
+            for i, a in enumerate(alphas):
+                X_ptb = X[i, :, :-1]
+                if self._params.use_rel_change:
+                    X_ptb = X_ptb - X[i, :, -1:]
+
+                results[a] = pd.DataFrame(X_ptb[self.data.iadj_to_idf, :].T,
+                                          index=df_exp.index,
+                                          columns=df_exp.columns)
+            # end of for
+
+        acc = pd.Series([sfa.stats.calc_accuracy(results[a], df_exp)
+                         for a in alphas], index=list(alphas))
+        return results, acc
+
+    # end of def compute_batch_alphas
 # end of def class SignalPropagation
+
+
+def _lu_factor(M0):
+    """LU factorization of a dense matrix, which raises
+       numpy.linalg.LinAlgError for a singular matrix
+       as numpy.linalg.inv does.
+    """
+    lu, piv = scipy.linalg.lu_factor(M0, check_finite=False)
+    if np.any(np.diag(lu) == 0):
+        raise np.linalg.LinAlgError("Singular matrix")
+    return lu, piv
+
+
+def _lu_solve(lu_and_piv, b, trans=0):
+    """Solve with an LU factorization, which can be shared by threads.
+
+       The LAPACK wrapper of SciPy shifts the pivot indices in place
+       during the solve, so each call takes its own copy of them
+       (O(N), unlike the O(N^2) solve) and the factors stay untouched.
+    """
+    lu, piv = lu_and_piv
+    return scipy.linalg.lu_solve((lu, piv.copy()), b, trans=trans,
+                                 check_finite=False)
+
+
+def _solve_krylov(solver, A, rhs, x0, tol, maxiter):
+    """Call a Krylov subspace solver of SciPy and count the iterations.
+    """
+    num_iter = [0]
+
+    def count(*args):
+        num_iter[0] += 1
+
+    kwargs = {}
+    params = inspect.signature(solver).parameters
+    if 'rtol' in params:
+        kwargs['rtol'] = tol
+    else:  # SciPy < 1.12
+        kwargs['tol'] = tol
+
+    if 'callback_type' in params:
+        kwargs['callback_type'] = 'pr_norm'  # Count inner iterations
+
+    x, info = solver(A, rhs, x0=x0, atol=0.0, maxiter=maxiter,
+                     callback=count, **kwargs)
+
+    if info < 0 and solver is not scipy.sparse.linalg.gmres:
+        # BiCGSTAB can break down before convergence,
+        # then continue with GMRES, which does not break down.
+        x, n = _solve_krylov(scipy.sparse.linalg.gmres,
+                             A, rhs, x, tol, maxiter)
+        return x, num_iter[0] + n
+    elif info < 0:
+        raise ValueError("Illegal input or breakdown "
+                         "in the Krylov subspace method.")
+    elif info > 0:
+        warnings.warn("The Krylov subspace method (%s) did not converge "
+                      "within %d iterations, so the solution does not "
+                      "satisfy the tolerance (%g)."
+                      % (solver.__name__, maxiter, tol), RuntimeWarning)
+
+    return x, num_iter[0]
@@ -2,6 +2,7 @@
 
 
 from .perturb import analyze_perturb
+from .fit import fit_weights
 
 from .random.weight import RandomWeightBatchSimulator
 from .random.structure import RandomStructureBatchSimulator
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pandas as pd
+import scipy.linalg
+import scipy.special
+
+import sfa.stats
+
+
+def fit_weights(alg,
+                num_steps=300,
+                lr=0.05,
+                sharpness=100.0,
+                betas=(0.9, 0.999),
+                eps=1e-8,
+                get_history=False):
+    r"""Fit the link weights of the network to the experimental results
+    by gradient descent.
+
+    The signs of links are kept, and the weight of a link is
+    parameterized as :math:`w = s\exp(\theta)`, where :math:`s` is
+    the sign of the link in the current weight matrix of the algorithm.
+    The accuracy of sign agreement (``sfa.calc_accuracy``) is not
+    differentiable, so the following surrogate is minimized:
+
+    .. math::
+        L = \frac{1}{n} \sum_{e \neq 0} \log(1 + \exp(-k \cdot sgn(e) \cdot y)),
+
+    where :math:`y` and :math:`e` are the simulated and experimental
+    results, and :math:`k` is the sharpness.
+    The gradients with respect to all links are obtained at once
+    by the adjoint method, which solves the transposed system
+    with the same LU factorization of :math:`I - \alpha W`:
+
+    .. math::
+        \frac{\partial L}{\partial W} =
+        \alpha (I - \alpha W)^{-T} \frac{\partial L}{\partial X} X^T.
+
+    The parameters are updated by Adam optimizer.
+
+    Parameters
+    ----------
+    alg : sfa.algorithms.NetworkPropagation
+        Initialized algorithm object, whose data has
+        node type perturbations only.
+        Its weight matrix is the initial point and
+        is not changed by the fitting.
+    num_steps : int, optional
+        Number of gradient steps.
+    lr : float, optional
+        Learning rate of Adam optimizer.
+    sharpness : float, optional
+        Sharpness of the surrogate loss, :math:`k`.
+    betas : tuple of float, optional
+        Decay rates of the moment estimates in Adam optimizer.
+    eps : float, optional
+        A small value for the numerical stability of Adam optimizer.
+    get_history : bool, optional
+        Decide to get the loss and the accuracy of each step.
+
+    Returns
+    -------
+    W : numpy.ndarray
+        Weight matrix of the best accuracy during the fitting.
+        It can be assigned to ``alg.W`` to compute the batch.
+    acc : float
+        The best accuracy.
+    df_history : pandas.DataFrame (optional)
+        Loss and accuracy of each step, which is returned
+        if get_history is True.
+    """
+    data = alg.data
+    if data.has_link_perturb:
+        raise ValueError("fit_weights supports the data "
+                         "including node type perturbations only.")
+
+    a = alg.params.alpha
+    use_rel_change = alg.params.use_rel_change
+    W = np.array(alg.W.toarray() if hasattr(alg.W, 'toarray') else alg.W,
+                 dtype=np.float64)
+    N = W.shape[0]
+
+    ir, ic = W.nonzero()
+    signs = np.sign(W[ir, ic])
+    theta = np.log(np.abs(W[ir, ic]))
+
+    # Basal activities of the conditions in the columns
+    b = np.asarray(alg.b, dtype=np.float64)
+    Bt = alg.create_basal_batch(b).T
+    if use_rel_change:
+        # The control is the last column.
+        b_cnt = b.copy()
+        inds_ba = []
+        vals_ba = []
+        alg.apply_inputs(inds_ba, vals_ba)
+        b_cnt[inds_ba] = vals_ba
+        Bt = np.column_stack([Bt, b_cnt])
+
+    iadj = np.asarray(data.iadj_to_idf)
+    E = data.df_exp.to_numpy(dtype=np.float64).T  # (outputs x conditions)
+    sign_exp = np.sign(np.nan_to_num(E))
+    mask = (sign_exp != 0)
+    num_valid = max(mask.sum(), 1)
+
+    m1 = np.zeros_like(theta)
+    m2 = np.zeros_like(theta)
+    beta1, beta2 = betas
+
+    W_best = W.copy()
+    acc_best = -1.0
+    history = []
+    for step in range(num_steps):
+        W[ir, ic] = signs * np.exp(theta)
+
+        try:
+            lu = scipy.linalg.lu_factor(np.eye(N) - a*W, check_finite=False)
+        except (np.linalg.LinAlgError, ValueError):
+            break
+
+        # Forward solve
+        X = (1-a)*scipy.linalg.lu_solve(lu, Bt, check_finite=False)
+        if use_rel_change:
+            Y = X[iadj, :-1] - X[iadj, -1:]
+        else:
+            Y = X[iadj, :]
+
+        if not np.all(np.isfinite(Y)):
+            break
+
+        z = -sharpness * sign_exp * Y
+        loss = np.logaddexp(0, z)[mask].sum() / num_valid
+        acc = sfa.stats.calc_accuracy(Y.T, E.T)
+        history.append((loss, acc))
+        if acc > acc_best:
+            acc_best = acc
+            W_best = W.copy()
+
+        # dL/dY, and then dL/dX for the outputs
+        G_Y = np.zeros_like(Y)
+        G_Y[mask] = -sharpness * sign_exp[mask] \
+                    * scipy.special.expit(z[mask]) / num_valid
+        G = np.zeros_like(X)
+        if use_rel_change:
+            G[iadj, :-1] = G_Y
+            G[iadj, -1] = -G_Y.sum(axis=1)
+        else:
+            G[iadj, :] = G_Y
+
+        # Adjoint solve with the same factorization
+        Lam = scipy.linalg.lu_solve(lu, G, trans=1, check_finite=False)
+
+        # dL/dW for the links, and then dL/d(theta)
+        grad_w = a * np.einsum('ij,ij->i', Lam[ir, :], X[ic, :])
+        grad = grad_w * W[ir, ic]
+
+        # Adam update
+        m1 = beta1*m1 + (1-beta1)*grad
+        m2 = beta2*m2 + (1-beta2)*grad**2
+        m1_hat = m1 / (1 - beta1**(step+1))
+        m2_hat = m2 / (1 - beta2**(step+1))
+        theta -= lr * m1_hat / (np.sqrt(m2_hat) + eps)
+    # end of for
+
+    if get_history:
+        df_history = pd.DataFrame(history, columns=['loss', 'acc'])
+        df_history.index.name = 'step'
+        return W_best, acc_best, df_history
+
+    return W_best, acc_best
@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
 
 import numpy as np
+import scipy.sparse
 
 
-def analyze_perturb(alg, data, targets, b=None, get_trj=False):
+def analyze_perturb(alg, data, targets, b=None, get_trj=False, trj_stride=1,
+                    outputs=None):
     """Perform signal flow analysis under perturbations.
 
     Parameters
@@ -22,7 +24,22 @@ def analyze_perturb(alg, data, targets, b=None, get_trj=False):
 
     get_trj : bool (optional)
         Decide to get the trajectory of activity change.
-        
+
+    trj_stride : int (optional)
+        Record the activities of every trj_stride-th iteration
+        in the trajectory.
+
+    outputs : list (optional)
+        List of node names whose activities are only needed.
+        For the node type perturbations, only the change in the
+        activities of the outputs is returned, and F is not computed
+        (i.e., None). If the algorithm uses the exact solution,
+        the change is obtained from the response kernel
+        (see ``compute_response_kernel`` of the algorithm)
+        without computing the steady-states. Otherwise (e.g.,
+        exsol_forbidden, krylov_method, or a singular matrix),
+        the steady-states are computed as usual.
+
     Returns
     -------
     act : numpy.ndarray
@@ -43,7 +60,7 @@ def analyze_perturb(alg, data, targets, b=None, get_trj=False):
     N = data.A.shape[0]
 
     if b is None:
-        b = np.zeros((N,), dtype=np.float)
+        b = np.zeros((N,), dtype=alg.params.dtype)
     elif b.size != N:
         raise TypeError("The size of b should be equal to %d"%(N))
 
@@ -52,13 +69,38 @@ def analyze_perturb(alg, data, targets, b=None, get_trj=False):
     alg.apply_inputs(inds, vals)
     b[inds] = vals
 
+    if outputs is not None and not data.has_link_perturb and not get_trj:
+        iouts = [data.n2i[name] for name in outputs]
+        if alg.uses_exact_solution:
+            b_ctrl = b.copy()
+            alg.apply_perturbations(targets, inds, vals)
+            b[inds] = vals
+            R = alg.compute_response_kernel(iouts)
+            return R.dot(b - b_ctrl), None
+    else:
+        iouts = None
+
+    # The Krylov subspace method cannot give the trajectory.
+    use_krylov = alg.params.krylov_method is not None and not get_trj
+
     W_ctrl = alg.W.copy()
-    x_ctrl, trj_ctrl = alg.propagate_iterative(
-                                W_ctrl,
-                                b,
-                                b,
-                                alg.params.alpha,
-                                get_trj=get_trj)
+    if use_krylov:
+        x_ctrl, _ = alg.propagate_krylov(W_ctrl,
+                                         b,
+                                         b,
+                                         alg.params.alpha,
+                                         lim_iter=alg.params.lim_iter,
+                                         method=alg.params.krylov_method)
+    else:
+        x_ctrl, trj_ctrl = alg.propagate_iterative(
+                                    W_ctrl,
+                                    b,
+                                    b,
+                                    alg.params.alpha,
+                                    get_trj=get_trj,
+                                    trj_stride=trj_stride,
+                                    acceleration=alg.params.acceleration,
+                                    depth=alg.params.anderson_depth)
 
     if data.has_link_perturb:
         W_pert = W_ctrl.copy()
@@ -69,31 +111,69 @@ def analyze_perturb(alg, data, targets, b=None, get_trj=False):
         alg.apply_perturbations(targets, inds, vals)
 
     b[inds] = vals
-    x_pert, trj_pert = alg.propagate_iterative(
-                                W_pert,
-                                b,
-                                b,
-                                alg.params.alpha,
-                                get_trj=get_trj)
+    if use_krylov:
+        # Warm start from the steady-state of the control
+        x_pert, _ = alg.propagate_krylov(W_pert,
+                                         x_ctrl,
+                                         b,
+                                         alg.params.alpha,
+                                         lim_iter=alg.params.lim_iter,
+                                         method=alg.params.krylov_method)
+    else:
+        x_pert, trj_pert = alg.propagate_iterative(
+                                    W_pert,
+                                    b,
+                                    b,
+                                    alg.params.alpha,
+                                    get_trj=get_trj,
+                                    trj_stride=trj_stride,
+                                    acceleration=alg.params.acceleration,
+                                    depth=alg.params.anderson_depth)
 
     act_change = x_pert - x_ctrl
-
-    if data.has_link_perturb:
+    if iouts is not None:
+        return act_change[iouts], None
+
+    if scipy.sparse.issparse(W_ctrl):
+        # Element-wise multiplication (the same broadcasting as ndarray)
+        if data.has_link_perturb:
+            F = W_pert.multiply(x_pert) - W_ctrl.multiply(x_ctrl)
+        else:
+            F = W_ctrl.multiply(act_change)
+        F = scipy.sparse.csr_matrix(F)
+    elif data.has_link_perturb:
         F = W_pert*x_pert - W_ctrl*x_ctrl
     else:
         F = W_ctrl*act_change
 
     ret = [act_change, F]  # return objects
     if get_trj:
-        if trj_pert.shape[0] != trj_ctrl.shape[0]:
-            trj_ctrl, trj_pert = resize_trj(trj_ctrl, trj_pert)
-    
-        trj_change = trj_pert - trj_ctrl
-        ret.append(trj_change)
+        ret.append(diff_trj(trj_ctrl, trj_pert))
 
     return tuple(ret)
 
 
+def diff_trj(trj_ctrl, trj_pert):
+    """Compute trj_pert - trj_ctrl, where the shorter trajectory
+       is regarded as staying at its last state.
+       It is the same as resize_trj followed by the subtraction,
+       but the shorter trajectory is not copied.
+    """
+    n_ctrl = trj_ctrl.shape[0]
+    n_pert = trj_pert.shape[0]
+    n_min = min(n_ctrl, n_pert)
+
+    trj_change = np.empty((max(n_ctrl, n_pert),) + trj_pert.shape[1:],
+                          dtype=np.result_type(trj_ctrl, trj_pert))
+    np.subtract(trj_pert[:n_min], trj_ctrl[:n_min], out=trj_change[:n_min])
+    if n_pert > n_min:
+        np.subtract(trj_pert[n_min:], trj_ctrl[-1], out=trj_change[n_min:])
+    elif n_ctrl > n_min:
+        np.subtract(trj_pert[-1], trj_ctrl[n_min:], out=trj_change[n_min:])
+
+    return trj_change
+
+
 def resize_trj(trj_ctrl, trj_pert):
     # Prepare the comparison
     trjs = [trj_pert, trj_ctrl]
@@ -16,10 +16,10 @@ class BaseRandomSimulator(object):
 
     def _initialize(self, alg):
         self._S = np.sign(alg.data.A)  # Sign matrix
-        self._ir, self._ic = alg.data.A.to_numpy().nonzero()
+        self._ir, self._ic = alg.data.A.nonzero()
         self._num_links = self._ir.size
         self._A = np.array(alg.data.A)
-        self._W = np.zeros_like(self._A, dtype=np.float)
+        self._W = np.array(self._A, dtype=alg.params.dtype)
 
     def _randomize(self):
         raise NotImplementedError()
@@ -56,7 +56,7 @@ class BaseRandomSimulator(object):
         alg.data = data
         alg.initialize(network=False)
 
-        results = np.zeros((num_samp,), dtype=np.float)
+        results = np.zeros((num_samp,), dtype=np.float64)
         cnt = 0
 
         if self._need_to_print(use_print, freq_print, cnt):
@@ -168,7 +168,7 @@ class BaseRandomBatchSimulator(BaseRandomSimulator):
         alg.data = data
         alg.initialize(network=False)
 
-        results = np.zeros((num_samp,), dtype=np.float)
+        results = np.zeros((num_samp,), dtype=np.float64)
         cnt = 0
 
         if self._need_to_print(use_print, freq_print, cnt):
@@ -181,7 +181,7 @@ class BaseRandomBatchSimulator(BaseRandomSimulator):
                 alg.compute_batch()
                 acc = sfa.calc_accuracy(self._alg.result.df_sim,
                                         self._alg.data.df_exp)
-            except FloatingPointError as pe:
+            except (FloatingPointError, np.linalg.LinAlgError) as pe:
                 # Skip this condition
                 if self._need_to_print(use_print, freq_print, cnt):
                     print("%s: skipped..." % (pe))
@@ -240,8 +240,8 @@ class BaseRandomBatchSimulator(BaseRandomSimulator):
         dfs = []
         if max_workers == 1:
             for (abbr, data) in list_data:
-                df = self._simulate_single(num_samp, alg, data, use_norm,
-                                           use_print, freq_print)
+                df = self._simulate_single((num_samp, alg, data, use_norm,
+                                            use_print, freq_print))
                 dfs.append(df)
                 # end of for
         elif max_workers > 1:
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+
+import importlib
+from collections import OrderedDict
+
+import numpy as np
+import scipy.sparse
+
+
+__all__ = ['Backend',
+           'DenseBackend',
+           'SparseBackend',
+           'NumbaBackend',
+           'register_backend',
+           'get_backend',
+           'get_backend_names',
+           'select_backend']
+
+
+class Backend(object):
+    """The base class of compute backends, which determine
+       the representation of the weight matrix and the kernels
+       of the network propagation.
+
+       A backend is registered with ``register_backend``,
+       and is selected by ``backend`` parameter of the algorithms
+       (e.g., ``alg.params.backend = 'sparse'``).
+
+    Attributes
+    ----------
+    name : str
+        Name of the backend for the registry.
+    sparse : bool
+        Whether the weight matrix is a scipy.sparse matrix.
+    """
+
+    name = None
+    sparse = False
+
+    def is_available(self):
+        """Check whether the dependencies of this backend are available.
+        """
+        return True
+
+    def asmatrix(self, A, dtype=np.float64):
+        """Convert the adjacency (or weight) matrix
+           to the representation of this backend.
+        """
+        raise NotImplementedError()
+
+    def matvec(self, W, x, out):
+        """Compute W*x into the preallocated out array.
+        """
+        if type(W) is np.ndarray and W.dtype == out.dtype:
+            np.dot(W, x, out=out)
+        else:
+            out[:] = W.dot(x)
+
+# end of class Backend
+
+
+class DenseBackend(Backend):
+    """NumPy arrays and dense linear algebra (LAPACK).
+    """
+
+    name = 'dense'
+    sparse = False
+
+    def asmatrix(self, A, dtype=np.float64):
+        if scipy.sparse.issparse(A):
+            return A.toarray().astype(dtype, copy=False)
+        return np.array(A, dtype=dtype)
+
+# end of class DenseBackend
+
+
+class SparseBackend(Backend):
+    """scipy.sparse CSR matrices and the sparse LU factorization,
+       which is suitable for large and sparse networks.
+    """
+
+    name = 'sparse'
+    sparse = True
+
+    def asmatrix(self, A, dtype=np.float64):
+        return scipy.sparse.csr_matrix(A, dtype=dtype)
+
+# end of class SparseBackend
+
+
+class NumbaBackend(SparseBackend):
+    """scipy.sparse CSR matrices with the matrix-vector product
+       compiled by Numba, which writes the result into the buffer
+       of the iterative method without any allocation.
+       The summation order is the same as that of scipy.sparse.
+    """
+
+    name = 'numba'
+    sparse = True
+
+    def __init__(self):
+        self._kernel = None
+
+    def is_available(self):
+        try:
+            importlib.import_module('numba')
+        except ImportError:
+            return False
+        return True
+
+    def matvec(self, W, x, out):
+        if not (scipy.sparse.issparse(W) and W.format == 'csr') \
+                or x.ndim != 1:
+            return super().matvec(W, x, out)
+
+        if self._kernel is None:
+            # Numba is imported only when the backend is used.
+            import numba
+            self._kernel = numba.njit(cache=True)(_csr_matvec)
+        self._kernel(W.indptr, W.indices, W.data, x, out)
+
+# end of class NumbaBackend
+
+
+def _csr_matvec(indptr, indices, data, x, out):
+    """The kernel of NumbaBackend.matvec, which is compiled by Numba.
+    """
+    for i in range(out.shape[0]):
+        s = 0.0
+        for j in range(indptr[i], indptr[i+1]):
+            s += data[j] * x[indices[j]]
+        out[i] = s
+
+
+_registry = OrderedDict()
+
+
+def register_backend(backend, overwrite=False):
+    """Register a backend, which can be selected
+       by its name in ``backend`` parameter of the algorithms.
+
+    Parameters
+    ----------
+    backend : sfa.backends.Backend
+        Backend object.
+    overwrite : bool, optional
+        Replace the backend of the same name.
+    """
+    if not isinstance(backend, Backend):
+        raise TypeError("backend should be a sfa.backends.Backend object.")
+
+    if not isinstance(backend.name, str) or backend.name == 'auto':
+        raise ValueError("Invalid backend name: %r" % (backend.name))
+
+    if backend.name in _registry and not overwrite:
+        raise ValueError("%s backend has been already registered."
+                         % (backend.name))
+
+    _registry[backend.name] = backend
+
+
+def get_backend(name):
+    """Get the registered backend of the name.
+    """
+    if name not in _registry:
+        raise ValueError("Unknown backend: %s" % (name))
+
+    backend = _registry[name]
+    if not backend.is_available():
+        raise ValueError("%s backend is not available." % (name))
+
+    return backend
+
+
+def get_backend_names(available=True):
+    """Get the names of the registered (and available) backends.
+    """
+    return [name for name, backend in _registry.items()
+            if not available or backend.is_available()]
+
+
+def select_backend(N, density, num_conds=1, iterative=False):
+    """Select a backend from the size and the density of the network.
+
+    Parameters
+    ----------
+    N : int
+        Number of nodes.
+    density : float
+        Number of links divided by N^2.
+    num_conds : int, optional
+        Number of conditions to be computed with the same network.
+        The dense inverse is worth its cost for many conditions.
+    iterative : bool, optional
+        Whether the iterative method is used instead of
+        the exact solution.
+
+    Returns
+    -------
+    backend : sfa.backends.Backend
+    """
+    if N < 1000 or density > 0.01 or num_conds > N:
+        return get_backend('dense')
+
+    if iterative and 'numba' in get_backend_names():
+        return get_backend('numba')
+
+    return get_backend('sparse')
+
+
+register_backend(DenseBackend())
+register_backend(SparseBackend())
+register_backend(NumbaBackend())
+
@@ -6,12 +6,17 @@ if sys.version_info <= (2, 8):
 # from abc import ABC, abstractmethod
 import abc
 import copy
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
 import pandas as pd
+import scipy.sparse
 import six
 import sfa.utils
 
-__all__ = ['Algorithm', 'Data', 'Result']
+__all__ = ['Algorithm', 'CompiledModel', 'Data', 'NetworkStructure',
+           'Result']
 
 
 @six.add_metaclass(abc.ABCMeta)
@@ -179,9 +184,142 @@ class Algorithm(ContainerItem):
         """
         raise NotImplementedError("compute_batch() should be implemented")
 
+    def compile(self):
+        """Compile the initialized algorithm into an immutable model,
+           which is shared by the run contexts in multiple threads.
+
+        Returns
+        -------
+        model : sfa.base.CompiledModel
+        """
+        return CompiledModel(self)
+
+    def _freeze_model(self):
+        """Prepare everything shared by the run contexts
+           (e.g., the factorizations), so that the contexts
+           never modify the shared objects.
+        """
+        pass
+
+    def _create_run_state(self):
+        """Replace the shared objects modified by a run
+           (e.g., the basal activity) with those of a new run context.
+        """
+        self._result = Result()
+
 # end of class Algorithm        
 
 
+class CompiledModel(object):
+    """An immutable model compiled from an initialized algorithm,
+       which holds the objects shared by the run contexts:
+       the weight matrix, the prepared solution, and
+       the perturbation plan of the data, for example.
+
+       A run context is a shallow copy of the algorithm
+       with its own parameters, basal activity, and result.
+       The dense solution (the inverse or the LU factorization)
+       is copied once for the model and shared read-only.
+       The contexts can compute at the same time in different threads,
+       where NumPy and BLAS release the GIL in the heavy computations.
+
+    Parameters
+    ----------
+    alg : sfa.base.Algorithm
+        Initialized algorithm object.
+        It is not affected by the model and the contexts.
+
+    Examples
+    --------
+        >>> model = alg.compile()
+        >>> ctx = model.create_context()
+        >>> ctx.compute_batch()
+        >>> ctx.result.df_sim
+        >>> results = model.compute_batches([data1, data2], num_workers=4)
+    """
+
+    def __init__(self, alg):
+        self._alg = alg.copy()
+        self._alg.params = copy.deepcopy(alg.params)
+        self._alg._freeze_model()
+
+    @property
+    def abbr(self):
+        return self._alg.abbr
+
+    @property
+    def params(self):
+        """A copy of the parameters of the model.
+        """
+        return copy.deepcopy(self._alg.params)
+
+    @property
+    def data(self):
+        return self._alg.data
+
+    def create_context(self, data=None):
+        """Create a run context, which is an algorithm object
+           sharing the compiled model.
+
+        Parameters
+        ----------
+        data : sfa.base.Data, optional
+            Data to be computed with the network of the model.
+            The data should have the same nodes as the data of the model.
+            The data of the model is used by default.
+
+        Returns
+        -------
+        ctx : sfa.base.Algorithm
+        """
+        if data is not None and data is not self._alg.data:
+            data_model = self._alg.data
+            if data.A.shape != data_model.A.shape \
+                    or data.n2i != data_model.n2i:
+                raise ValueError("The data should have the same nodes "
+                                 "as the data of the compiled model.")
+
+        ctx = self._alg.copy()
+        ctx.params = copy.deepcopy(self._alg.params)
+        ctx._create_run_state()
+        if data is not None:
+            ctx.data = data
+        return ctx
+
+    def compute_batches(self, data=None, num_workers=None):
+        """Compute the batches of multiple data concurrently
+           with a pool of threads.
+
+        Parameters
+        ----------
+        data : list of sfa.base.Data, optional
+            Data with the same nodes as the data of the model.
+            The data of the model is computed by default.
+        num_workers : int, optional
+            Maximum number of threads
+            (see ``concurrent.futures.ThreadPoolExecutor``).
+
+        Returns
+        -------
+        results : list of sfa.base.Result
+            Results in the same order as data.
+        """
+        if data is None:
+            data = [self._alg.data]
+
+        # The contexts are created in advance to check the data.
+        ctxs = [self.create_context(obj) for obj in data]
+
+        def compute_batch(ctx):
+            ctx.compute_batch()
+            return ctx.result
+
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            return list(executor.map(compute_batch, ctxs))
+
+# end of class CompiledModel
+
+
 class Data(ContainerItem):
     def __init__(self):
         super().__init__()
@@ -194,8 +332,11 @@ class Data(ContainerItem):
         self._df_exp = None
         self._df_ptb = None
         self._names_ptb = None
+        self._mat_conds = None
         self._iadj_to_idf = None
         self._has_link_perturb = None
+        self._structure = None
+        self._fpath_exp = None
 
     def initialize(self,
                    fpath,
@@ -208,46 +349,74 @@ class Data(ContainerItem):
         dpath = os.path.dirname(fpath)
         fpath_network = os.path.join(dpath, fname_network)
         fpath_ptb = os.path.join(dpath, fname_ptb)
-
-        A, n2i, dg = sfa.read_sif(fpath_network, as_nx=True)
-        self._A = A
-        self._n2i = n2i
-        self._dg = dg
-        self._df_conds = pd.read_table(os.path.join(dpath, fname_conds),
-                                       header=0, index_col=0)
-        self._df_exp = pd.read_table(os.path.join(dpath, fname_exp),
-                                     header=0, index_col=0)
-
+        fpath_conds = os.path.join(dpath, fname_conds)
+
+        # The network and the perturbation information are shared
+        # by the data objects initialized from the same files.
+        structure = get_network_structure(fpath_network,
+                                          fpath_ptb,
+                                          fpath_conds)
+        self._structure = structure
+        # The adjacency matrix is read-only while it is shared
+        # (see ``copy_A`` to modify it).
+        self._A = structure.A
+        self._n2i = structure.n2i
+        self._i2n = structure.i2n
+        self._dg = None  # Built on the first access
+        self._df_ptb = structure.df_ptb
+        self._has_link_perturb = structure.has_link_perturb
+
+        # The conditions and the experimental results are
+        # read on the first access.
+        self._df_conds = None
+        self._mat_conds = None
+        self._names_ptb = None
+        self._fpath_exp = os.path.join(dpath, fname_exp)
+        self._df_exp = None
+        self._iadj_to_idf = None
         self._inputs = inputs
-        self._df_ptb = pd.read_table(fpath_ptb, index_col=0)
-        if any(self._df_ptb.Type == 'link'):
-            self._has_link_perturb = True
-        else:
-            self._has_link_perturb = False
-
-        self._names_ptb = []
-        for i, row in enumerate(self._df_conds.iterrows()):
-            row = row[1]
-            list_name = []  # Target names
-            for target in self._df_conds.columns[row.to_numpy().nonzero()]:
-                list_name.append(target)
-            # end of for
-            self._names_ptb.append(list_name)
-        # end of for
-
-        # For mapping from the indices of adj. matrix to those of DataFrame
-        # (arrange the indices of adj. matrix according to df_exp.columns)
-        self._iadj_to_idf = [n2i[x] for x in self._df_exp.columns]
-
-        self._i2n = {idx: name for name, idx in n2i.items()}
 
     # end of def
 
-    # Read-only members
+    def _encode_conditions(self):
+        """Encode df_conds into a sparse boolean matrix of
+           (conditions x targets), from which names_ptb is derived lazily.
+        """
+        self._mat_conds = _encode_conditions(self._df_conds)
+        self._names_ptb = None
+
     @property
     def A(self):  # Adjacency matrix (numpy.ndarray)
+        """Adjacency matrix of the network. The matrix of the data
+           sharing a network structure is read-only, which can be
+           replaced by assignment or copied by ``copy_A``
+           to be modified in place.
+        """
+        return self._A
+
+    @A.setter
+    def A(self, mat):
+        self._A = mat
+        self._dg = None
+
+    def copy_A(self):
+        """Replace the shared adjacency matrix with a writable copy
+           owned by this data object, which can be modified in place
+           without affecting the other data of the same structure.
+
+        Returns
+        -------
+        A : numpy.ndarray
+            The adjacency matrix of this data object.
+        """
+        structure = getattr(self, '_structure', None)
+        shared = structure is not None and self._A is structure.A
+        if shared or (isinstance(self._A, np.ndarray)
+                      and not self._A.flags.writeable):
+            self.A = self._A.copy()
         return self._A
 
+    # Read-only members
     @property
     def n2i(self):  # Name to index mapping (hashable)
         return self._n2i
@@ -258,12 +427,76 @@ class Data(ContainerItem):
 
     @property
     def dg(self):  # Directed graph object of NetworkX
+        """Directed graph of the network, which is built from
+           A and n2i on the first access, where 'SIGN' attribute
+           of each edge is the sign of the link.
+        """
+        if self._dg is None and self._A is not None \
+                and self._n2i is not None:
+            structure = getattr(self, '_structure', None)
+            if structure is not None and structure.A is self._A:
+                self._dg = structure.dg
+            else:
+                self._dg = _create_dg(self._A, self._n2i)
         return self._dg
 
+    @dg.setter
+    def dg(self, obj):
+        self._dg = obj
+
+    def drop_dg(self):
+        """Drop the directed graph to save the memory,
+           which is built again on the next access.
+        """
+        self._dg = None
+        structure = getattr(self, '_structure', None)
+        if structure is not None:
+            structure.drop_dg()
+
+    @property
+    def structure(self):
+        """The object of ``sfa.base.NetworkStructure``
+           shared with the other data objects, or None.
+        """
+        return getattr(self, '_structure', None)
+
+    def _load_conditions(self):
+        structure = getattr(self, '_structure', None)
+        if structure is not None and self._df_conds is None \
+                and getattr(self, '_mat_conds', None) is None:
+            self._df_conds = structure.df_conds
+            self._mat_conds = structure.mat_conds
+            self._names_ptb = structure.names_ptb
+
     @property  # List of perturbation targets
     def names_ptb(self):
+        self._load_conditions()
+        if self._names_ptb is None \
+                and getattr(self, '_mat_conds', None) is not None:
+            self._names_ptb = _decode_conditions(self._mat_conds,
+                                                 self._df_conds)
         return self._names_ptb
 
+    @property
+    def mat_conds(self):
+        """Sparse boolean matrix of (conditions x nodes), where
+           the element (i, j) is True if the j-th node (i.e., n2i)
+           is a target of the i-th condition.
+        """
+        self._load_conditions()
+        mat = getattr(self, '_mat_conds', None)
+        if mat is None:
+            return None
+
+        # Map the columns of df_conds to the nodes of the network.
+        cols = np.array([self._n2i.get(name, -1)
+                         for name in self._df_conds.columns], dtype=np.int64)
+        mat = mat.tocoo()
+        mask = cols[mat.col] >= 0
+        return scipy.sparse.csr_matrix(
+                    (mat.data[mask], (mat.row[mask], cols[mat.col[mask]])),
+                    shape=(mat.shape[0], len(self._n2i)), dtype=bool)
+
     @property  # List of values for perturbation
     def vals_ptb(self):
         return self._vals_ptb
@@ -274,6 +507,13 @@ class Data(ContainerItem):
 
     @property
     def iadj_to_idf(self):
+        if self._iadj_to_idf is None \
+                and getattr(self, '_structure', None) is not None \
+                and self.df_exp is not None:
+            # For mapping from the indices of adj. matrix to those of
+            # DataFrame (arrange the indices of adj. matrix according to
+            # df_exp.columns)
+            self._iadj_to_idf = [self._n2i[x] for x in self.df_exp.columns]
         return self._iadj_to_idf
 
     @iadj_to_idf.setter
@@ -291,6 +531,7 @@ class Data(ContainerItem):
 
     @property  # DataFrame of experimental conditions
     def df_conds(self):
+        self._load_conditions()
         return self._df_conds
 
     @df_conds.setter
@@ -299,11 +540,15 @@ class Data(ContainerItem):
 
     @property  # DataFrame of experimental results
     def df_exp(self):
+        if self._df_exp is None \
+                and getattr(self, '_fpath_exp', None) is not None:
+            self._df_exp = sfa.fileio.read_exp_table(self._fpath_exp)
         return self._df_exp
 
     @df_exp.setter
     def df_exp(self, df):
         self._df_exp = df
+        self._fpath_exp = None
 
     @property  # DataFrame of perturbation information
     def df_ptb(self):
@@ -326,6 +571,166 @@ class Data(ContainerItem):
 # end of class Data
 
 
+class NetworkStructure(object):
+    """The network and the perturbation information shared by
+       the data objects initialized from the same files
+       (e.g., the data of multiple experiments on the same network).
+       The files are parsed only once, and the data objects
+       refer to the same objects, which should not be modified.
+       The adjacency matrix is read-only, and a data object copies it
+       only to modify it (see ``Data.copy_A``).
+       Only the experimental results are owned by each data object.
+
+    Parameters
+    ----------
+    fpath_network : str
+        Path of SIF file.
+    fpath_ptb : str
+        Path of the perturbation information.
+    fpath_conds : str
+        Path of the experimental conditions.
+    """
+
+    def __init__(self, fpath_network, fpath_ptb, fpath_conds):
+        A, n2i = sfa.read_sif(fpath_network)
+        A.flags.writeable = False
+        self._A = A
+        self._n2i = n2i
+        self._i2n = {idx: name for name, idx in n2i.items()}
+        self._dg = None
+
+        self._df_ptb = pd.read_table(fpath_ptb, index_col=0)
+        self._has_link_perturb = bool(any(self._df_ptb.Type == 'link'))
+
+        # The conditions are read on the first access.
+        self._fpath_conds = fpath_conds
+        self._df_conds = None
+        self._mat_conds = None
+        self._names_ptb = None
+
+        # Perturbation plans of the data for each input condition
+        # (see ``sfa.plan.get_plan``), which are kept
+        # while any data object refers to them.
+        self._plans = weakref.WeakValueDictionary()
+
+    def __getstate__(self):
+        # The weak references cannot be pickled, and
+        # the plans are compiled again after unpickling.
+        state = self.__dict__.copy()
+        del state['_plans']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._plans = weakref.WeakValueDictionary()
+
+    @property
+    def A(self):
+        return self._A
+
+    @property
+    def n2i(self):
+        return self._n2i
+
+    @property
+    def i2n(self):
+        return self._i2n
+
+    @property
+    def dg(self):
+        if self._dg is None:
+            self._dg = _create_dg(self._A, self._n2i)
+        return self._dg
+
+    def drop_dg(self):
+        self._dg = None
+
+    @property
+    def df_ptb(self):
+        return self._df_ptb
+
+    @property
+    def has_link_perturb(self):
+        return self._has_link_perturb
+
+    def _load_conditions(self):
+        if self._df_conds is None:
+            df_conds = sfa.fileio.read_exp_table(self._fpath_conds)
+            self._mat_conds = _encode_conditions(df_conds)
+            self._names_ptb = _decode_conditions(self._mat_conds, df_conds)
+            self._df_conds = df_conds
+
+    @property
+    def df_conds(self):
+        self._load_conditions()
+        return self._df_conds
+
+    @property
+    def mat_conds(self):
+        self._load_conditions()
+        return self._mat_conds
+
+    @property
+    def names_ptb(self):
+        self._load_conditions()
+        return self._names_ptb
+
+    def is_shared_by(self, data):
+        """Check whether the data refers to the network
+           and the perturbation information of this structure.
+        """
+        return data.n2i is self._n2i \
+               and data.df_ptb is self._df_ptb \
+               and data.names_ptb is self._names_ptb
+
+# end of class NetworkStructure
+
+
+_structures = weakref.WeakValueDictionary()
+
+
+def get_network_structure(fpath_network, fpath_ptb, fpath_conds):
+    """Get the structure of the files, which is shared
+       while any data object refers to it.
+       The files are parsed again if they have been modified.
+    """
+    key = tuple((os.path.abspath(fpath), os.stat(fpath).st_mtime_ns)
+                for fpath in (fpath_network, fpath_ptb, fpath_conds))
+    structure = _structures.get(key)
+    if structure is None:
+        structure = NetworkStructure(fpath_network, fpath_ptb, fpath_conds)
+        _structures[key] = structure
+    return structure
+
+
+def _encode_conditions(df_conds):
+    return scipy.sparse.csr_matrix(df_conds.to_numpy() != 0)
+
+
+def _decode_conditions(mat_conds, df_conds):
+    # The indices in each row are sorted,
+    # so the targets are in the order of df_conds.columns.
+    if mat_conds.shape[0] == 0:
+        return []
+    names = df_conds.columns.to_numpy()[mat_conds.indices]
+    return [arr.tolist() for arr in np.split(names, mat_conds.indptr[1:-1])]
+
+
+def _create_dg(A, n2i):
+    if scipy.sparse.issparse(A):
+        At = scipy.sparse.csr_matrix(A.T)
+        At.sort_indices()
+        At = At.tocoo()
+        src, trg, vals = At.row, At.col, At.data
+    else:
+        A = np.asarray(A)
+        src, trg = A.T.nonzero()
+        vals = A[trg, src]
+
+    sign = np.sign(vals).astype(int)
+    return sfa.fileio.edges_to_networkx(src, trg, sign, n2i)
+
+
 class Result(sfa.utils.FrozenClass):
 
     def __init__(self):
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+
+import os
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import scipy.sparse
+
+
+__all__ = ['SolutionCache',
+           'get_default_cache',
+           'set_default_cache']
+
+
+class SolutionCache(object):
+    """A content-addressed cache of the matrices for the exact solution
+       (e.g., the inverse or the LU factorization of I - aW).
+       The key is a hash of the bytes of W and the parameters
+       that determine the matrices, so the same network gives
+       the same key in another algorithm object or another run.
+
+       The recently used items are kept in memory within max_bytes,
+       and the least recently used item is evicted first.
+       If dpath is given, the items are also saved in the directory
+       as .npz files, which are loaded when they are not in memory.
+       Each item is written to a temporary file and renamed at once,
+       so the other threads and processes find either the whole item
+       or nothing.
+       The cache can be shared by the algorithms in multiple threads.
+
+    Parameters
+    ----------
+    max_bytes : int, optional
+        Memory budget of the cached items in bytes.
+        The default value is 256 MiB.
+    dpath : str, optional
+        Directory path for the on-disk tier.
+        The items are kept in memory only by default.
+    """
+
+    def __init__(self, max_bytes=256*2**20, dpath=None):
+        if max_bytes < 0:
+            raise ValueError("max_bytes should be greater than or "
+                             "equal to 0.")
+
+        self._max_bytes = max_bytes
+        self._dpath = dpath
+        self._items = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.RLock()
+
+        if dpath is not None:
+            os.makedirs(dpath, exist_ok=True)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items or self._exists_on_disk(key)
+
+    @property
+    def max_bytes(self):
+        return self._max_bytes
+
+    @property
+    def dpath(self):
+        return self._dpath
+
+    @property
+    def nbytes(self):
+        """Total bytes of the items in memory.
+        """
+        return self._nbytes
+
+    @staticmethod
+    def make_key(W, **params):
+        """Create the key of W and the parameters.
+
+        Parameters
+        ----------
+        W : numpy.ndarray or scipy.sparse.spmatrix
+            Weight matrix.
+        params : dict
+            Parameters that determine the cached item
+            (e.g., alpha=0.5, apply_weight_norm=True).
+
+        Returns
+        -------
+        key : str
+            Hexadecimal digest.
+        """
+        h = hashlib.sha1()
+        h.update(str(W.shape).encode())
+        h.update(str(W.dtype).encode())
+        if scipy.sparse.issparse(W):
+            W = scipy.sparse.csr_matrix(W)
+            W.sort_indices()
+            arrs = (W.data, W.indices, W.indptr)
+        else:
+            arrs = (W,)
+
+        for arr in arrs:
+            h.update(np.ascontiguousarray(arr).view(np.uint8))
+
+        for name in sorted(params):
+            h.update(("%s=%r;" % (name, params[name])).encode())
+
+        return h.hexdigest()
+
+    def get(self, key):
+        """Get the item of the key, or None if it is not cached.
+        """
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                return self._items[key]
+
+            item = self._load(key)
+            if item is not None:
+                self._put_in_memory(key, item)
+
+            return item
+
+    def put(self, key, item):
+        """Cache the item, which is an array or a tuple of arrays.
+        """
+        if isinstance(item, np.ndarray):
+            item = (item,)
+
+        item = tuple(item)
+        with self._lock:
+            self._put_in_memory(key, item)
+            if self._dpath is not None:
+                self._save(key, item)
+
+    def clear(self, disk=False):
+        """Remove all items in memory (and on the disk if disk is true).
+        """
+        with self._lock:
+            self._items.clear()
+            self._nbytes = 0
+
+            if disk and self._dpath is not None:
+                for fname in os.listdir(self._dpath):
+                    if fname.endswith('.npz'):
+                        os.remove(os.path.join(self._dpath, fname))
+
+    def _put_in_memory(self, key, item):
+        if key in self._items:
+            self._nbytes -= _nbytes(self._items.pop(key))
+
+        nbytes = _nbytes(item)
+        if nbytes > self._max_bytes:
+            return  # Too large to be kept in memory
+
+        self._items[key] = item
+        self._nbytes += nbytes
+
+        # Evict the least recently used items.
+        while self._nbytes > self._max_bytes:
+            _, item_old = self._items.popitem(last=False)
+            self._nbytes -= _nbytes(item_old)
+
+    def _get_fpath(self, key):
+        return os.path.join(self._dpath, "%s.npz" % (key))
+
+    def _exists_on_disk(self, key):
+        if self._dpath is None:
+            return False
+        return os.path.isfile(self._get_fpath(key))
+
+    def _save(self, key, item):
+        # The temporary file is unique to each writer, and renaming it
+        # replaces the item at once (the last writer wins).
+        fd, fpath_tmp = tempfile.mkstemp(prefix=key + ".",
+                                         suffix=".tmp",
+                                         dir=self._dpath)
+        try:
+            with os.fdopen(fd, 'wb') as fout:
+                np.savez(fout, *item)
+            os.replace(fpath_tmp, self._get_fpath(key))
+        except BaseException:
+            os.remove(fpath_tmp)
+            raise
+
+    def _load(self, key):
+        if not self._exists_on_disk(key):
+            return None
+
+        try:
+            with np.load(self._get_fpath(key)) as npz:
+                return tuple(npz["arr_%d" % (i)]
+                             for i in range(len(npz.files)))
+        except FileNotFoundError:
+            return None  # Removed by clear() in the meantime
+
+# end of class SolutionCache
+
+
+def _nbytes(item):
+    return sum(arr.nbytes for arr in item)
+
+
+_default_cache = None
+
+
+def get_default_cache():
+    """Get the cache shared by the algorithms,
+       which is created at the first call.
+    """
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = SolutionCache()
+    return _default_cache
+
+
+def set_default_cache(cache):
+    """Set the cache shared by the algorithms,
+       e.g., to change the memory budget or to use the on-disk tier.
+    """
+    global _default_cache
+    if not isinstance(cache, SolutionCache):
+        raise TypeError("cache should be a SolutionCache object.")
+    _default_cache = cache
@@ -4,6 +4,8 @@ import numpy as np
 import scipy as sp
 import pandas as pd
 
+import sfa.backends
+
 
 def compute_influence(W,
                       alpha=0.9,
@@ -16,7 +18,9 @@ def compute_influence(W,
                       tol=1e-7,
                       get_iter=False,
                       device="cpu",
-                      sparse=False):
+                      sparse=False,
+                      dtype=np.float64,
+                      backend=None):
     r"""Compute the influence.
        It estimates the effects of a node to the other nodes,
        by calculating partial derivative with respect to source nodes,
@@ -73,6 +77,16 @@ def compute_influence(W,
         Select which device to use. 'CPU' is default.
     sparse : bool, optional
         Use sparse matrices for the computation.
+    dtype : numpy.dtype, optional
+        Floating-point type of the computation on CPU.
+        numpy.float32 halves the memory, which is usually
+        enough for ranking the influences.
+    backend : str, optional
+        Name of the compute backend in ``sfa.backends`` for CPU,
+        which determines whether sparse matrices are used
+        instead of the sparse argument.
+        In 'auto' mode, a backend is selected from the size
+        and the density of W.
 
     Returns
     -------
@@ -90,13 +104,24 @@ def compute_influence(W,
 
     device = device.lower()
 
+    if backend == 'auto':
+        N = W.shape[0]
+        if sp.sparse.issparse(W):
+            num_links = W.nnz
+        else:
+            num_links = np.count_nonzero(np.asarray(W))
+        sparse = sfa.backends.select_backend(N, num_links / float(N*N)).sparse
+    elif backend is not None:
+        sparse = sfa.backends.get_backend(backend).sparse
+
     if 'cpu' in device:
         if sparse:
             ret = _compute_influence_cpu_sparse(W, alpha, beta, S,
-                                               max_iter, tol, get_iter)
+                                               max_iter, tol, get_iter,
+                                               dtype)
         else:
             ret = _compute_influence_cpu(W, alpha, beta, S,
-                                        max_iter, tol, get_iter)
+                                        max_iter, tol, get_iter, dtype)
     elif 'gpu'in device:
         _, id_device = device.split(':')
         ret = _compute_influence_gpu(W, alpha, beta, S,
@@ -139,14 +164,16 @@ def compute_influence(W,
 
 
 def _compute_influence_cpu(W, alpha=0.5, beta=0.5, S=None,
-                           max_iter=1000, tol=1e-6, get_iter=False):
+                           max_iter=1000, tol=1e-6, get_iter=False,
+                           dtype=np.float64):
     N = W.shape[0]
+    W = np.asarray(W, dtype=dtype)
     if S is not None:
-        S1 = S
+        S1 = np.asarray(S, dtype=dtype)
     else:
-        S1 = np.eye(N, dtype=np.float)
+        S1 = np.eye(N, dtype=dtype)
 
-    I = np.eye(N, dtype=np.float)
+    I = np.eye(N, dtype=dtype)
     S2 = np.zeros_like(W)
     aW = alpha * W
     for cnt in range(max_iter):
@@ -166,17 +193,18 @@ def _compute_influence_cpu(W, alpha=0.5, beta=0.5, S=None,
 
 
 def _compute_influence_cpu_sparse(W, alpha, beta, S,
-                                  max_iter, tol, get_iter):
+                                  max_iter, tol, get_iter,
+                                  dtype=np.float64):
     N = W.shape[0]
     if S is not None:
         S1 = S
     else:
-        S1 = sp.sparse.lil_matrix(sp.sparse.eye(N, dtype=np.float))
+        S1 = sp.sparse.lil_matrix(sp.sparse.eye(N, dtype=dtype))
 
 
-    I = sp.sparse.eye(N, dtype=np.float)
-    S2 = sp.sparse.lil_matrix((N,N), dtype=np.float)
-    aW = sp.sparse.csc_matrix(alpha * W)
+    I = sp.sparse.eye(N, dtype=dtype)
+    S2 = sp.sparse.lil_matrix((N,N), dtype=dtype)
+    aW = sp.sparse.csc_matrix(alpha * W, dtype=dtype)
     for cnt in range(max_iter):
         S2[:, :] = S1.dot(aW) + I
         norm = sp.sparse.linalg.norm(S2 - S1)
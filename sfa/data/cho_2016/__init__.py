@@ -44,11 +44,11 @@ class ChoData(sfa.base.Data):
 
         dpath = os.path.dirname(__file__)
         fpath_network = os.path.join(dpath, 'network_all_pos.sif')
-        A, n2i, dg = sfa.read_sif(fpath_network, as_nx=True)
+        A, n2i = sfa.read_sif(fpath_network)
         self._A = A
         self._n2i = n2i
         self._i2n = {idx: name for name, idx in n2i.items()}
-        self._dg = dg
+        self._dg = None  # Built on the first access
         self._inputs = inputs
 
 
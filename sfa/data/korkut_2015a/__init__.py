@@ -31,10 +31,10 @@ class KorkutData(sfa.base.Data):
 
         fpath_ptb = os.path.join(dpath, "ptb.tsv")
 
-        A, n2i, dg = sfa.read_sif(fpath_network, as_nx=True)
+        A, n2i = sfa.read_sif(fpath_network)
         self._A = A
         self._n2i = n2i
-        self._dg = dg
+        self._dg = None  # Built on the first access
         self._df_conds = pd.read_table(os.path.join(dpath, "conds.tsv"),
                                        header=0, index_col=0)
         self._df_exp = pd.read_table(os.path.join(dpath, "exp.tsv"),
@@ -50,28 +50,21 @@ class KorkutData(sfa.base.Data):
         
         # Remove the rows and columns of a node which is not
         # included in the given network structure.
-        not_included = set(self._df_conds.columns) - set(self._n2i.keys())
-        for target in not_included:
-            ind_removed = self._df_conds[self.df_conds[target] != 0].index
+        not_included = [target for target in self._df_conds.columns
+                        if target not in self._n2i]
+        if not_included:
+            mask = (self._df_conds[not_included] != 0).any(axis=1)
+            ind_removed = self._df_conds.index[mask.to_numpy()]
             self._df_conds.drop(ind_removed, inplace=True)
-            self._df_conds.drop([target], axis=1, inplace=True)
+            self._df_conds.drop(not_included, axis=1, inplace=True)
             self._df_exp.drop(ind_removed, inplace=True)
-            self._df_ptb.drop([target], inplace=True)
-            
+            self._df_ptb.drop(not_included, inplace=True)
+
             # Re-index according to the new size.
             self._df_conds.index = np.arange(1, self._df_exp.shape[0]+1)
             self._df_exp.index = self._df_conds.index
 
-
-        self._names_ptb = []
-        for i, row in enumerate(self._df_conds.iterrows()):
-            row = row[1]
-            list_name = []  # Target names
-            for target in self._df_conds.columns[row.to_numpy().nonzero()]:
-                list_name.append(target)
-            # end of for
-            self._names_ptb.append(list_name)
-        # end of for
+        self._encode_conditions()
 
         s1 = set(self._df_exp.columns)  # From experimental data
         s2 = set(n2i.keys())  # From network
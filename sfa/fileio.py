@@ -1,9 +1,16 @@
 
 import os
+import csv
+import glob
+import json
 import codecs
-from collections import defaultdict
+import hashlib
+import tempfile
+from collections import OrderedDict
 
 import numpy as np
+import pandas as pd
+import scipy.sparse
 import networkx as nx
 
 from .base import Data
@@ -11,6 +18,21 @@ from .base import Data
 __all__ = [
     "read_inputs",
     "read_sif",
+    "read_sif_edges",
+    "edges_to_adjacency",
+    "edges_to_networkx",
+    "get_sif_cache_dir",
+    "set_sif_cache_default",
+    "get_sif_cache_default",
+    "clear_sif_cache",
+    "warm_sif_cache",
+    "read_exp_table",
+    "read_exp_tables",
+    "get_exp_cache_dir",
+    "set_exp_cache_default",
+    "get_exp_cache_default",
+    "build_exp_cache",
+    "clear_exp_cache",
     "create_from_sif",
 ]
 
@@ -29,68 +51,652 @@ def read_inputs(fpath):
     return inputs
 
 
-def read_sif(fpath, signs={'+':1, '-':-1}, sort=True, as_nx=False):
-    dict_links = defaultdict(list)
-    set_nodes = set()
-    n2i = {}
-    with codecs.open(fpath, "r", encoding="utf-8-sig") as fin:
-        for line in fin:
-            if line.isspace():
-                continue
+def read_sif_edges(fpath, signs={'+':1, '-':-1}, sort=True, use_cache=None):
+    """Read the links of a SIF file into the arrays of COO format.
 
-            items = line.strip().split()
-            src = items[0]
-            trg = items[2]
-            sign = items[1]
+    The file is parsed in bulk by pandas, and the node names are
+    factorized into indices. If a link appears more than once,
+    the last one is used, as read_sif does.
 
-            set_nodes.add(src)
-            set_nodes.add(trg)
-            int_sign = signs[sign]
-            dict_links[src].append((trg, int_sign))
-        # end of for
-    # end of with
+    If use_cache is True, the parsed arrays are saved in the cache
+    directory (see ``get_sif_cache_dir``), and they are loaded
+    by memory mapping instead of parsing the file again,
+    until the content of the file is changed (i.e., its SHA-1 digest).
+    If the directory is not writable, the file is parsed as usual.
 
-    if sort == True:
-        list_nodes = sorted(set_nodes)
-    else:
-        list_nodes = list(set_nodes)
+    Parameters
+    ----------
+    fpath : str
+        Path of SIF file, where each line is "source sign target".
+    signs : dict, optional
+        Integer values of the signs of links.
+    sort : bool, optional
+        Sort the nodes by their names.
+        Otherwise, the nodes are in the order of appearance.
+    use_cache : bool, optional
+        Use the cache of the parsed arrays.
+        If it is not given, the default of the module is used
+        (see ``set_sif_cache_default``), which is False
+        unless it has been changed, so that the cache is
+        neither read nor written.
 
-    N = len(set_nodes)
-    adj = np.zeros((N, N), dtype=np.int)
+    Returns
+    -------
+    src : numpy.ndarray
+        Indices of the source nodes of the links.
+    trg : numpy.ndarray
+        Indices of the target nodes of the links.
+    sign : numpy.ndarray
+        Signs of the links.
+    n2i : dict
+        Name to index mapping of the nodes.
+    """
+    if use_cache is None:
+        use_cache = _sif_cache_default
+
+    if not use_cache:
+        return _parse_sif_edges(fpath, signs, sort)
+
+    key = _get_sif_cache_key(fpath, signs, sort)
+    ret = _load_sif_cache(fpath, key)
+    if ret is None:
+        ret = _parse_sif_edges(fpath, signs, sort)
+        _save_sif_cache(fpath, key, ret)
+
+    return ret
+
+# end of def
+
+
+def _parse_sif_edges(fpath, signs, sort):
+    try:
+        # The names are taken as they are (e.g., "NA" or a quote),
+        # as the line-by-line parsing did.
+        df = pd.read_csv(fpath, sep=r'\s+', header=None,
+                         names=['src', 'sign', 'trg'], usecols=[0, 1, 2],
+                         index_col=False, dtype=str, engine='c',
+                         encoding='utf-8-sig', keep_default_na=False,
+                         na_filter=False, quoting=csv.QUOTE_NONE)
+    except pd.errors.EmptyDataError:
+        df = pd.DataFrame(columns=['src', 'sign', 'trg'], dtype=str)
+
+    # The missing fields are empty without the NA filter.
+    if df.isnull().values.any() or (df == '').values.any():
+        raise ValueError("Each line of SIF file should have "
+                         "source, sign, and target: %s" % (fpath))
+
+    # Factorize the sources and the targets together,
+    # where the nodes are in the order of appearance.
+    names = np.empty((2*df.shape[0],), dtype=object)
+    names[0::2] = df['src'].to_numpy()
+    names[1::2] = df['trg'].to_numpy()
+    codes, uniques = pd.factorize(names, sort=sort)
+    codes = codes.astype(np.int64)
+    src = codes[0::2]
+    trg = codes[1::2]
+
+    sign = df['sign'].map(signs)
+    if sign.isnull().values.any():
+        raise KeyError(df['sign'][sign.isnull()].iloc[0])
+    sign = sign.to_numpy(dtype=int)
+
+    # The last one of the same links overrides the others,
+    # and the links are ordered by their sources.
+    N = len(uniques)
+    keys = src*N + trg
+    _, i_first = np.unique(keys, return_index=True)
+    _, i_last = np.unique(keys[::-1], return_index=True)
+    i_last = keys.size - 1 - i_last
+    order = np.argsort(i_first, kind='stable')
+    i_first = i_first[order]
+    i_last = i_last[order]
+    order = np.argsort(src[i_first], kind='stable')
+
+    n2i = {name: i for i, name in enumerate(uniques)}
+    return (src[i_first[order]],
+            trg[i_first[order]],
+            sign[i_last[order]],
+            n2i)
+
+# end of def
+
+
+# Whether the SIF files are read through the cache
+# when use_cache is not given (e.g., by the loaders of the data).
+_sif_cache_default = False
+
+
+def set_sif_cache_default(use_cache):
+    """Set whether ``read_sif`` and ``read_sif_edges`` use the cache
+       of the parsed SIF files when use_cache is not given.
+       It applies to the loaders of the bundled data as well,
+       so that the datasets are loaded from the cache
+       filled by ``warm_sif_cache``.
+
+    Parameters
+    ----------
+    use_cache : bool
+    """
+    global _sif_cache_default
+    if not isinstance(use_cache, bool):
+        raise TypeError("use_cache should be a bool type value.")
+    _sif_cache_default = use_cache
+
+
+def get_sif_cache_default():
+    """Get whether the cache of the parsed SIF files is used
+       when use_cache is not given (see ``set_sif_cache_default``).
+    """
+    return _sif_cache_default
+
+
+def get_sif_cache_dir():
+    """Get the directory of the cache of the parsed SIF files,
+       which is networks under $SFA_CACHE_DIR if it is defined,
+       or sfa/networks under the user cache directory
+       ($XDG_CACHE_HOME or ~/.cache).
+    """
+    return os.path.join(_get_user_cache_dir(), 'networks')
+
+
+def _get_user_cache_dir():
+    dpath = os.environ.get('SFA_CACHE_DIR')
+    if dpath:
+        return dpath
+
+    dpath_user = os.environ.get('XDG_CACHE_HOME') \
+                 or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(dpath_user, 'sfa')
 
-    for isrc, name in enumerate(list_nodes):
-        n2i[name] = isrc  # index of source
-    # end of for
-    for name_src in n2i:
-        isrc = n2i[name_src]
-        for name_trg, int_sign in dict_links[name_src]:
-            itrg = n2i[name_trg]
-            adj[itrg, isrc] = int_sign
-        # end of for
-    # end of for
+
+def clear_sif_cache():
+    """Remove all cached SIF files.
+    """
+    dpath = get_sif_cache_dir()
+    if not os.path.isdir(dpath):
+        return
+
+    for fname in os.listdir(dpath):
+        if fname.endswith('.npy') or fname.endswith('.json'):
+            os.remove(os.path.join(dpath, fname))
+
+
+def warm_sif_cache(fpaths=None):
+    """Parse the SIF files into the cache in advance.
+       The cache is used by the loaders of the data
+       after ``set_sif_cache_default(True)``.
+
+    Parameters
+    ----------
+    fpaths : list of str, optional
+        Paths of SIF files.
+        All SIF files of the bundled data are parsed by default.
+
+    Returns
+    -------
+    fpaths : list of str
+        Paths of the SIF files in the cache.
+        The files with undefined signs are skipped.
+    """
+    if fpaths is None:
+        import sfa.data
+        dpath = os.path.dirname(sfa.data.__file__)
+        fpaths = []
+        for root, dirs, files in os.walk(dpath):
+            dirs.sort()
+            fpaths.extend(os.path.join(root, fname)
+                          for fname in sorted(files)
+                          if fname.endswith('.sif'))
+
+    cached = []
+    for fpath in fpaths:
+        try:
+            read_sif_edges(fpath, use_cache=True)
+        except KeyError:  # Undefined sign
+            continue
+        cached.append(fpath)
+
+    return cached
+
+
+def _get_sif_cache_key(fpath, signs, sort):
+    h = hashlib.sha1()
+    h.update(os.path.abspath(fpath).encode())
+    h.update(repr(sorted(signs.items())).encode())
+    h.update(repr(bool(sort)).encode())
+    return h.hexdigest()
+
+
+def _hash_file(fpath):
+    h = hashlib.sha1()
+    with open(fpath, 'rb') as fin:
+        for chunk in iter(lambda: fin.read(2**20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _load_sif_cache(fpath, key):
+    dpath = get_sif_cache_dir()
+    fpath_meta = os.path.join(dpath, key + ".json")
+    try:
+        with open(fpath_meta, 'r') as fin:
+            meta = json.load(fin)
+        stat = os.stat(fpath)
+    except (OSError, ValueError):
+        return None
+
+    # The modification time is not trusted, since the file can be
+    # edited within its resolution without changing the size.
+    if meta['size'] != stat.st_size or meta['sha1'] != _hash_file(fpath):
+        return None
+
+    try:
+        edges = np.load(os.path.join(dpath, key + "_edges.npy"),
+                        mmap_mode='r')
+        nodes = np.load(os.path.join(dpath, key + "_nodes.npy"))
+    except (OSError, ValueError):
+        return None
+
+    n2i = {name: i for i, name in enumerate(nodes.tolist())}
+    return edges[0], edges[1], edges[2], n2i
+
+
+def _save_sif_cache(fpath, key, ret):
+    src, trg, sign, n2i = ret
+    dpath = get_sif_cache_dir()
+    try:
+        os.makedirs(dpath, exist_ok=True)
+        stat = os.stat(fpath)
+        meta = {'path': os.path.abspath(fpath),
+                'size': stat.st_size,
+                'sha1': _hash_file(fpath)}
+
+        edges = np.vstack([src, trg, sign]).astype(np.int64)
+        nodes = np.array(sorted(n2i, key=n2i.__getitem__), dtype=str)
+        _write_atomic(os.path.join(dpath, key + "_edges.npy"),
+                      lambda fout: np.save(fout, edges))
+        _write_atomic(os.path.join(dpath, key + "_nodes.npy"),
+                      lambda fout: np.save(fout, nodes))
+
+        # The metadata is written at last, which validates the arrays.
+        _write_atomic(os.path.join(dpath, key + ".json"),
+                      lambda fout: json.dump(meta, fout), 'w')
+    except OSError:
+        pass  # The cache is not available (e.g., read-only directory).
+
+
+def _write_atomic(fpath, write, mode='wb'):
+    # The temporary file is unique to each writer, and
+    # other threads and processes never see a partially written file.
+    fd, fpath_tmp = tempfile.mkstemp(prefix=os.path.basename(fpath) + ".",
+                                     suffix=".tmp",
+                                     dir=os.path.dirname(fpath))
+    try:
+        with os.fdopen(fd, mode) as fout:
+            write(fout)
+        os.replace(fpath_tmp, fpath)
+    except BaseException:
+        os.remove(fpath_tmp)
+        raise
+
+
+def edges_to_adjacency(src, trg, sign, N, sparse=False):
+    """Create the adjacency matrix of the links in COO format,
+       where the element (i, j) is the sign of the link from j to i.
+
+    Parameters
+    ----------
+    src, trg, sign : numpy.ndarray
+        Links from read_sif_edges.
+    N : int
+        Number of nodes.
+    sparse : bool, optional
+        Create a scipy.sparse.csr_matrix instead of numpy.ndarray.
+    """
+    if sparse:
+        return scipy.sparse.csr_matrix((sign, (trg, src)), shape=(N, N),
+                                       dtype=int)
+
+    adj = np.zeros((N, N), dtype=int)
+    adj[trg, src] = sign
+    return adj
+
+
+def edges_to_networkx(src, trg, sign, n2i):
+    """Create networkx.DiGraph of the links in COO format,
+       where 'SIGN' attribute of each edge is the sign of the link.
+    """
+    i2n = sorted(n2i, key=n2i.__getitem__)
+    dg = nx.DiGraph()
+    dg.add_nodes_from(i2n)
+    dg.add_edges_from((i2n[isrc], i2n[itrg], {'SIGN': int(s)})
+                      for isrc, itrg, s in zip(src, trg, sign))
+    return dg
+
+
+def read_sif(fpath, signs={'+':1, '-':-1}, sort=True, as_nx=False,
+             sparse=False, use_cache=None):
+    """Read the network of a SIF file.
+
+    Parameters
+    ----------
+    fpath : str
+        Path of SIF file.
+    signs : dict, optional
+        Integer values of the signs of links.
+    sort : bool, optional
+        Sort the nodes by their names.
+    as_nx : bool, optional
+        Create networkx.DiGraph of the network as well.
+    sparse : bool, optional
+        Create the adjacency matrix in scipy.sparse.csr_matrix.
+    use_cache : bool, optional
+        Use the cache of the parsed SIF files (see ``read_sif_edges``).
+
+    Returns
+    -------
+    adj : numpy.ndarray or scipy.sparse.csr_matrix
+        Adjacency matrix, where the element (i, j) is
+        the sign of the link from j to i.
+    n2i : dict
+        Name to index mapping of the nodes.
+    dg : networkx.DiGraph (optional)
+        Directed graph, which is returned if as_nx is True.
+    """
+    src, trg, sign, n2i = read_sif_edges(fpath, signs, sort, use_cache)
+    adj = edges_to_adjacency(src, trg, sign, len(n2i), sparse)
 
     if not as_nx:
         return adj, n2i
     else:  # NetworkX DiGraph
-        dg = nx.DiGraph()
-        # Add nodes
-        for name in list_nodes:
-            dg.add_node(name)
-
-        # Add edges (links)
-        for name_src in list_nodes:
-            for name_trg, sign in dict_links[name_src]:
-                dg.add_edge(name_src, name_trg)
-                dg.edges[name_src, name_trg]['SIGN'] = sign
-                # end of for
-        # end of for
-        return adj, n2i, dg
-        # end of else
-
+        return adj, n2i, edges_to_networkx(src, trg, sign, n2i)
 
 # end of def
 
 
+def read_exp_table(fpath, use_cache=None):
+    """Read a table of experimental results (or conditions),
+       where the first row and column are the labels.
+
+       If use_cache is True and the directory of the file has been
+       consolidated by ``build_exp_cache``, the table is taken from
+       the memory-mapped cache instead of parsing the file,
+       unless the content of the file has been changed
+       after the consolidation (i.e., its SHA-1 digest).
+
+    Parameters
+    ----------
+    fpath : str
+        Path of the tab-separated file.
+    use_cache : bool, optional
+        Use the consolidated cache of the directory.
+        If it is not given, the default of the module is used
+        (see ``set_exp_cache_default``), which is False
+        unless it has been changed.
+
+    Returns
+    -------
+    df : pandas.DataFrame
+    """
+    if use_cache is None:
+        use_cache = _exp_cache_default
+
+    if use_cache:
+        store = _load_exp_store(os.path.dirname(fpath), mmap_mode='r')
+        if store is not None:
+            df = _get_exp_table(store, fpath)
+            if df is not None:
+                return df
+
+    return pd.read_table(fpath, header=0, index_col=0)
+
+
+def read_exp_tables(dpath, pattern="*", use_cache=None):
+    """Read the tables of experimental results in a directory,
+       which is a single bulk read if the directory has been
+       consolidated by ``build_exp_cache``.
+
+    Parameters
+    ----------
+    dpath : str
+        Directory of the tab-separated files.
+    pattern : str, optional
+        Glob pattern of the file names.
+    use_cache : bool, optional
+        Use the consolidated cache of the directory
+        (see ``read_exp_table``).
+
+    Returns
+    -------
+    dfs : dict
+        DataFrames, where the keys are the file names.
+    """
+    if use_cache is None:
+        use_cache = _exp_cache_default
+
+    store = None
+    if use_cache:
+        store = _load_exp_store(dpath, mmap_mode=None)
+
+    dfs = {}
+    labels = {}  # The same labels of the tables share the index objects.
+    for fpath in sorted(glob.glob(os.path.join(dpath, pattern))):
+        df = None
+        if store is not None:
+            df = _get_exp_table(store, fpath, labels)
+        if df is None:
+            df = pd.read_table(fpath, header=0, index_col=0)
+        dfs[os.path.basename(fpath)] = df
+
+    return dfs
+
+
+# Whether the tables are read through the consolidated cache
+# when use_cache is not given (e.g., by Data.df_exp).
+_exp_cache_default = False
+
+
+def set_exp_cache_default(use_cache):
+    """Set whether ``read_exp_table`` and ``read_exp_tables`` use
+       the consolidated cache when use_cache is not given.
+       It applies to the lazy experimental results and conditions
+       of the data as well.
+
+    Parameters
+    ----------
+    use_cache : bool
+    """
+    global _exp_cache_default
+    if not isinstance(use_cache, bool):
+        raise TypeError("use_cache should be a bool type value.")
+    _exp_cache_default = use_cache
+
+
+def get_exp_cache_default():
+    """Get whether the consolidated cache is used
+       when use_cache is not given (see ``set_exp_cache_default``).
+    """
+    return _exp_cache_default
+
+
+def get_exp_cache_dir():
+    """Get the directory of the consolidated tables
+       (see ``build_exp_cache``), which is experiments
+       beside the directory of ``get_sif_cache_dir``.
+    """
+    return os.path.join(_get_user_cache_dir(), 'experiments')
+
+
+def build_exp_cache(dpath, pattern="*"):
+    """Consolidate the tables of experimental results in a directory
+       (e.g., a file per experiment of a dataset family)
+       into a single array of the values and an index of the files,
+       which are used by ``read_exp_table`` and ``read_exp_tables``.
+       The values are stored as float64, and the integer columns
+       are converted back when they are read, so the tables
+       should consist of float and integer columns
+       (the integers should be exactly representable in float64).
+       The other tables (e.g., with strings) are not consolidated.
+
+    Parameters
+    ----------
+    dpath : str
+        Directory of the tab-separated files.
+    pattern : str, optional
+        Glob pattern of the file names.
+
+    Returns
+    -------
+    fnames : list of str
+        Names of the consolidated files.
+    """
+    files = {}
+    arrs = []
+    offset = 0
+    for fpath in sorted(glob.glob(os.path.join(dpath, pattern))):
+        if not os.path.isfile(fpath):
+            continue
+
+        try:
+            df = pd.read_table(fpath, header=0, index_col=0)
+        except (ValueError, pd.errors.ParserError):
+            continue
+
+        if not all(dtype in (np.float64, np.int64) for dtype in df.dtypes) \
+                or df.columns.duplicated().any():
+            continue
+
+        values = df.to_numpy(dtype=np.float64)
+        files[os.path.basename(fpath)] = {
+            'size': os.stat(fpath).st_size,
+            'sha1': _hash_file(fpath),
+            'offset': offset,
+            'shape': values.shape,
+            'index': df.index.tolist(),
+            'index_name': df.index.name,
+            'columns': df.columns.tolist(),
+            'dtypes': [str(dtype) for dtype in df.dtypes],
+        }
+        arrs.append(values.ravel())
+        offset += values.size
+    # end of for
+
+    values = np.concatenate(arrs) if arrs else np.zeros((0,))
+    key = _get_exp_cache_key(dpath)
+    dpath_cache = get_exp_cache_dir()
+    os.makedirs(dpath_cache, exist_ok=True)
+    _write_atomic(os.path.join(dpath_cache, key + ".npy"),
+                  lambda fout: np.save(fout, values))
+
+    # The index is written at last, which validates the values.
+    _write_atomic(os.path.join(dpath_cache, key + ".json"),
+                  lambda fout: json.dump({'dpath': os.path.abspath(dpath),
+                                          'files': files}, fout), 'w')
+    return list(files)
+
+
+def clear_exp_cache():
+    """Remove all consolidated tables.
+    """
+    _exp_stores.clear()
+    dpath = get_exp_cache_dir()
+    if not os.path.isdir(dpath):
+        return
+
+    for fname in os.listdir(dpath):
+        if fname.endswith('.npy') or fname.endswith('.json'):
+            os.remove(os.path.join(dpath, fname))
+
+
+def _get_exp_cache_key(dpath):
+    return hashlib.sha1(os.path.abspath(dpath).encode()).hexdigest()
+
+
+# Memory-mapped stores opened in this process:
+# path of the index -> (mtime of the index, store).
+# Only the recently used stores are kept open.
+_exp_stores = OrderedDict()
+_max_exp_stores = 8
+
+
+def _load_exp_store(dpath, mmap_mode):
+    key = _get_exp_cache_key(dpath)
+    dpath_cache = get_exp_cache_dir()
+    fpath_index = os.path.join(dpath_cache, key + ".json")
+    try:
+        mtime_ns = os.stat(fpath_index).st_mtime_ns
+    except OSError:
+        return None
+
+    if mmap_mode is not None and fpath_index in _exp_stores:
+        mtime_ns_store, store = _exp_stores[fpath_index]
+        if mtime_ns_store == mtime_ns:
+            _exp_stores.move_to_end(fpath_index)
+            return store
+
+    try:
+        with open(fpath_index, 'r') as fin:
+            index = json.load(fin)
+        values = np.load(os.path.join(dpath_cache, key + ".npy"),
+                         mmap_mode=mmap_mode)
+    except (OSError, ValueError):
+        return None
+
+    store = (index['files'], values)
+    if mmap_mode is not None:
+        # Only the memory-mapped stores are kept, and the store of
+        # the previous index (if any) is replaced.
+        _exp_stores.pop(fpath_index, None)
+        _exp_stores[fpath_index] = (mtime_ns, store)
+        while len(_exp_stores) > _max_exp_stores:
+            _exp_stores.popitem(last=False)
+    return store
+
+
+def _get_exp_table(store, fpath, labels=None):
+    """Get the table of the file from the consolidated store,
+       or None if the file is not in the store or has been modified.
+    """
+    files, values = store
+    info = files.get(os.path.basename(fpath))
+    if info is None or 'sha1' not in info:
+        return None
+
+    try:
+        stat = os.stat(fpath)
+        # The modification time is not trusted, since the file can be
+        # edited within its resolution without changing the size.
+        if info['size'] != stat.st_size \
+                or info['sha1'] != _hash_file(fpath):
+            return None
+    except OSError:
+        return None
+
+    nrows, ncols = info['shape']
+    offset = info['offset']
+    arr = np.array(values[offset:offset + nrows*ncols]).reshape(nrows, ncols)
+    df = pd.DataFrame(arr,
+                      index=_get_labels(labels, info['index'],
+                                        info['index_name']),
+                      columns=_get_labels(labels, info['columns']))
+
+    dtypes = {col: dtype for col, dtype in zip(df.columns, info['dtypes'])
+              if dtype != 'float64'}
+    if dtypes:
+        df = df.astype(dtypes)
+    return df
+
+
+def _get_labels(labels, items, name=None):
+    if labels is None:
+        return pd.Index(items, name=name)
+
+    key = (tuple(items), name)
+    if key not in labels:
+        labels[key] = pd.Index(items, name=name)
+    return labels[key]
+
+
 def create_from_sif(fpath, abbr=None, inputs=None, outputs=None):
     """Create sfv.base.Data object from SIF file.
 
@@ -119,11 +725,11 @@ def create_from_sif(fpath, abbr=None, inputs=None, outputs=None):
                 self._abbr = os.path.basename(fpath)
 
             self._name = self._abbr
-            A, n2i, dg = read_sif(fpath, as_nx=True)
+            A, n2i = read_sif(fpath)
             self._A = A
             self._n2i = n2i
             self._i2n = {idx: name for name, idx in n2i.items()}
-            self._dg = dg
+            self._dg = None  # Built on the first access
             self._inputs = inputs
 
             if outputs:
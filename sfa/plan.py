@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import scipy.sparse
+
+
+__all__ = ['PerturbationPlan', 'get_plan']
+
+
+# Codes of perturbation types
+NODE = 0
+LINK = 1
+ISOLATION = 2
+
+_type_codes = {'node': NODE, 'link': LINK, 'isolation': ISOLATION}
+_type_names = {code: name for name, code in _type_codes.items()}
+
+
+class PerturbationPlan(object):
+    """Perturbations and inputs of ``sfa.base.Data`` compiled into arrays,
+       so that the algorithms do not look up DataFrames
+       for every target of every condition.
+
+       The targets of the conditions are stored in CSR format:
+       the targets of the i-th condition (i.e., data.names_ptb[i]) are
+       in inds[indptr[i]:indptr[i+1]], and their perturbation types and
+       values are in the same positions of codes and vals.
+
+    Parameters
+    ----------
+    data : sfa.base.Data
+        Data object with perturbation information.
+
+    Attributes
+    ----------
+    indptr : numpy.ndarray
+        Offsets of the conditions.
+    inds : numpy.ndarray
+        Node indices of the targets.
+    codes : numpy.ndarray
+        Perturbation types of the targets:
+        0 (node), 1 (link), or 2 (isolation).
+    vals : numpy.ndarray
+        Perturbation values of the targets.
+    input_inds : numpy.ndarray
+        Node indices of the inputs.
+    input_vals : numpy.ndarray
+        Values of the inputs.
+    """
+
+    def __init__(self, data):
+        n2i = data.n2i
+        df_ptb = data.df_ptb
+        self._n2i = n2i
+        self._df_ptb = df_ptb
+
+        # Compile each target only once.
+        self._targets = {}
+        names_ptb = data.names_ptb if data.names_ptb is not None else []
+        names = sorted(set(target
+                           for targets in names_ptb for target in targets))
+        if df_ptb is not None and len(names) > 0:
+            types = df_ptb.loc[names, "Type"].to_numpy()
+            values = df_ptb.loc[names, "Value"].to_numpy(dtype=np.float64)
+        else:
+            types = ['node'] * len(names)
+            values = [-1.0] * len(names)
+
+        for name, type_ptb, val_ptb in zip(names, types, values):
+            self._compile_target(name, type_ptb, val_ptb)
+
+        counts = [len(targets) for targets in names_ptb]
+        self.indptr = np.zeros((len(counts) + 1,), dtype=np.int64)
+        np.cumsum(counts, out=self.indptr[1:])
+
+        compiled = [self._targets[target]
+                    for targets in names_ptb for target in targets]
+        self.inds = np.array([c[0] for c in compiled], dtype=np.int64)
+        self.codes = np.array([c[1] for c in compiled], dtype=np.int8)
+        self.vals = np.array([c[2] for c in compiled], dtype=np.float64)
+
+        inputs = getattr(data, 'inputs', None)
+        if inputs:
+            self.input_inds = np.array([n2i[inp] for inp in inputs],
+                                       dtype=np.int64)
+            self.input_vals = np.array(list(inputs.values()),
+                                       dtype=np.float64)
+        else:
+            self.input_inds = np.zeros((0,), dtype=np.int64)
+            self.input_vals = np.zeros((0,), dtype=np.float64)
+
+    def __len__(self):
+        return self.indptr.size - 1
+
+    def _compile_target(self, name, type_ptb, val_ptb):
+        if type_ptb not in _type_codes:
+            raise ValueError("Undefined perturbation type: %s" % (type_ptb))
+
+        self._targets[name] = (self._n2i[name],
+                               _type_codes[type_ptb],
+                               float(val_ptb))
+
+    def lookup(self, target):
+        """Get the node index, the type name and the value
+           of perturbation for a given target.
+        """
+        if target not in self._targets:
+            # A target that is not in the conditions of the data
+            if self._df_ptb is not None:
+                self._compile_target(target,
+                                     self._df_ptb.loc[target, "Type"],
+                                     self._df_ptb.loc[target, "Value"])
+            else:
+                self._compile_target(target, 'node', -1.0)
+
+        idx, code, val = self._targets[target]
+        return idx, _type_names[code], val
+
+    def get_condition(self, i):
+        """Get the node indices, the type codes and the values
+           of the targets in the i-th condition.
+        """
+        sl = slice(self.indptr[i], self.indptr[i+1])
+        return self.inds[sl], self.codes[sl], self.vals[sl]
+
+    def create_basal_batch(self, b, inputs=True):
+        """Create the basal activities of all conditions,
+           where the i-th row is the basal activity of the i-th condition.
+           The node type perturbations override the inputs.
+
+        Parameters
+        ----------
+        b : numpy.ndarray
+            1D array of basal activity.
+        inputs : bool, optional
+            Apply the inputs to all conditions.
+        """
+        B = np.tile(b, (len(self), 1))
+        if inputs:
+            B[:, self.input_inds] = self.input_vals
+
+        counts = np.diff(self.indptr)
+        rows = np.repeat(np.arange(len(self)), counts)
+        mask = (self.codes == NODE)
+        B[rows[mask], self.inds[mask]] = self.vals[mask]
+        return B
+
+    def create_basal_delta(self, b):
+        """Create the changes of the basal activity of all conditions
+           from that of the control in a sparse matrix,
+           where the i-th row is the change of the i-th condition.
+           Only the node type perturbations change the basal activity.
+
+        Parameters
+        ----------
+        b : numpy.ndarray
+            1D array of basal activity of the control,
+            where the inputs have been applied.
+        """
+        N = b.shape[0]
+        counts = np.diff(self.indptr)
+        rows = np.repeat(np.arange(len(self)), counts)
+        mask = (self.codes == NODE)
+        rows = rows[mask]
+        inds = self.inds[mask]
+        vals = self.vals[mask]
+
+        # The last one overrides the others for the same node
+        # in a condition, as in create_basal_batch.
+        keys = rows*N + inds
+        _, i_last = np.unique(keys[::-1], return_index=True)
+        i_last = keys.size - 1 - i_last
+        rows = rows[i_last]
+        inds = inds[i_last]
+
+        delta = vals[i_last] - b[inds]
+        return scipy.sparse.csr_matrix((delta, (rows, inds)),
+                                       shape=(len(self), N),
+                                       dtype=b.dtype)
+
+# end of class PerturbationPlan
+
+
+def _get_signature(data):
+    """Get the objects that the plan of the data is compiled from.
+       The signature refers to the objects rather than their ids,
+       so the ids cannot be reused by other objects
+       while the plan is kept.
+    """
+    inputs = getattr(data, 'inputs', None)
+    return (data.df_ptb,
+            data.names_ptb,
+            data.n2i,
+            tuple(inputs.items()) if inputs else None)
+
+
+def _is_same_signature(sig1, sig2):
+    return sig1[0] is sig2[0] \
+           and sig1[1] is sig2[1] \
+           and sig1[2] is sig2[2] \
+           and sig1[3] == sig2[3]
+
+
+def get_plan(data):
+    """Get the perturbation plan of the data, which is compiled
+       at the first call and reused until the perturbation
+       information of the data is replaced.
+       The plan is shared by the data objects of the same
+       ``sfa.base.NetworkStructure`` and inputs,
+       while any of them refers to the plan.
+    """
+    signature = _get_signature(data)
+    plan = getattr(data, '_ptb_plan', None)
+    if plan is None or not _is_same_signature(plan[0], signature):
+        # The data objects sharing a network structure
+        # also share the plans of the same inputs.
+        structure = getattr(data, '_structure', None)
+        if structure is not None and structure.is_shared_by(data):
+            obj = structure._plans.get(signature[3])
+            if obj is None:
+                obj = PerturbationPlan(data)
+                structure._plans[signature[3]] = obj
+        else:
+            obj = PerturbationPlan(data)
+        plan = (signature, obj)
+        data._ptb_plan = plan
+
+    return plan[1]
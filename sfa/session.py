@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+
+__all__ = ['PropagationSession']
+
+
+class PropagationSession(object):
+    """A stateful session of a network propagation algorithm,
+       which keeps the last steady-state and re-solves it incrementally
+       when a few basal activities or the inputs are changed
+       (e.g., what-if analysis of the doses of stimuli).
+
+       If the exact solution is available, the steady-state is linear
+       in the basal activity, so the change of the steady-state is
+       the columns of the exact solution matrix for the changed nodes
+       multiplied by the changes. The columns are computed once
+       with the prepared factorization and kept in the session.
+       Otherwise, the iterative method (or the Krylov subspace method)
+       starts from the last steady-state.
+
+    Parameters
+    ----------
+    alg : sfa.algorithms.NetworkPropagation
+        Initialized algorithm object.
+    b : numpy.ndarray, optional
+        1D array of basal activity without the inputs.
+        A new basal activity of the algorithm is used by default
+        (see ``create_basal_activity``), since the current one
+        may hold the inputs applied by compute_batch.
+
+    Examples
+    --------
+        >>> session = PropagationSession(alg)
+        >>> session.set_inputs({'EGF': 1.0, 'INS': 0.5})
+        >>> session.update({'AKT': -1.0})
+        >>> session.x  # Steady-state
+    """
+
+    def __init__(self, alg, b=None):
+        self._alg = alg
+        if b is None:
+            b = alg.create_basal_activity()
+
+        self._b_base = np.array(b, dtype=alg.params.dtype)
+        self._inputs = {}
+        if not alg.params.no_inputs and alg.data.inputs:
+            self._inputs = dict(alg.data.inputs)
+
+        self.refresh()
+
+    @property
+    def alg(self):
+        return self._alg
+
+    @property
+    def x(self):
+        """Activity at steady-state for the current basal activity.
+        """
+        return self._x
+
+    @property
+    def b(self):
+        """Current basal activity, where the inputs have been applied.
+        """
+        return self._b
+
+    @property
+    def inputs(self):
+        """A copy of the current input condition.
+        """
+        return dict(self._inputs)
+
+    def refresh(self):
+        """Solve the steady-state from scratch, which also removes
+           the accumulated rounding errors of the incremental updates.
+        """
+        alg = self._alg
+        n2i = alg.data.n2i
+
+        self._b = self._b_base.copy()
+        for name, val in self._inputs.items():
+            self._b[n2i[name]] = val
+
+        self._W = alg.W
+        self._cols = {}  # Columns of the exact solution matrix
+        self._x = alg.compute(self._b)
+        return self._x
+
+    def update(self, values):
+        """Change the basal activities of some nodes,
+           and re-solve the steady-state.
+           The inputs override the basal activities of their nodes.
+
+        Parameters
+        ----------
+        values : dict
+            Basal activities of the nodes, where the keys are node names.
+
+        Returns
+        -------
+        x : numpy.ndarray
+            Activity at steady-state.
+        """
+        n2i = self._alg.data.n2i
+        changes = {}
+        for name, val in values.items():
+            self._b_base[n2i[name]] = val
+            if name not in self._inputs:
+                changes[n2i[name]] = val
+
+        return self._resolve(changes)
+
+    def set_inputs(self, inputs):
+        """Replace the input condition, and re-solve the steady-state.
+           The nodes removed from the inputs return
+           to their basal activities.
+
+        Parameters
+        ----------
+        inputs : dict
+            Input condition, where the keys are node names.
+
+        Returns
+        -------
+        x : numpy.ndarray
+            Activity at steady-state.
+        """
+        n2i = self._alg.data.n2i
+        changes = {}
+        for name in self._inputs:
+            if name not in inputs:
+                changes[n2i[name]] = self._b_base[n2i[name]]
+
+        for name, val in inputs.items():
+            changes[n2i[name]] = val
+
+        self._inputs = dict(inputs)
+        return self._resolve(changes)
+
+    def _resolve(self, changes):
+        if self._alg.W is not self._W:
+            # The weight matrix has been replaced.
+            return self.refresh()
+
+        inds = np.array(list(changes.keys()), dtype=np.int64)
+        vals = np.array(list(changes.values()), dtype=self._b.dtype)
+        delta = vals - self._b[inds]
+        mask = (delta != 0)
+        inds = inds[mask]
+        delta = delta[mask]
+        if inds.size == 0:
+            return self._x
+
+        self._b[inds] = vals[mask]
+        if self._alg.uses_exact_solution:
+            x = self._x.copy()
+            for d, col in zip(delta, self._get_columns(inds)):
+                x += d*col
+            self._x = x
+        else:
+            # Warm start from the last steady-state
+            self._x = self._alg.compute(self._b, x0=self._x)
+
+        return self._x
+
+    def _get_columns(self, inds):
+        """Get the columns of the exact solution matrix for the nodes,
+           computing those not in the session at once.
+        """
+        missing = [idx for idx in inds if idx not in self._cols]
+        if missing:
+            N = self._b.size
+            E = np.zeros((N, len(missing)), dtype=self._b.dtype)
+            E[missing, np.arange(len(missing))] = 1
+            C = self._alg.propagate_exact(E)
+            for j, idx in enumerate(missing):
+                self._cols[idx] = np.ascontiguousarray(C[:, j])
+
+        return [self._cols[idx] for idx in inds]
+
+# end of class PropagationSession
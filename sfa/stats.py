@@ -6,7 +6,8 @@ import pandas as pd
 
 
 
-__all__ = ["calc_accuracy",]
+__all__ = ["calc_accuracy",
+           "find_sign_changes",]
            # "calc_auroc",
            # "calc_auprc",
            # "calc_roc_curve",
@@ -36,7 +37,7 @@ def calc_accuracy(df1, df2, get_cons=False):
         #num_cons = consensus.sum(axis=1).sum()  # Number of consensus
         num_cons = consensus.sum()
         
-    acc = (num_cons) / np.float(num_total)  # Accuracy
+    acc = (num_cons) / float(num_total)  # Accuracy
     if get_cons:
         return acc, consensus
     else:
@@ -45,6 +46,21 @@ def calc_accuracy(df1, df2, get_cons=False):
 
 # end of def
 
+
+def find_sign_changes(df_ref, df):
+    """
+    Find the elements whose signs differ between df_ref and df,
+    e.g., to check the results computed in reduced precision.
+
+    df_ref: pandas.DataFrame or numpy.ndarray of the reference
+    df: pandas.DataFrame or numpy.ndarray to be compared
+
+    Returns the boolean mask of the sign changes in the type of df_ref.
+    """
+    return np.sign(df_ref) != np.sign(df)
+
+# end of def
+
 #
 # from sklearn.metrics import roc_curve, auc
 # from sklearn.metrics import roc_auc_score
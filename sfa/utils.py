@@ -9,6 +9,7 @@ from collections import defaultdict
 
 import numpy as np
 import scipy as sp
+import scipy.sparse
 import pandas as pd
 import networkx as nx
 
@@ -90,6 +91,9 @@ def normalize(A, norm_in=True, norm_out=True):
         raise ValueError(
             "The A (adjacency matrix) should be square matrix.")
 
+    if sp.sparse.issparse(A):
+        return _normalize_sparse(A, norm_in, norm_out)
+
     # Build propagation matrix (aka. transition matrix) _W from A
     W = A.copy()
 
@@ -113,10 +117,7 @@ def normalize(A, norm_in=True, norm_out=True):
         else:
             Dr = 1 / np.sqrt(sum_row_A)
         # end of row
-        W = np.multiply(W, np.mat(Dr).T)
-        # Converting np.mat to ndarray
-        # does not cost a lot.
-        W = W.A
+        W = np.multiply(W, np.asarray(Dr)[:, None])
     # end of if
     """
     The normalization above is the same as the follows:
@@ -126,6 +127,41 @@ def normalize(A, norm_in=True, norm_out=True):
 
 
 # end of def normalize
+
+def _normalize_sparse(A, norm_in=True, norm_out=True):
+    """Normalize a sparse matrix in the same way as normalize(),
+       without creating any dense NxN matrix.
+    """
+    if np.issubdtype(A.dtype, np.floating):
+        A = sp.sparse.csr_matrix(A)
+    else:
+        A = sp.sparse.csr_matrix(A, dtype=np.float64)
+    abs_A = abs(A)
+    W = A
+
+    # Norm. out-degree
+    if norm_out == True:
+        sum_col_A = np.asarray(abs_A.sum(axis=0)).ravel()
+        sum_col_A[sum_col_A == 0] = 1
+        if norm_in == False:
+            Dc = 1 / sum_col_A
+        else:
+            Dc = 1 / np.sqrt(sum_col_A)
+        W = W.dot(sp.sparse.diags(Dc))
+
+    # Norm. in-degree
+    if norm_in == True:
+        sum_row_A = np.asarray(abs_A.sum(axis=1)).ravel()
+        sum_row_A[sum_row_A == 0] = 1
+        if norm_out == False:
+            Dr = 1 / sum_row_A
+        else:
+            Dr = 1 / np.sqrt(sum_row_A)
+        W = sp.sparse.diags(Dr).dot(W)
+
+    return sp.sparse.csr_matrix(W)
+
+# end of def _normalize_sparse
     
 def to_networkx_digraph(A, n2i=None):
     if not n2i:
@@ -133,7 +169,7 @@ def to_networkx_digraph(A, n2i=None):
     
     i2n = {ix:name for name, ix in n2i.items()}        
     dg = nx.DiGraph()
-    ind_row, ind_col = A.to_numpy().nonzero()
+    ind_row, ind_col = A.nonzero()
     for ix_trg, ix_src in zip(ind_row, ind_col):
         name_src = i2n[ix_src]
         name_trg = i2n[ix_trg]
@@ -179,17 +215,17 @@ def rand_swap(A, nsamp=10, noself=True, pivots=None, inplace=False):
 
     cnt = 0
     while cnt < nsamp:
-        ir, ic = B.to_numpy().nonzero()
+        ir, ic = B.nonzero()
         if pivots:
             if np.random.uniform() < 0.5:
                 isrc1 = np.random.choice(pivots)
-                nz = B[:, isrc1].to_numpy().nonzero()[0]
+                nz = B[:, isrc1].nonzero()[0]
                 if len(nz) == 0:
                     continue
                 itrg1 = np.random.choice(nz)
             else:
                 itrg1 = np.random.choice(pivots)
-                nz = B[itrg1, :].to_numpy().nonzero()[0]
+                nz = B[itrg1, :].nonzero()[0]
                 if len(nz) == 0:
                     continue
                 isrc1 = np.random.choice(nz)
@@ -255,7 +291,7 @@ def rand_flip(A, nsamp=10, pivots=None, inplace=False):
     else:
         B = A
 
-    ir, ic = B.to_numpy().nonzero()
+    ir, ic = B.nonzero()
     if pivots:
         iflip = np.random.choice(pivots, nsamp)
     else:
@@ -293,16 +329,16 @@ def rand_weights(W, lb=-3, ub=3, inplace=False):
         B = W
     # end of if-else
 
-    ir, ic = B.to_numpy().nonzero()
+    ir, ic = B.nonzero()
     weights_rand = 10 ** np.random.uniform(lb, ub,
                                            size=(ir.size,))
 
-    B[ir, ic] = weights_rand*np.sign(B[ir, ic], dtype=np.float)
+    B[ir, ic] = weights_rand*np.sign(B[ir, ic], dtype=np.float64)
     """The above code is equal to the following:
     
     for i in range(ir.size):
         p, q = ir[i], ic[i]
-        B[p, q] = weights_rand[i] * np.sign(B[p, q], dtype=np.float)
+        B[p, q] = weights_rand[i] * np.sign(B[p, q], dtype=np.float64)
     """
     return B
 
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+import scipy.sparse
+
+from sfa.algorithms.sp import SignalPropagation
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keep the caches of SFA out of the home directory."""
+    path = tmp_path / "cache"
+    monkeypatch.setenv("SFA_CACHE_DIR", str(path))
+    return path
+
+
+@pytest.fixture(scope="session")
+def nelander():
+    import sfa.data.nelander_2008
+    return sfa.data.nelander_2008.create_data()
+
+
+@pytest.fixture(scope="session")
+def molinelli():
+    import sfa.data.molinelli_2013
+    return sfa.data.molinelli_2013.create_data()
+
+
+@pytest.fixture(scope="session")
+def korkut():
+    import sfa.data.korkut_2015a
+    return sfa.data.korkut_2015a.create_data()
+
+
+@pytest.fixture(scope="session")
+def borisov():
+    import sfa.data.borisov_2009
+    return sfa.data.borisov_2009.create_data()
+
+
+@pytest.fixture
+def create_alg():
+    """Create an initialized SignalPropagation for the data
+       with the given parameters.
+    """
+    def create(data, **params):
+        alg = SignalPropagation('SP')
+        for name, val in params.items():
+            setattr(alg.params, name, val)
+        alg.data = data
+        alg.initialize()
+        return alg
+    return create
+
+
+def _compute_batch_reference(alg, W=None):
+    """Compute the batch one condition at a time with the inverse
+       of each perturbed weight matrix, as compute_batch did
+       before it was vectorized.
+    """
+    data = alg.data
+    if W is None:
+        W = alg.W
+    if scipy.sparse.issparse(W):
+        W = W.toarray()
+    W = np.array(W, dtype=np.float64)
+    N = W.shape[0]
+    a = alg.params.alpha
+
+    def solve(W_ptb, b):
+        return (1-a)*np.linalg.inv(np.eye(N) - a*W_ptb).dot(b)
+
+    b_cnt = np.zeros((N,), dtype=np.float64)
+    if not alg.params.no_inputs and data.inputs:
+        for name, val in data.inputs.items():
+            b_cnt[data.n2i[name]] = val
+    x_cnt = solve(W, b_cnt)
+
+    results = []
+    for targets in data.names_ptb:
+        b = b_cnt.copy()
+        W_ptb = W.copy()
+        for target in targets:
+            idx = data.n2i[target]
+            type_ptb = data.df_ptb.loc[target, "Type"]
+            val_ptb = data.df_ptb.loc[target, "Value"]
+            if type_ptb == 'node':
+                b[idx] = val_ptb
+            elif type_ptb == 'link':
+                W_ptb[:, idx] *= val_ptb
+            elif type_ptb == 'isolation':
+                W_ptb[:, idx] *= val_ptb
+                W_ptb[idx, :] *= val_ptb
+        x = solve(W_ptb, b)
+        if alg.params.use_rel_change:
+            x = x - x_cnt
+        results.append(x[data.iadj_to_idf])
+
+    return np.array(results)
+
+
+@pytest.fixture
+def compute_batch_reference():
+    return _compute_batch_reference
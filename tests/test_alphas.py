@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sfa
+
+
+ALPHAS = [0.1, 0.5, 0.9]
+
+
+@pytest.mark.parametrize("use_rel_change", [False, True])
+def test_compute_batch_alphas(korkut, create_alg, use_rel_change):
+    alg = create_alg(korkut, apply_weight_norm=True,
+                     use_rel_change=use_rel_change)
+    results, acc = alg.compute_batch_alphas(ALPHAS)
+
+    assert isinstance(acc, pd.Series)
+    assert list(acc.index) == ALPHAS
+    assert alg.params.alpha == 0.5
+
+    for a in ALPHAS:
+        ref = create_alg(korkut, apply_weight_norm=True,
+                         use_rel_change=use_rel_change, alpha=a)
+        ref.compute_batch()
+        np.testing.assert_allclose(results[a].values,
+                                   ref.result.df_sim.values, atol=1e-12)
+        assert acc[a] == sfa.calc_accuracy(ref.result.df_sim, korkut.df_exp)
+
+
+def test_compute_batch_alphas_link(nelander, create_alg):
+    alg = create_alg(nelander)
+    results, acc = alg.compute_batch_alphas(ALPHAS)
+    assert alg.params.alpha == 0.5
+
+    for a in ALPHAS:
+        ref = create_alg(nelander, alpha=a)
+        ref.compute_batch()
+        np.testing.assert_allclose(results[a].values,
+                                   ref.result.df_sim.values, atol=1e-12)
+        assert 0 <= acc[a] <= 1
+
+
+@pytest.mark.parametrize("params", [dict(), dict(exsol_forbidden=True)])
+def test_compute_batch_alphas_link_modified_W(nelander, create_alg, params):
+    alg = create_alg(nelander, **params)
+    alg.W = 0.5*alg.W
+    W = alg.W
+    results, _ = alg.compute_batch_alphas(ALPHAS)
+
+    # The assigned W is used and kept.
+    assert alg.W is W
+    assert alg.params.alpha == 0.5
+    for a in ALPHAS:
+        ref = create_alg(nelander, alpha=a, **params)
+        ref.W = W.copy()
+        ref.compute_batch()
+        np.testing.assert_allclose(results[a].values,
+                                   ref.result.df_sim.values, atol=1e-12)
+
+    alg.compute_batch()
+    np.testing.assert_allclose(alg.result.df_sim.values,
+                               results[0.5].values, atol=1e-12)
+
+
+def test_propagate_alphas(molinelli, create_alg):
+    alg = create_alg(molinelli)
+    N = alg.W.shape[0]
+    B = np.random.RandomState(0).normal(size=(N, 3))
+    X = alg.propagate_alphas(ALPHAS, B)
+    assert X.shape == (len(ALPHAS), N, 3)
+    for i, a in enumerate(ALPHAS):
+        M = (1-a)*np.linalg.inv(np.eye(N) - a*alg.W)
+        np.testing.assert_allclose(X[i], M.dot(B), atol=1e-12)
+
+
+def test_propagate_alphas_singular(molinelli, create_alg):
+    alg = create_alg(molinelli)
+    N = alg.W.shape[0]
+    with pytest.raises(np.linalg.LinAlgError):
+        alg.propagate_alphas([0.5], np.ones(N), W=2*np.eye(N))
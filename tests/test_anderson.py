@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def alg_slow(korkut, create_alg):
+    # The convergence is slow for alpha close to 1.
+    return create_alg(korkut, apply_weight_norm=True, alpha=0.9)
+
+
+def _basal(alg):
+    b = np.zeros(alg.W.shape[0])
+    b[::7] = 1
+    return b
+
+
+@pytest.mark.parametrize("depth", [1, 5])
+def test_anderson(alg_slow, depth):
+    alg = alg_slow
+    b = _basal(alg)
+    x_exact = alg.propagate_exact(b)
+
+    x, n_plain = alg.propagate_iterative(alg.W, b, b, a=0.9, tol=1e-10)
+    x_acc, n_acc = alg.propagate_iterative(alg.W, b, b, a=0.9, tol=1e-10,
+                                           acceleration='anderson',
+                                           depth=depth)
+    np.testing.assert_allclose(x, x_exact, atol=1e-8)
+    np.testing.assert_allclose(x_acc, x_exact, atol=1e-8)
+    assert n_acc < n_plain
+
+    _, trj = alg.propagate_iterative(alg.W, b, b, a=0.9, tol=1e-10,
+                                     acceleration='anderson', depth=depth,
+                                     get_trj=True)
+    np.testing.assert_array_equal(trj[0], b)
+    assert trj.shape[0] <= n_acc
+
+
+def test_anderson_batch(alg_slow):
+    alg = alg_slow
+    B = np.column_stack([_basal(alg), -_basal(alg), np.roll(_basal(alg), 1)])
+    X, num_iter = alg.propagate_iterative(alg.W, B, B, a=0.9, tol=1e-10,
+                                          acceleration='anderson')
+    assert num_iter.shape == (3,)
+    for j in range(3):
+        np.testing.assert_allclose(X[:, j], alg.propagate_exact(B[:, j]),
+                                   atol=1e-8)
+
+
+def test_anderson_compute_batch(korkut, create_alg, compute_batch_reference):
+    alg = create_alg(korkut, apply_weight_norm=True, exsol_forbidden=True,
+                     acceleration='anderson')
+    alg.compute_batch()
+    np.testing.assert_allclose(alg.result.df_sim.values,
+                               compute_batch_reference(alg), atol=1e-4)
+
+
+def test_unknown_acceleration(molinelli, create_alg):
+    alg = create_alg(molinelli)
+    b = _basal(alg)
+    with pytest.raises(ValueError):
+        alg.propagate_iterative(alg.W, b, b, acceleration='chebyshev')
+    with pytest.raises(ValueError):
+        alg.params.acceleration = 'chebyshev'
+    with pytest.raises(ValueError):
+        alg.params.anderson_depth = 0
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+import importlib
+
+import numpy as np
+import pytest
+import scipy.sparse
+
+import sfa.backends
+from sfa.backends import Backend, DenseBackend
+
+
+DATA_MODULES = ['nelander_2008', 'molinelli_2013', 'korkut_2015a',
+                'schliemann_2011', 'pezze_2012', 'borisov_2009']
+
+
+def _load_data(name):
+    objs = importlib.import_module("sfa.data." + name).create_data()
+    if isinstance(objs, dict):
+        # A few data of the same network are enough.
+        objs = [objs[abbr] for abbr in sorted(objs)[:3]]
+    else:
+        objs = [objs]
+    return objs
+
+
+@pytest.mark.parametrize("name", DATA_MODULES)
+@pytest.mark.parametrize("params", [{},
+                                    {'apply_weight_norm': True,
+                                     'use_rel_change': True},
+                                    {'exsol_forbidden': True}])
+def test_backends_agree(create_alg, name, params):
+    backends = sfa.backends.get_backend_names()
+    for data in _load_data(name):
+        ref = create_alg(data, backend='dense', **params)
+        assert not scipy.sparse.issparse(ref.W)
+        ref.compute_batch()
+        for backend in backends:
+            alg = create_alg(data, backend=backend, **params)
+            assert alg.backend is sfa.backends.get_backend(backend)
+            assert scipy.sparse.issparse(alg.W) == alg.backend.sparse
+            alg.compute_batch()
+            np.testing.assert_allclose(alg.result.df_sim.values,
+                                       ref.result.df_sim.values,
+                                       rtol=1e-10, atol=1e-12)
+
+
+def test_use_sparse(molinelli, create_alg):
+    alg = create_alg(molinelli, use_sparse=True)
+    assert alg.params.backend == 'sparse'
+    assert scipy.sparse.isspmatrix_csr(alg.W)
+    alg.params.use_sparse = False
+    assert alg.params.backend == 'dense'
+
+
+def test_csr_matvec_kernel():
+    rng = np.random.RandomState(0)
+    W = scipy.sparse.random(30, 30, density=0.2, format='csr',
+                            random_state=rng)
+    x = rng.normal(size=(30,))
+    out = np.empty((30,))
+    sfa.backends._csr_matvec(W.indptr, W.indices, W.data, x, out)
+    np.testing.assert_allclose(out, W.dot(x), rtol=1e-14)
+
+
+def test_numba_backend(molinelli, create_alg):
+    pytest.importorskip("numba")
+    backend = sfa.backends.get_backend('numba')
+
+    rng = np.random.RandomState(0)
+    W = scipy.sparse.random(30, 30, density=0.2, format='csr',
+                            random_state=rng)
+    x = rng.normal(size=(30,))
+    out = np.empty((30,))
+    backend.matvec(W, x, out)
+    np.testing.assert_array_equal(out, W.dot(x))
+
+    ref = create_alg(molinelli, exsol_forbidden=True)
+    ref.compute_batch()
+    alg = create_alg(molinelli, exsol_forbidden=True, backend='numba')
+    alg.compute_batch()
+    np.testing.assert_allclose(alg.result.df_sim.values,
+                               ref.result.df_sim.values, atol=1e-12)
+
+
+def test_numba_unavailable(monkeypatch):
+    assert 'numba' in sfa.backends.get_backend_names(available=False)
+
+    monkeypatch.setattr(sfa.backends.NumbaBackend, 'is_available',
+                        lambda self: False)
+    assert 'numba' not in sfa.backends.get_backend_names()
+    with pytest.raises(ValueError):
+        sfa.backends.get_backend('numba')
+
+    # Never selected if it is not available.
+    backend = sfa.backends.select_backend(10000, 0.0001, iterative=True)
+    assert backend.name == 'sparse'
+
+
+def test_select_backend():
+    select = sfa.backends.select_backend
+    assert select(100, 0.1).name == 'dense'
+    assert select(5000, 0.1).name == 'dense'
+    assert select(5000, 0.001).name == 'sparse'
+    assert select(5000, 0.001, num_conds=10000).name == 'dense'
+
+
+def test_register_backend(molinelli, create_alg):
+    class CountingBackend(DenseBackend):
+        name = 'test-dense'
+        calls = 0
+
+        def matvec(self, W, x, out):
+            CountingBackend.calls += 1
+            out[:] = W.dot(x)
+
+    with pytest.raises(TypeError):
+        sfa.backends.register_backend(object())
+
+    with pytest.raises(ValueError):
+        sfa.backends.register_backend(DenseBackend())  # Already registered
+
+    backend = CountingBackend()
+    sfa.backends.register_backend(backend)
+    try:
+        alg = create_alg(molinelli, backend='test-dense',
+                         exsol_forbidden=True)
+        assert alg.backend is backend
+        alg.compute(np.ones(alg.W.shape[0]))
+        assert CountingBackend.calls > 0
+    finally:
+        del sfa.backends._registry['test-dense']
+
+    with pytest.raises(ValueError):
+        create_alg(molinelli, backend='test-dense')
+    with pytest.raises(ValueError):
+        sfa.backends.get_backend('unknown')
+
+    class AutoBackend(Backend):
+        name = 'auto'
+
+    with pytest.raises(ValueError):
+        sfa.backends.register_backend(AutoBackend())
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize("use_rel_change", [False, True])
+@pytest.mark.parametrize("apply_weight_norm", [False, True])
+def test_node_batch(molinelli, create_alg, compute_batch_reference,
+                    use_rel_change, apply_weight_norm):
+    alg = create_alg(molinelli, use_rel_change=use_rel_change,
+                     apply_weight_norm=apply_weight_norm)
+    alg.compute_batch()
+    df_sim = alg.result.df_sim
+    assert df_sim.index.equals(molinelli.df_exp.index)
+    assert df_sim.columns.equals(molinelli.df_exp.columns)
+    np.testing.assert_allclose(df_sim.values, compute_batch_reference(alg),
+                               rtol=1e-10, atol=1e-14)
+
+
+@pytest.mark.parametrize("use_rel_change", [False, True])
+def test_node_batch_iterative(molinelli, create_alg, use_rel_change):
+    alg = create_alg(molinelli, use_rel_change=use_rel_change,
+                     exsol_forbidden=True)
+    alg.compute_batch()
+
+    # Each condition computed alone
+    b = alg.b.copy()
+    B = alg.create_basal_batch(b)
+    X = np.column_stack([alg.compute(B[i]) for i in range(B.shape[0])])
+    if use_rel_change:
+        X -= alg._compute_control(b)[:, np.newaxis]
+    np.testing.assert_allclose(alg.result.df_sim.values,
+                               X[molinelli.iadj_to_idf, :].T,
+                               rtol=1e-12, atol=1e-14)
+
+
+@pytest.mark.parametrize("exsol_method", ['lu', 'inv'])
+@pytest.mark.parametrize("apply_weight_norm", [False, True])
+def test_rel_change_cancels_exactly(borisov, create_alg,
+                                    exsol_method, apply_weight_norm):
+    # GS and RasGAP are linked to the same target with opposite signs,
+    # so inhibiting both of them changes nothing but themselves.
+    data = borisov['120m_AUC_EGF=0.001+I=0.1']
+    i = data.names_ptb.index(['GS', 'RasGAP'])
+    alg = create_alg(data, use_rel_change=True,
+                     exsol_method=exsol_method,
+                     apply_weight_norm=apply_weight_norm)
+    alg.compute_batch()
+
+    row = alg.result.df_sim.iloc[i]
+    targets = [name for name in row.index if name in ('GS', 'RasGAP')]
+    assert (row.drop(targets) == 0).all()
+    assert (row[targets] < 0).all()
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+
+import os
+import threading
+
+import numpy as np
+import pytest
+import scipy.sparse
+
+import sfa.cache
+from sfa.cache import SolutionCache
+
+
+@pytest.fixture
+def default_cache():
+    cache_org = sfa.cache.get_default_cache()
+    cache = SolutionCache()
+    sfa.cache.set_default_cache(cache)
+    yield cache
+    sfa.cache.set_default_cache(cache_org)
+
+
+def test_make_key():
+    W = np.arange(9, dtype=np.float64).reshape(3, 3)
+    key = SolutionCache.make_key(W, alpha=0.5)
+    assert key == SolutionCache.make_key(W.copy(), alpha=0.5)
+    assert key != SolutionCache.make_key(W, alpha=0.1)
+    assert key != SolutionCache.make_key(W.astype(np.float32), alpha=0.5)
+    assert key != SolutionCache.make_key(W.T, alpha=0.5)
+
+    Ws = scipy.sparse.csr_matrix(W)
+    assert SolutionCache.make_key(Ws) \
+           == SolutionCache.make_key(scipy.sparse.csc_matrix(W))
+
+
+def test_lru_eviction():
+    arr = np.zeros((10,), dtype=np.float64)  # 80 bytes
+    cache = SolutionCache(max_bytes=250)
+    cache.put('a', arr)
+    cache.put('b', (arr, arr))
+    assert cache.nbytes == 240
+
+    cache.put('c', arr)  # Evicts 'a'
+    assert 'a' not in cache and cache.nbytes == 240
+    cache.get('b')
+    cache.put('d', arr)  # Evicts 'c' instead of 'b' used recently
+    assert 'b' in cache and 'c' not in cache
+    assert cache.get('c') is None
+
+    cache.put('e', np.zeros((100,)))  # Larger than the budget
+    assert 'e' not in cache
+
+    with pytest.raises(ValueError):
+        SolutionCache(max_bytes=-1)
+
+
+def test_disk_tier(tmp_path):
+    lu = np.arange(6.0).reshape(2, 3)
+    piv = np.array([1, 1], dtype=np.int32)
+    cache = SolutionCache(dpath=str(tmp_path))
+    cache.put('k', (lu, piv))
+    assert os.listdir(str(tmp_path)) == ['k.npz']
+
+    # Another cache (e.g., in another process) loads the whole item.
+    other = SolutionCache(dpath=str(tmp_path))
+    assert 'k' in other
+    item = other.get('k')
+    assert len(item) == 2
+    np.testing.assert_array_equal(item[0], lu)
+    np.testing.assert_array_equal(item[1], piv)
+    assert item[1].dtype == np.int32
+
+    cache.clear(disk=True)
+    assert len(cache) == 0
+    assert 'k' not in SolutionCache(dpath=str(tmp_path))
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_partial_write_is_not_visible(tmp_path):
+    cache = SolutionCache(dpath=str(tmp_path))
+
+    # A writer that failed in the middle leaves only its temporary file.
+    with open(os.path.join(str(tmp_path), 'k.1234.tmp'), 'wb') as fout:
+        fout.write(b'\x93NUMPY')
+    assert 'k' not in cache
+    assert cache.get('k') is None
+
+
+def test_concurrent_writers(tmp_path):
+    arrs = [np.full((1000,), i, dtype=np.float64) for i in range(8)]
+    errors = []
+
+    def work(i):
+        try:
+            cache = SolutionCache(max_bytes=0, dpath=str(tmp_path))
+            for _ in range(20):
+                cache.put('k', (arrs[i], arrs[i]))
+                item = cache.get('k')
+                # Each item is one of the complete items.
+                assert len(item) == 2
+                assert np.all(item[0] == item[0][0])
+                np.testing.assert_array_equal(item[0], item[1])
+        except Exception as err:
+            errors.append(err)
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+
+    assert errors == []
+    assert os.listdir(str(tmp_path)) == ['k.npz']
+
+
+@pytest.mark.parametrize("exsol_method", ['lu', 'inv'])
+def test_use_cache(korkut, create_alg, default_cache, exsol_method):
+    alg1 = create_alg(korkut, use_cache=True, exsol_method=exsol_method)
+    assert len(default_cache) == 1
+    alg1.compute_batch()
+
+    alg2 = create_alg(korkut, use_cache=True, exsol_method=exsol_method)
+    assert len(default_cache) == 1
+    if exsol_method == 'inv':
+        assert alg2._M is alg1._M
+    else:
+        assert alg2._lu[0] is alg1._lu[0]
+    alg2.compute_batch()
+    np.testing.assert_array_equal(alg2.result.df_sim.values,
+                                  alg1.result.df_sim.values)
+
+    # The key depends on the weight matrix.
+    create_alg(korkut, use_cache=True, exsol_method=exsol_method,
+               apply_weight_norm=True)
+    assert len(default_cache) == 2
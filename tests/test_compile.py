@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize("exsol_method", ['lu', 'inv'])
+def test_compute_batches(korkut, create_alg, exsol_method):
+    alg = create_alg(korkut, apply_weight_norm=True,
+                     exsol_method=exsol_method)
+    alg.compute_batch()
+    df_ref = alg.result.df_sim
+
+    model = alg.compile()
+    results = model.compute_batches([korkut]*8, num_workers=8)
+    assert len(results) == 8
+    for result in results:
+        np.testing.assert_array_equal(result.df_sim.values, df_ref.values)
+
+
+def test_contexts_share_lu(korkut, create_alg):
+    alg = create_alg(korkut, apply_weight_norm=True, exsol_method='lu')
+    model = alg.compile()
+    lu_model = model._alg._lu
+    arrs = [arr.copy() for arr in lu_model]
+
+    # The model has its own read-only factors,
+    # which are shared by the contexts.
+    assert lu_model[0] is not alg._lu[0]
+    assert lu_model[1] is not alg._lu[1]
+    for arr in lu_model:
+        assert not arr.flags.writeable
+
+    ctx1 = model.create_context()
+    ctx2 = model.create_context()
+    for ctx in [ctx1, ctx2]:
+        assert ctx._lu[0] is lu_model[0]
+        assert ctx._lu[1] is lu_model[1]
+        assert ctx._lu_base is ctx._lu
+
+    # The solves do not touch the factors, including the pivot indices.
+    ctx1.compute_batch()
+    ctx2.compute_batch()
+    for arr, arr_model in zip(arrs, lu_model):
+        np.testing.assert_array_equal(arr, arr_model)
+
+    # The weight matrix is still shared.
+    assert ctx1.W is model._alg.W
+
+
+def test_contexts_share_inverse(korkut, create_alg):
+    alg = create_alg(korkut, apply_weight_norm=True, exsol_method='inv')
+    model = alg.compile()
+    ctx = model.create_context()
+    assert ctx._M is model._alg._M
+    assert not ctx._M.flags.writeable
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+import pandas as pd
+
+import sfa.base
+
+
+def _names_ptb_reference(df_conds):
+    # The baseline decoding of the conditions, one row at a time
+    return [df_conds.columns[row != 0].tolist()
+            for row in df_conds.to_numpy()]
+
+
+def test_names_ptb(nelander, molinelli, korkut, borisov):
+    for data in [nelander, molinelli, korkut, *borisov.values()]:
+        assert data.names_ptb == _names_ptb_reference(data.df_conds)
+
+
+def test_mat_conds(nelander, molinelli, korkut):
+    for data in [nelander, molinelli, korkut]:
+        mat = data.mat_conds.toarray()
+        assert mat.shape == (data.df_conds.shape[0], len(data.n2i))
+        for i, targets in enumerate(data.names_ptb):
+            cols = sorted(data.n2i[name] for name in targets
+                          if name in data.n2i)
+            assert mat[i].nonzero()[0].tolist() == cols
+
+
+def test_decode_conditions():
+    df_conds = pd.DataFrame([[1, 0, 1], [0, 0, 0], [0, 1, 0]],
+                            columns=["A", "B", "C"])
+    mat_conds = sfa.base._encode_conditions(df_conds)
+    assert sfa.base._decode_conditions(mat_conds, df_conds) \
+           == [["A", "C"], [], ["B"]]
+
+    # No conditions
+    df_conds = df_conds.iloc[:0]
+    mat_conds = sfa.base._encode_conditions(df_conds)
+    assert mat_conds.shape == (0, 3)
+    assert sfa.base._decode_conditions(mat_conds, df_conds) == []
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize("exsol_method", ['auto', 'lu', 'inv'])
+@pytest.mark.parametrize("use_rel_change", [False, True])
+def test_exact_methods(korkut, create_alg, compute_batch_reference,
+                       exsol_method, use_rel_change):
+    alg = create_alg(korkut, apply_weight_norm=True,
+                     exsol_method=exsol_method,
+                     use_rel_change=use_rel_change)
+    alg.compute_batch()
+    np.testing.assert_allclose(alg.result.df_sim.values,
+                               compute_batch_reference(alg),
+                               rtol=1e-10, atol=1e-14)
+
+
+def test_lu_or_inverse(molinelli, create_alg):
+    alg = create_alg(molinelli, exsol_method='lu')
+    assert alg._M is None and alg._lu is not None
+
+    alg = create_alg(molinelli, exsol_method='inv')
+    assert alg._M is not None and alg._lu is None
+
+    # The inverse is computed when more solutions than N are expected.
+    alg = create_alg(molinelli)
+    assert alg._M is None
+    alg._num_solves_expected = 10*alg.W.shape[0]
+    x = alg.propagate_exact(np.ones(alg.W.shape[0]))
+    assert alg._M is not None
+    np.testing.assert_allclose(x, alg._M.sum(axis=1))
+
+
+def test_iterative_agrees(molinelli, create_alg):
+    alg_ex = create_alg(molinelli)
+    alg_ex.compute_batch()
+    alg_it = create_alg(molinelli, exsol_forbidden=True)
+    alg_it.compute_batch()
+    np.testing.assert_allclose(alg_it.result.df_sim.values,
+                               alg_ex.result.df_sim.values, atol=1e-4)
+
+
+@pytest.mark.filterwarnings("ignore::scipy.linalg.LinAlgWarning")
+@pytest.mark.parametrize("exsol_method", ['lu', 'inv'])
+def test_singular_matrix(molinelli, create_alg, exsol_method):
+    alg = create_alg(molinelli, exsol_method=exsol_method)
+    N = alg.W.shape[0]
+    alg.W = 2*np.eye(N)  # I - 0.5*W is zero.
+    with pytest.raises(np.linalg.LinAlgError):
+        alg.prepare_exact_solution()
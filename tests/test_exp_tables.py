@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+import pandas as pd
+import pytest
+
+import sfa
+import sfa.fileio
+
+
+@pytest.fixture
+def dpath_exp(tmp_path):
+    dpath = tmp_path / "exp"
+    dpath.mkdir()
+    (dpath / "exp1.tsv").write_text("name\tA\tB\nc1\t0.5\t-1\nc2\t0\t2.25\n")
+    (dpath / "exp2.tsv").write_text("\tA\tC\nc1\t1.5\tnan\n")
+    (dpath / "conds.tsv").write_text("\tA\tB\tC\nc1\t1\t0\t0\nc2\t0\t1\t1\n")
+    (dpath / "labels.tsv").write_text("name\tA\nc1\tup\n")
+    return str(dpath)
+
+
+@pytest.fixture
+def exp_cache_default():
+    use_cache = sfa.get_exp_cache_default()
+    yield
+    sfa.set_exp_cache_default(use_cache)
+
+
+def _read(fpath):
+    return pd.read_table(fpath, header=0, index_col=0)
+
+
+def _fpaths(dpath):
+    return sorted(os.path.join(dpath, fname) for fname in os.listdir(dpath))
+
+
+def _forbid_parsing(monkeypatch):
+    def read_table(*args, **kwargs):
+        raise AssertionError("The table should not be parsed.")
+    monkeypatch.setattr(sfa.fileio.pd, 'read_table', read_table)
+
+
+def test_read_without_cache(dpath_exp, cache_dir):
+    for fpath in _fpaths(dpath_exp):
+        pd.testing.assert_frame_equal(sfa.read_exp_table(fpath), _read(fpath))
+    assert not os.path.exists(cache_dir)
+
+    # The consolidated tables are not used by default.
+    sfa.build_exp_cache(dpath_exp)
+    fpath = os.path.join(dpath_exp, "exp1.tsv")
+    df_ref = _read(fpath)
+    with open(fpath, 'w') as fout:
+        fout.write("name\tA\nc1\t1\n")
+    assert not sfa.read_exp_table(fpath).equals(df_ref)
+
+
+def test_build_exp_cache(dpath_exp, monkeypatch):
+    # The table with non-numeric values is not consolidated.
+    assert sfa.build_exp_cache(dpath_exp) \
+           == ["conds.tsv", "exp1.tsv", "exp2.tsv"]
+    assert os.listdir(sfa.get_exp_cache_dir())
+
+    fnames = ["conds.tsv", "exp1.tsv", "exp2.tsv"]
+    refs = {fname: _read(os.path.join(dpath_exp, fname))
+            for fname in fnames + ["labels.tsv"]}
+    assert all(dtype == 'int64' for dtype in refs["conds.tsv"].dtypes)
+
+    with monkeypatch.context() as m:
+        _forbid_parsing(m)
+        for fname in fnames:
+            df = sfa.read_exp_table(os.path.join(dpath_exp, fname),
+                                    use_cache=True)
+            pd.testing.assert_frame_equal(df, refs[fname])
+
+        dfs = sfa.read_exp_tables(dpath_exp, pattern="*1.tsv",
+                                  use_cache=True)
+        assert list(dfs) == ["exp1.tsv"]
+
+    dfs = sfa.read_exp_tables(dpath_exp, use_cache=True)
+    assert sorted(dfs) == sorted(refs)
+    for fname, df in dfs.items():
+        pd.testing.assert_frame_equal(df, refs[fname])
+
+    sfa.clear_exp_cache()
+    assert not os.listdir(sfa.get_exp_cache_dir())
+    pd.testing.assert_frame_equal(
+        sfa.read_exp_table(os.path.join(dpath_exp, "exp1.tsv"),
+                           use_cache=True),
+        refs["exp1.tsv"])
+
+
+def test_cache_default(dpath_exp, monkeypatch, exp_cache_default):
+    sfa.build_exp_cache(dpath_exp)
+    fpath = os.path.join(dpath_exp, "exp1.tsv")
+    df_ref = _read(fpath)
+
+    sfa.set_exp_cache_default(True)
+    _forbid_parsing(monkeypatch)
+    pd.testing.assert_frame_equal(sfa.read_exp_table(fpath), df_ref)
+
+    with pytest.raises(TypeError):
+        sfa.set_exp_cache_default(1)
+
+
+def test_modified_table(dpath_exp):
+    sfa.build_exp_cache(dpath_exp)
+    fpath = os.path.join(dpath_exp, "exp1.tsv")
+    stat = os.stat(fpath)
+
+    # The same size and modification time with a different content
+    with open(fpath, 'w') as fout:
+        fout.write("name\tA\tB\nc1\t0.5\t-1\nc2\t0\t2.75\n")
+    os.utime(fpath, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert os.stat(fpath).st_size == stat.st_size
+
+    df = sfa.read_exp_table(fpath, use_cache=True)
+    assert df.loc["c2", "B"] == 2.75
+    df = sfa.read_exp_tables(dpath_exp, use_cache=True)["exp1.tsv"]
+    assert df.loc["c2", "B"] == 2.75
+
+
+def test_bounded_stores(tmp_path):
+    sfa.clear_exp_cache()
+    for i in range(sfa.fileio._max_exp_stores + 3):
+        dpath = tmp_path / ("exp%d" % (i))
+        dpath.mkdir()
+        (dpath / "exp.tsv").write_text("\tA\nc1\t%d.5\n" % (i))
+        sfa.build_exp_cache(str(dpath))
+        df = sfa.read_exp_table(str(dpath / "exp.tsv"), use_cache=True)
+        assert df.loc["c1", "A"] == i + 0.5
+
+        # Rebuilding replaces the store of the directory.
+        sfa.build_exp_cache(str(dpath))
+        sfa.read_exp_table(str(dpath / "exp.tsv"), use_cache=True)
+
+    assert len(sfa.fileio._exp_stores) == sfa.fileio._max_exp_stores
+
+
+def test_bundled_tables(molinelli):
+    import sfa.data.molinelli_2013
+    dpath = os.path.dirname(sfa.data.molinelli_2013.__file__)
+    fnames = sfa.build_exp_cache(dpath, pattern="*.tsv")
+    assert "exp.tsv" in fnames and "conds.tsv" in fnames
+    for fname in ["exp.tsv", "conds.tsv"]:
+        fpath = os.path.join(dpath, fname)
+        pd.testing.assert_frame_equal(sfa.read_exp_table(fpath,
+                                                         use_cache=True),
+                                      _read(fpath))
+    pd.testing.assert_frame_equal(molinelli.df_exp,
+                                  _read(os.path.join(dpath, "exp.tsv")),
+                                  check_dtype=False)
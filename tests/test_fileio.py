@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+import numpy as np
+import pytest
+
+import sfa
+import sfa.fileio
+
+
+def _write_sif(fpath, text, mtime_ns=None):
+    with open(fpath, 'w') as fout:
+        fout.write(text)
+    if mtime_ns is not None:
+        os.utime(fpath, ns=(mtime_ns, mtime_ns))
+
+
+def test_no_cache_by_default(tmp_path, cache_dir):
+    fpath = str(tmp_path / "network.sif")
+    _write_sif(fpath, "A + B\nB - C\n")
+    A, n2i = sfa.read_sif(fpath)
+    assert n2i == {'A': 0, 'B': 1, 'C': 2}
+    assert not os.path.exists(cache_dir)
+
+
+def test_cache(tmp_path, cache_dir):
+    fpath = str(tmp_path / "network.sif")
+    _write_sif(fpath, "A + B\nB - C\n")
+    ref = sfa.read_sif_edges(fpath)
+    ret = sfa.read_sif_edges(fpath, use_cache=True)
+    assert os.listdir(sfa.get_sif_cache_dir())
+
+    # Loaded from the cache
+    ret_cached = sfa.read_sif_edges(fpath, use_cache=True)
+    assert isinstance(ret_cached[0], np.memmap)
+    for r in [ret, ret_cached]:
+        for arr, arr_ref in zip(r[:3], ref[:3]):
+            np.testing.assert_array_equal(arr, arr_ref)
+        assert r[3] == ref[3]
+
+    sfa.clear_sif_cache()
+    assert not os.listdir(sfa.get_sif_cache_dir())
+
+
+def test_cache_same_size_edit(tmp_path):
+    fpath = str(tmp_path / "network.sif")
+    _write_sif(fpath, "A + B\nB - C\n")
+    mtime_ns = os.stat(fpath).st_mtime_ns
+    _, _, sign, _ = sfa.read_sif_edges(fpath, use_cache=True)
+    assert sign.tolist() == [1, -1]
+
+    # The same size and modification time with a different content
+    _write_sif(fpath, "A - B\nB - C\n", mtime_ns)
+    assert os.stat(fpath).st_mtime_ns == mtime_ns
+    _, _, sign, _ = sfa.read_sif_edges(fpath, use_cache=True)
+    assert sign.tolist() == [-1, -1]
+
+
+def test_unwritable_cache_dir(tmp_path, monkeypatch):
+    fpath = str(tmp_path / "network.sif")
+    _write_sif(fpath, "A + B\nB - C\n")
+
+    # The cache directory cannot be created under a regular file.
+    fpath_file = tmp_path / "file"
+    fpath_file.write_text("")
+    monkeypatch.setenv("SFA_CACHE_DIR", str(fpath_file / "cache"))
+    for _ in range(2):
+        src, trg, sign, n2i = sfa.read_sif_edges(fpath, use_cache=True)
+        assert sign.tolist() == [1, -1]
+
+
+def test_write_atomic(tmp_path):
+    fpath = str(tmp_path / "item.json")
+    sfa.fileio._write_atomic(fpath, lambda fout: fout.write("{}"), 'w')
+    with open(fpath) as fin:
+        assert fin.read() == "{}"
+
+    def write(fout):
+        fout.write("[")
+        raise RuntimeError("Interrupted")
+
+    with pytest.raises(RuntimeError):
+        sfa.fileio._write_atomic(fpath, write, 'w')
+
+    # The file is intact, and the temporary file is removed.
+    with open(fpath) as fin:
+        assert fin.read() == "{}"
+    assert os.listdir(tmp_path) == ["item.json"]
+
+
+def _read_sif_reference(fpath, signs={'+': 1, '-': -1}):
+    """The line-by-line parser before the bulk parser was introduced."""
+    dict_links = {}
+    set_nodes = set()
+    with open(fpath, encoding="utf-8-sig") as fin:
+        for line in fin:
+            if line.isspace():
+                continue
+            src, sign, trg = line.strip().split()[:3]
+            set_nodes.update([src, trg])
+            dict_links.setdefault(src, []).append((trg, signs[sign]))
+
+    n2i = {name: i for i, name in enumerate(sorted(set_nodes))}
+    adj = np.zeros((len(n2i), len(n2i)), dtype=int)
+    for name_src, links in dict_links.items():
+        for name_trg, sign in links:
+            adj[n2i[name_trg], n2i[name_src]] = sign
+    return adj, n2i
+
+
+def _bundled_sif_files():
+    import sfa.data
+    dpath = os.path.dirname(sfa.data.__file__)
+    fpaths = []
+    for root, dirs, files in os.walk(dpath):
+        fpaths.extend(os.path.join(root, fname) for fname in sorted(files)
+                      if fname.endswith('.sif'))
+    return sorted(fpaths)
+
+
+def test_read_sif_bundled():
+    fpaths = _bundled_sif_files()
+    assert fpaths
+    for fpath in fpaths:
+        try:
+            adj_ref, n2i_ref = _read_sif_reference(fpath)
+        except KeyError:  # Undefined sign
+            with pytest.raises(KeyError):
+                sfa.read_sif(fpath)
+            continue
+
+        adj, n2i = sfa.read_sif(fpath)
+        assert n2i == n2i_ref
+        np.testing.assert_array_equal(adj, adj_ref)
+
+        adj_sp, _ = sfa.read_sif(fpath, sparse=True)
+        np.testing.assert_array_equal(adj_sp.toarray(), adj_ref)
+
+
+def test_read_sif_edges(tmp_path):
+    fpath = str(tmp_path / "network.sif")
+    text = "\ufeffC + B\n\nA - C\n  \nC - B\nB + A extra\n"
+    _write_sif(fpath, text)
+
+    # The last one of the duplicated links is used.
+    src, trg, sign, n2i = sfa.read_sif_edges(fpath)
+    assert n2i == {'A': 0, 'B': 1, 'C': 2}
+    edges = sorted(zip(src.tolist(), trg.tolist(), sign.tolist()))
+    assert edges == [(0, 2, -1), (1, 0, 1), (2, 1, -1)]
+    assert src.tolist() == sorted(src.tolist())
+
+    adj_ref, n2i_ref = _read_sif_reference(fpath)
+    adj = sfa.edges_to_adjacency(src, trg, sign, len(n2i))
+    np.testing.assert_array_equal(adj, adj_ref)
+
+    # The nodes in the order of appearance
+    _, _, _, n2i = sfa.read_sif_edges(fpath, sort=False)
+    assert n2i == {'C': 0, 'B': 1, 'A': 2}
+
+    _, _, dg = sfa.read_sif(fpath, as_nx=True)
+    assert sorted(dg.edges(data='SIGN')) \
+           == [('A', 'C', -1), ('B', 'A', 1), ('C', 'B', -1)]
+
+
+def test_read_sif_special_names(tmp_path):
+    # The names that pandas would regard as NA or quoted
+    fpath = str(tmp_path / "network.sif")
+    _write_sif(fpath, 'NA + None\nnull - NaN\nn/a + "x\n'
+                      '"q" - \'y\nNULL + #c\nnan - ""\n')
+    adj_ref, n2i_ref = _read_sif_reference(fpath)
+    adj, n2i = sfa.read_sif(fpath)
+    assert n2i == n2i_ref
+    assert {'NA', 'None', 'null', 'NaN', 'n/a', '"x', '""'} <= set(n2i)
+    np.testing.assert_array_equal(adj, adj_ref)
+
+
+def test_read_sif_errors(tmp_path):
+    fpath = str(tmp_path / "network.sif")
+    _write_sif(fpath, "A + B\nB ? C\n")
+    with pytest.raises(KeyError):
+        sfa.read_sif(fpath)
+
+    _write_sif(fpath, "A + B\nB -\n")
+    with pytest.raises(ValueError):
+        sfa.read_sif(fpath)
+
+    _write_sif(fpath, "")
+    adj, n2i = sfa.read_sif(fpath)
+    assert adj.shape == (0, 0) and n2i == {}
+
+
+@pytest.fixture
+def sif_cache_default():
+    use_cache = sfa.get_sif_cache_default()
+    yield
+    sfa.set_sif_cache_default(use_cache)
+
+
+def test_loader_uses_cache(korkut, monkeypatch, sif_cache_default):
+    import sfa.data.korkut_2015a
+    fpath = os.path.join(os.path.dirname(sfa.data.korkut_2015a.__file__),
+                         "model_3250.sif")
+    assert not sfa.get_sif_cache_default()
+    assert sfa.warm_sif_cache([fpath]) == [fpath]
+
+    def parse(*args):
+        raise AssertionError("The SIF file should not be parsed.")
+
+    sfa.set_sif_cache_default(True)
+    monkeypatch.setattr(sfa.fileio, '_parse_sif_edges', parse)
+    data = sfa.data.korkut_2015a.create_data()
+    assert data.n2i == korkut.n2i
+    np.testing.assert_array_equal(data.A, korkut.A)
+
+    # The cache is not used without the default.
+    sfa.set_sif_cache_default(False)
+    with pytest.raises(AssertionError):
+        sfa.data.korkut_2015a.create_data()
+
+    with pytest.raises(TypeError):
+        sfa.set_sif_cache_default(1)
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+import sfa
+from sfa.analysis import fit_weights
+
+
+@pytest.mark.parametrize("use_rel_change", [False, True])
+def test_fit_weights(molinelli, create_alg, use_rel_change):
+    alg = create_alg(molinelli, apply_weight_norm=True,
+                     use_rel_change=use_rel_change)
+    W_init = np.array(alg.W, copy=True)
+    alg.compute_batch()
+    acc_init = sfa.calc_accuracy(alg.result.df_sim, molinelli.df_exp)
+
+    W, acc, df_history = fit_weights(alg, num_steps=50, get_history=True)
+
+    # The weights of the algorithm are not changed.
+    np.testing.assert_array_equal(alg.W, W_init)
+
+    assert list(df_history.columns) == ['loss', 'acc']
+    assert len(df_history) == 50
+    assert df_history['acc'].iloc[0] == acc_init
+    assert df_history['loss'].iloc[-1] < df_history['loss'].iloc[0]
+    assert acc == df_history['acc'].max()
+    assert acc > acc_init
+
+    # The signs of the links are kept.
+    np.testing.assert_array_equal(np.sign(W), np.sign(W_init))
+
+    # The returned weights reproduce the best accuracy.
+    alg.W = W
+    alg.compute_batch()
+    assert sfa.calc_accuracy(alg.result.df_sim, molinelli.df_exp) == acc
+
+
+def test_fit_weights_link_perturb(nelander, create_alg):
+    alg = create_alg(nelander)
+    with pytest.raises(ValueError):
+        fit_weights(alg, num_steps=1)
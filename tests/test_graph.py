@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+import networkx as nx
+import scipy.sparse
+
+import sfa
+import sfa.data.molinelli_2013
+
+
+def _edges(dg):
+    return sorted(dg.edges(data='SIGN'))
+
+
+def test_lazy_graph():
+    data = sfa.data.molinelli_2013.create_data()
+    assert data._dg is None
+
+    # The same graph as read_sif gives
+    fpath = os.path.join(os.path.dirname(sfa.data.molinelli_2013.__file__),
+                         "network.sif")
+    _, _, dg_ref = sfa.read_sif(fpath, as_nx=True)
+
+    dg = data.dg
+    assert isinstance(dg, nx.DiGraph)
+    assert list(dg.nodes) == list(dg_ref.nodes)
+    assert _edges(dg) == _edges(dg_ref)
+    assert data.dg is dg
+
+    data.drop_dg()
+    assert data._dg is None
+    assert _edges(data.dg) == _edges(dg_ref)
+
+    dg_new = nx.DiGraph()
+    data.dg = dg_new
+    assert data.dg is dg_new
+
+
+def test_graph_from_sif(tmp_path):
+    fpath = str(tmp_path / "network.sif")
+    with open(fpath, 'w') as fout:
+        fout.write("A + B\nB - C\nC - A\n")
+
+    data = sfa.create_from_sif(fpath)
+    assert data._dg is None
+    assert data.structure is None
+    assert _edges(data.dg) == [('A', 'B', 1), ('B', 'C', -1), ('C', 'A', -1)]
+
+
+def test_graph_sparse():
+    n2i = {'A': 0, 'B': 1, 'C': 2}
+    A = [[0, 0, -1], [1, 0, 0], [0, -1, 0]]
+    dg = sfa.base._create_dg(scipy.sparse.csr_matrix(A), n2i)
+    assert _edges(dg) == _edges(sfa.base._create_dg(A, n2i))
+    assert _edges(dg) == [('A', 'B', 1), ('B', 'C', -1), ('C', 'A', -1)]
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+
+def _propagate_reference(W, xi, b, a=0.5, lim_iter=1000, tol=1e-5):
+    """The iterative method before the inner loop was optimized."""
+    x_t1 = np.array(xi, dtype=np.float64)
+    trj_x = [x_t1.copy()]
+    num_iter = 0
+    for i in range(lim_iter):
+        x_t2 = a*W.dot(x_t1) + (1-a)*b
+        num_iter += 1
+        if np.linalg.norm(x_t2 - x_t1) <= tol:
+            break
+        trj_x.append(x_t2)
+        x_t1 = x_t2.copy()
+    return x_t2, num_iter, np.array(trj_x)
+
+
+@pytest.fixture
+def alg_korkut(korkut, create_alg):
+    return create_alg(korkut, apply_weight_norm=True)
+
+
+def _basal_batch(alg, k=6):
+    rng = np.random.RandomState(0)
+    N = alg.W.shape[0]
+    B = np.zeros((N, k))
+    for j in range(k):
+        inds = rng.choice(N, size=j+1, replace=False)
+        B[inds, j] = rng.uniform(-1, 1, size=j+1)
+    return B
+
+
+def test_multiple_columns(alg_korkut):
+    alg = alg_korkut
+    B = _basal_batch(alg)
+    X, num_iter = alg.propagate_iterative(alg.W, B, B)
+    assert X.shape == B.shape
+    assert num_iter.shape == (B.shape[1],)
+
+    # Each column has the same result as it is computed alone.
+    for j in range(B.shape[1]):
+        x, n = alg.propagate_iterative(alg.W, B[:, j], B[:, j])
+        assert num_iter[j] == n
+        np.testing.assert_allclose(X[:, j], x, rtol=1e-12, atol=1e-15)
+
+    # The columns converge at different iterations.
+    assert len(set(num_iter.tolist())) > 1
+
+    # The same initial state for all columns
+    xi = np.zeros(B.shape[0])
+    X0, _ = alg.propagate_iterative(alg.W, xi, B)
+    for j in range(B.shape[1]):
+        x, _ = alg.propagate_iterative(alg.W, xi, B[:, j])
+        np.testing.assert_allclose(X0[:, j], x, rtol=1e-12, atol=1e-15)
+
+
+def test_multiple_columns_trajectory(alg_korkut):
+    alg = alg_korkut
+    B = _basal_batch(alg)
+    X, num_iter = alg.propagate_iterative(alg.W, B, B)
+    X_trj, trj = alg.propagate_iterative(alg.W, B, B, get_trj=True)
+    np.testing.assert_array_equal(X_trj, X)
+    assert trj.shape == (num_iter.max(),) + B.shape
+    np.testing.assert_array_equal(trj[0], B)
+
+
+@pytest.mark.parametrize("lim_iter", [1000, 5])
+def test_single_column(alg_korkut, lim_iter):
+    alg = alg_korkut
+    b = _basal_batch(alg)[:, -1]
+    x_ref, n_ref, trj_ref = _propagate_reference(alg.W, b, b,
+                                                 lim_iter=lim_iter)
+
+    x, num_iter = alg.propagate_iterative(alg.W, b, b, lim_iter=lim_iter)
+    assert num_iter == n_ref
+    np.testing.assert_allclose(x, x_ref, rtol=1e-13, atol=1e-16)
+
+    _, trj = alg.propagate_iterative(alg.W, b, b, lim_iter=lim_iter,
+                                     get_trj=True)
+    assert trj.shape == trj_ref.shape
+    np.testing.assert_allclose(trj, trj_ref, rtol=1e-13, atol=1e-16)
+
+    # The input arrays are not modified.
+    np.testing.assert_array_equal(b, _basal_batch(alg)[:, -1])
+
+
+def test_check_interval(alg_korkut):
+    alg = alg_korkut
+    b = _basal_batch(alg)[:, -1]
+    x, n = alg.propagate_iterative(alg.W, b, b)
+    for interval in [2, 5]:
+        x_i, n_i = alg.propagate_iterative(alg.W, b, b,
+                                           check_interval=interval)
+        assert n_i % interval == 0
+        assert n <= n_i < n + interval
+        np.testing.assert_allclose(x_i, x, atol=1e-5)
+
+        B = _basal_batch(alg)
+        _, num_iter = alg.propagate_iterative(alg.W, B, B,
+                                              check_interval=interval)
+        assert np.all(num_iter % interval == 0)
+
+    with pytest.raises(ValueError):
+        alg.propagate_iterative(alg.W, b, b, check_interval=0)
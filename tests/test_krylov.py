@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+import warnings
+
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize("krylov_method", ['gmres', 'bicgstab'])
+@pytest.mark.parametrize("use_rel_change", [False, True])
+def test_krylov_batch(korkut, create_alg, compute_batch_reference,
+                      krylov_method, use_rel_change):
+    alg = create_alg(korkut, apply_weight_norm=True,
+                     use_rel_change=use_rel_change,
+                     krylov_method=krylov_method)
+    assert not alg._exsol_avail
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")  # Every solution converges.
+        alg.compute_batch()
+    np.testing.assert_allclose(alg.result.df_sim.values,
+                               compute_batch_reference(alg), atol=1e-7)
+
+
+@pytest.mark.parametrize("krylov_method", ['gmres', 'bicgstab'])
+def test_krylov_num_iter(korkut, create_alg, krylov_method):
+    alg = create_alg(korkut, apply_weight_norm=True,
+                     krylov_method=krylov_method)
+    alg.compute_batch()
+    num_iter = alg.num_iter
+    assert num_iter > 0
+
+    # The count is reset for each batch.
+    alg.compute_batch()
+    assert alg.num_iter == num_iter
+
+    b = np.ones(alg.W.shape[0])
+    _, n = alg.propagate_krylov(alg.W, b, b, a=0.5, method=krylov_method)
+    alg.compute(b)
+    assert alg.num_iter == num_iter + n
+
+
+def test_krylov_link_batch(nelander, create_alg, compute_batch_reference):
+    alg = create_alg(nelander, krylov_method='gmres')
+    alg.compute_batch()
+    np.testing.assert_allclose(alg.result.df_sim.values,
+                               compute_batch_reference(alg), atol=1e-7)
+
+
+def test_warm_start(korkut, create_alg):
+    alg = create_alg(korkut, apply_weight_norm=True)
+    N = alg.W.shape[0]
+    b = np.zeros(N)
+    b[:5] = 1
+    x_exact = alg.propagate_exact(b)
+
+    x, n_cold = alg.propagate_krylov(alg.W, b, b, a=0.5)
+    np.testing.assert_allclose(x, x_exact, atol=1e-7)
+
+    x, n_warm = alg.propagate_krylov(alg.W, x_exact, b, a=0.5)
+    np.testing.assert_allclose(x, x_exact, atol=1e-7)
+    assert n_warm < n_cold
+
+    # Multiple conditions in the columns
+    B = np.column_stack([b, -b])
+    X, num_iter = alg.propagate_krylov(alg.W, B, B, a=0.5)
+    np.testing.assert_allclose(X, np.column_stack([x_exact, -x_exact]),
+                               atol=1e-7)
+    assert num_iter.shape == (2,)
+
+
+@pytest.mark.parametrize("method", ['gmres', 'bicgstab'])
+def test_not_converged(korkut, create_alg, method):
+    alg = create_alg(korkut, apply_weight_norm=True)
+    b = np.ones(alg.W.shape[0])
+    with pytest.warns(RuntimeWarning, match="did not converge"):
+        alg.propagate_krylov(alg.W, b, b, a=0.5, lim_iter=1, tol=1e-15,
+                             method=method)
+
+
+def test_unknown_method(molinelli, create_alg):
+    alg = create_alg(molinelli)
+    b = np.ones(alg.W.shape[0])
+    with pytest.raises(ValueError):
+        alg.propagate_krylov(alg.W, b, b, method='cg')
+    with pytest.raises(ValueError):
+        alg.params.krylov_method = 'cg'
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+import copy
+
+import numpy as np
+import pytest
+
+
+def _isolation_data(data):
+    # Turn the link perturbations into isolations.
+    data = copy.copy(data)
+    df_ptb = data.df_ptb.copy()
+    df_ptb.loc[df_ptb.Type == 'link', 'Type'] = 'isolation'
+    data.df_ptb = df_ptb
+    return data
+
+
+@pytest.mark.parametrize("isolation", [False, True])
+def test_lowrank_factors(nelander, create_alg, isolation):
+    data = _isolation_data(nelander) if isolation else nelander
+    alg = create_alg(data)
+    for targets in data.names_ptb:
+        inds, vals = [], []
+        W_ptb = alg.W.copy()
+        alg.apply_perturbations(targets, inds, vals, W_ptb)
+
+        inds_lr, vals_lr = [], []
+        U, V = alg.apply_perturbations_lowrank(targets, inds_lr, vals_lr)
+        assert (inds_lr, vals_lr) == (inds, vals)
+        assert U.shape == V.shape and U.shape[1] <= 2*len(targets)
+        np.testing.assert_allclose(alg.W + U.dot(V.T), W_ptb, atol=1e-15)
+
+
+def test_propagate_exact_lowrank(korkut, create_alg):
+    alg = create_alg(korkut, apply_weight_norm=True)
+    N = alg.W.shape[0]
+    a = alg.params.alpha
+    rng = np.random.RandomState(0)
+    b = rng.uniform(-1, 1, N)
+    U = 0.1*rng.uniform(-1, 1, (N, 3))
+    V = 0.1*rng.uniform(-1, 1, (N, 3))
+
+    x = alg.propagate_exact_lowrank(b, U, V)
+    W_ptb = alg.W + U.dot(V.T)
+    x_ref = (1-a)*np.linalg.solve(np.eye(N) - a*W_ptb, b)
+    np.testing.assert_allclose(x, x_ref, atol=1e-12)
+
+    # No update
+    x = alg.propagate_exact_lowrank(b, U[:, :0], V[:, :0])
+    np.testing.assert_allclose(x, alg.propagate_exact(b), atol=0)
+
+
+@pytest.mark.parametrize("exsol_method", ['inv', 'lu'])
+@pytest.mark.parametrize("isolation", [False, True])
+def test_link_batch(nelander, create_alg, compute_batch_reference,
+                    exsol_method, isolation):
+    data = _isolation_data(nelander) if isolation else nelander
+    alg = create_alg(data, exsol_method=exsol_method)
+    alg.compute_batch()
+    np.testing.assert_allclose(alg.result.df_sim.values,
+                               compute_batch_reference(alg), atol=1e-12)
+
+
+def test_link_batch_iterative(nelander, create_alg, compute_batch_reference):
+    # The perturbed weight matrices are copied without the exact solution.
+    alg = create_alg(nelander, exsol_forbidden=True)
+    W = alg.W.copy()
+    alg.compute_batch()
+    np.testing.assert_array_equal(alg.W, W)
+    np.testing.assert_allclose(alg.result.df_sim.values,
+                               compute_batch_reference(alg), atol=1e-4)
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+from sfa.analysis import analyze_perturb
+
+
+def _analyze(alg, data, outputs=None, **kwargs):
+    targets = data.names_ptb[0]
+    return analyze_perturb(alg, data, targets, outputs=outputs, **kwargs)
+
+
+def _forbid_kernel(monkeypatch, alg):
+    def compute_response_kernel(inds=None):
+        raise AssertionError("The response kernel should not be used.")
+    monkeypatch.setattr(alg, 'compute_response_kernel',
+                        compute_response_kernel)
+
+
+def test_outputs_kernel(korkut, create_alg):
+    alg = create_alg(korkut, apply_weight_norm=True)
+    outputs = list(korkut.df_exp.columns)
+    iouts = [korkut.n2i[name] for name in outputs]
+
+    act, F = _analyze(alg, korkut)
+    act_out, F_out = _analyze(alg, korkut, outputs)
+    assert F_out is None
+    assert act_out.shape == (len(outputs),)
+    np.testing.assert_allclose(act_out, act[iouts], atol=1e-5)
+
+
+@pytest.mark.parametrize("params", [dict(exsol_forbidden=True),
+                                    dict(krylov_method='gmres')])
+def test_outputs_fallback(korkut, create_alg, monkeypatch, params):
+    alg = create_alg(korkut, apply_weight_norm=True, **params)
+    assert not alg.uses_exact_solution
+    _forbid_kernel(monkeypatch, alg)
+
+    outputs = list(korkut.df_exp.columns)
+    iouts = [korkut.n2i[name] for name in outputs]
+
+    act, _ = _analyze(alg, korkut)
+    act_out, F_out = _analyze(alg, korkut, outputs)
+    assert F_out is None
+    np.testing.assert_array_equal(act_out, act[iouts])
+
+
+def test_outputs_singular(korkut, create_alg, monkeypatch):
+    alg = create_alg(korkut, apply_weight_norm=True)
+    # The exact solution is not available, e.g., for a singular matrix.
+    monkeypatch.setattr(alg, '_exsol_avail', False)
+    _forbid_kernel(monkeypatch, alg)
+
+    outputs = list(korkut.df_exp.columns)
+    act_out, F_out = _analyze(alg, korkut, outputs)
+    assert act_out.shape == (len(outputs),)
+    assert F_out is None
+
+
+def test_outputs_link_perturb(nelander, create_alg, monkeypatch):
+    alg = create_alg(nelander)
+    _forbid_kernel(monkeypatch, alg)
+    ind = next(i for i, targets in enumerate(nelander.names_ptb)
+               if nelander.df_ptb.loc[targets, "Type"].isin(['link']).any())
+    targets = nelander.names_ptb[ind]
+    outputs = list(nelander.df_exp.columns)
+
+    # The outputs are not used for the link type perturbations.
+    act, F = analyze_perturb(alg, nelander, targets, outputs=outputs)
+    assert act.shape == (nelander.A.shape[0],)
+    assert F is not None
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+
+import pickle
+
+import numpy as np
+
+import sfa.plan
+
+
+def test_pickle_data(borisov):
+    data = borisov[sorted(borisov)[0]]
+    plan = sfa.plan.get_plan(data)
+
+    data2 = pickle.loads(pickle.dumps(data))
+    assert data2.n2i == data.n2i
+    assert data2.names_ptb == data.names_ptb
+    np.testing.assert_array_equal(data2.A, data.A)
+    np.testing.assert_array_equal(data2.df_exp.values, data.df_exp.values)
+
+    # The plans are compiled again for the unpickled structure.
+    assert len(data2.structure._plans) == 0
+    plan2 = sfa.plan.get_plan(data2)
+    np.testing.assert_array_equal(plan2.input_inds, plan.input_inds)
+
+
+def test_pickle_algorithm(borisov, create_alg):
+    data = borisov[sorted(borisov)[0]]
+    alg = create_alg(data, apply_weight_norm=True)
+    alg.compute_batch()
+
+    alg2 = pickle.loads(pickle.dumps(alg))
+    alg2.compute_batch()
+    np.testing.assert_array_equal(alg2.result.df_sim.values,
+                                  alg.result.df_sim.values)
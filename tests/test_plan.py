@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+import copy
+import gc
+
+import numpy as np
+import pytest
+
+import sfa.plan
+from sfa.plan import PerturbationPlan
+
+
+def test_plan_arrays(korkut):
+    plan = PerturbationPlan(korkut)
+    assert len(plan) == len(korkut.names_ptb)
+
+    for i, targets in enumerate(korkut.names_ptb):
+        inds, codes, vals = plan.get_condition(i)
+        assert inds.tolist() == [korkut.n2i[t] for t in targets]
+        assert vals.tolist() == [korkut.df_ptb.loc[t, "Value"]
+                                 for t in targets]
+        assert np.all(codes == sfa.plan.NODE)
+
+    assert plan.input_inds.tolist() == [korkut.n2i[name]
+                                        for name in korkut.inputs]
+    assert plan.lookup(korkut.names_ptb[0][0])[1] == 'node'
+
+
+def test_link_plan(nelander):
+    plan = PerturbationPlan(nelander)
+    for i, targets in enumerate(nelander.names_ptb):
+        _, codes, _ = plan.get_condition(i)
+        types = [nelander.df_ptb.loc[t, "Type"] for t in targets]
+        assert [sfa.plan._type_names[c] for c in codes] == types
+
+
+def test_basal_batch(korkut):
+    plan = PerturbationPlan(korkut)
+    b = np.random.RandomState(0).normal(size=(korkut.A.shape[0],))
+    B = plan.create_basal_batch(b)
+
+    b_cnt = b.copy()
+    for name, val in korkut.inputs.items():
+        b_cnt[korkut.n2i[name]] = val
+
+    for i, targets in enumerate(korkut.names_ptb):
+        b_ref = b_cnt.copy()
+        for t in targets:
+            b_ref[korkut.n2i[t]] = korkut.df_ptb.loc[t, "Value"]
+        np.testing.assert_array_equal(B[i], b_ref)
+
+    D = plan.create_basal_delta(b_cnt)
+    np.testing.assert_array_equal(D.toarray(), B - b_cnt)
+
+    B = plan.create_basal_batch(b, inputs=False)
+    assert np.all(B[:, plan.input_inds] == b[plan.input_inds]) \
+           or len(korkut.inputs) == 0
+
+
+def test_undefined_type(molinelli):
+    data = copy.copy(molinelli)
+    df_ptb = molinelli.df_ptb.copy()
+    df_ptb.loc[molinelli.names_ptb[0][0], "Type"] = 'unknown'
+    data.df_ptb = df_ptb
+    data._ptb_plan = None
+    with pytest.raises(ValueError):
+        sfa.plan.get_plan(data)
+
+
+def test_plan_is_rebuilt(molinelli):
+    data = copy.copy(molinelli)
+    data._ptb_plan = None
+    names = sorted(set(t for targets in molinelli.names_ptb
+                       for t in targets))
+
+    # The replaced conditions are released at once, and the new outer
+    # list is created first, so it reuses the id of the previous one.
+    for i in range(len(names)):
+        data._names_ptb = None
+        names_ptb = []
+        names_ptb.append([names[i]])
+        data._names_ptb = names_ptb
+        del names_ptb
+        assert sfa.plan.get_plan(data).get_condition(0)[0].tolist() \
+               == [molinelli.n2i[names[i]]]
+
+    target = names[0]
+    for val in [-2, -3]:
+        df_ptb = molinelli.df_ptb.copy()
+        df_ptb.loc[target, "Value"] = val
+        data.df_ptb = df_ptb
+        del df_ptb
+        gc.collect()
+        assert sfa.plan.get_plan(data).lookup(target)[2] == val
+
+    plan = sfa.plan.get_plan(data)
+    assert sfa.plan.get_plan(data) is plan
+
+    # The inputs modified in place
+    name = next(iter(molinelli.n2i))
+    data.inputs = dict(molinelli.inputs)
+    data.inputs[name] = 0.3
+    plan = sfa.plan.get_plan(data)
+    assert plan.input_vals[plan.input_inds.tolist().index(
+                                molinelli.n2i[name])] == 0.3
+
+
+def test_shared_plans(borisov):
+    abbrs = sorted(borisov)
+    data1, data2 = borisov[abbrs[0]], borisov[abbrs[1]]
+    assert data1.structure is data2.structure
+    plan1 = sfa.plan.get_plan(data1)
+    assert sfa.plan.get_plan(data2) is plan1
+
+    # The plans of the other inputs are kept while they are used.
+    structure = data1.structure
+    data3 = copy.copy(data1)
+    data3.inputs = {name: 2*val for name, val in data1.inputs.items()}
+    plan3 = sfa.plan.get_plan(data3)
+    assert plan3 is not plan1
+    assert len(structure._plans) >= 2
+
+    num_plans = len(structure._plans)
+    del data3, plan3
+    gc.collect()
+    assert len(structure._plans) == num_plans - 1
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.mark.parametrize("apply_weight_norm", [False, True])
+def test_float32_batch(korkut, create_alg, apply_weight_norm):
+    alg64 = create_alg(korkut, apply_weight_norm=apply_weight_norm)
+    alg64.compute_batch()
+
+    alg32 = create_alg(korkut, apply_weight_norm=apply_weight_norm,
+                       dtype=np.float32)
+    assert alg32.W.dtype == np.float32
+    assert alg32.b.dtype == np.float32
+    alg32.compute_batch()
+
+    df32 = alg32.result.df_sim
+    df64 = alg64.result.df_sim
+    assert df32.values.dtype == np.float32
+    scale = np.abs(df64.values).max()
+    np.testing.assert_allclose(df32.values, df64.values, atol=1e-5*scale)
+
+    changed = alg32.check_precision()
+    assert isinstance(changed, pd.DataFrame)
+    assert changed.shape == df32.shape
+    # Only the values near zero can change their signs.
+    assert np.all(np.abs(df64.values[changed.values]) < 1e-5*scale)
+
+    # The result and the parameters are restored.
+    assert alg32.params.dtype == np.float32
+    assert alg32.W.dtype == np.float32
+    assert alg32.result.df_sim is df32
+
+
+def test_float32_iterative(molinelli, create_alg):
+    alg64 = create_alg(molinelli, exsol_forbidden=True)
+    alg64.compute_batch()
+    alg32 = create_alg(molinelli, exsol_forbidden=True, dtype=np.float32)
+    alg32.compute_batch()
+    np.testing.assert_allclose(alg32.result.df_sim.values,
+                               alg64.result.df_sim.values, atol=1e-4)
+
+
+def test_dtype_errors(create_alg, molinelli):
+    alg = create_alg(molinelli)
+    with pytest.raises(ValueError):
+        alg.params.dtype = np.int64
+    with pytest.raises(TypeError):
+        alg.params.dtype = "not a type"
+    with pytest.raises(ValueError):
+        alg.check_precision()  # compute_batch is not called yet.
+
+
+def test_float32_krylov(borisov, create_alg):
+    data = next(iter(borisov.values()))
+    alg64 = create_alg(data, krylov_method='gmres')
+    alg64.compute_batch()
+    alg32 = create_alg(data, krylov_method='gmres', dtype=np.float32)
+    alg32.compute_batch()
+    assert alg32.compute(alg32.b).dtype == np.float32
+    assert alg32.result.df_sim.values.dtype == np.float32
+    np.testing.assert_allclose(alg32.result.df_sim.values,
+                               alg64.result.df_sim.values, atol=1e-5)
+
+
+@pytest.mark.parametrize("fixture", ['korkut', 'nelander'])
+def test_float32_alphas(request, create_alg, fixture):
+    data = request.getfixturevalue(fixture)
+    alphas = [0.1, 0.9]
+    results64, _ = create_alg(data).compute_batch_alphas(alphas)
+    alg32 = create_alg(data, dtype=np.float32)
+    results32, _ = alg32.compute_batch_alphas(alphas)
+    for a in alphas:
+        assert results32[a].values.dtype == np.float32
+        scale = np.abs(results64[a].values).max()
+        np.testing.assert_allclose(results32[a].values,
+                                   results64[a].values, atol=1e-5*scale)
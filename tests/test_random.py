@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sfa
+from sfa.algorithms.sp import SignalPropagation
+from sfa.analysis import RandomStructureBatchSimulator
+from sfa.analysis import RandomWeightBatchSimulator
+
+
+@pytest.fixture(autouse=True)
+def restore_seterr():
+    # The simulators consider the floating-point warnings as errors.
+    settings = np.geterr()
+    yield
+    np.seterr(**settings)
+
+
+def _create_alg(**params):
+    alg = SignalPropagation('SP')
+    for name, val in params.items():
+        setattr(alg.params, name, val)
+    return alg
+
+
+@pytest.mark.parametrize("params", [{},
+                                    {'exsol_method': 'inv'},
+                                    {'exsol_forbidden': True},
+                                    {'exsol_forbidden': True,
+                                     'acceleration': 'anderson'},
+                                    {'dtype': np.float32}])
+def test_weight_simulator(molinelli, params):
+    alg = _create_alg(**params)
+    sim = RandomWeightBatchSimulator()
+    np.random.seed(0)
+    df = sim.simulate_single(4, alg, molinelli, use_norm=True)
+
+    assert list(df.columns) == [molinelli.abbr]
+    assert list(df.index) == [1, 2, 3, 4]
+    acc = df[molinelli.abbr].values
+    assert np.all((acc > 0) & (acc <= 1))
+    assert np.unique(acc).size > 1  # The weights are sampled each time.
+
+    # The links keep their signs with the sampled weights.
+    A = molinelli.A
+    np.testing.assert_array_equal(np.sign(sim._W), np.sign(A))
+    assert sim._W.dtype == alg.params.dtype
+
+    # The last accuracy is that of the last weights.
+    ref = _create_alg(**params)
+    ref.data = molinelli
+    ref.initialize()
+    ref.W = sfa.normalize(sim._W)
+    ref.compute_batch()
+    assert acc[-1] == sfa.calc_accuracy(ref.result.df_sim,
+                                        molinelli.df_exp)
+
+
+def test_structure_simulator(molinelli):
+    alg = _create_alg()
+    sim = RandomStructureBatchSimulator(nswap=3, nflip=3)
+    np.random.seed(0)
+    df = sim.simulate_single(4, alg, molinelli)
+
+    acc = df[molinelli.abbr].values
+    assert np.all((acc > 0) & (acc <= 1))
+
+    # The randomized network has as many links as the original.
+    A = molinelli.A
+    assert np.count_nonzero(sim._W) == np.count_nonzero(A)
+    assert np.any(sim._W != A)
+    assert alg.W is sim._W
+
+
+def test_simulate_multiple(borisov):
+    mdata = {abbr: borisov[abbr] for abbr in sorted(borisov)[:2]}
+    alg = _create_alg()
+    sim = RandomWeightBatchSimulator()
+    np.random.seed(0)
+    df = sim.simulate_multiple(3, alg, mdata, use_norm=True)
+    assert isinstance(df, pd.DataFrame)
+    assert df.shape == (3, 2)
+    assert set(df.columns) == set(mdata)
+
+    # The algorithm and the data are pickled for the processes.
+    df = sim.simulate_multiple(3, alg, mdata, use_norm=True, max_workers=2)
+    assert df.shape == (3, 2)
+    assert set(df.columns) == set(mdata)
+
+    with pytest.raises(ValueError):
+        sim.simulate_multiple(3, alg, mdata, max_workers=0)
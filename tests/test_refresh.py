@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+
+def _exact(W, a, b):
+    N = W.shape[0]
+    return (1-a)*np.linalg.solve(np.eye(N) - a*W, b)
+
+
+def _change_columns(W, cols, seed=0):
+    rng = np.random.RandomState(seed)
+    W = W.copy()
+    W[:, cols] = rng.uniform(-0.2, 0.2, size=(W.shape[0], len(cols)))
+    return W
+
+
+@pytest.mark.parametrize("exsol_method", ['lu', 'inv'])
+def test_refresh_columns(korkut, create_alg, exsol_method):
+    alg = create_alg(korkut, apply_weight_norm=True,
+                     exsol_method=exsol_method)
+    M_base = alg._M
+    lu_base = alg._lu
+
+    N = alg.W.shape[0]
+    b = np.random.RandomState(1).normal(size=(N, 3))
+    W = _change_columns(alg.W, [3, 10, 42])
+    alg.W = W
+    x = alg.propagate_exact(b)
+    np.testing.assert_allclose(x, _exact(W, 0.5, b), atol=1e-12)
+
+    # The base was refreshed instead of being prepared again.
+    assert alg._lu_base is lu_base
+    if exsol_method == 'lu':
+        assert alg._lu is lu_base and alg._lowrank is not None
+        np.testing.assert_allclose(alg.propagate_exact_transposed(b),
+                                   (1-0.5)*np.linalg.solve(
+                                       (np.eye(N) - 0.5*W).T, b),
+                                   atol=1e-12)
+    else:
+        assert alg._M is not M_base
+
+
+def test_refresh_rows(korkut, create_alg):
+    alg = create_alg(korkut, apply_weight_norm=True, exsol_method='lu')
+    W = _change_columns(alg.W.T, [7, 8]).T
+    alg.W = W
+    b = np.ones(W.shape[0])
+    np.testing.assert_allclose(alg.propagate_exact(b), _exact(W, 0.5, b),
+                               atol=1e-12)
+    assert alg._lowrank is not None
+
+
+@pytest.mark.parametrize("refresh_ratio", [0.0, 0.1])
+def test_full_preparation(korkut, create_alg, refresh_ratio):
+    alg = create_alg(korkut, apply_weight_norm=True, exsol_method='lu',
+                     refresh_ratio=refresh_ratio)
+    lu_base = alg._lu
+
+    # Too many columns (or the refresh is disabled)
+    N = alg.W.shape[0]
+    cols = [0, 1] if refresh_ratio == 0 else list(range(N//5))
+    W = _change_columns(alg.W, cols)
+    alg.W = W
+    b = np.ones(N)
+    np.testing.assert_allclose(alg.propagate_exact(b), _exact(W, 0.5, b),
+                               atol=1e-12)
+    assert alg._lu is not lu_base and alg._lowrank is None
+    if refresh_ratio == 0:
+        # No copy of W is kept for the disabled refresh.
+        assert alg._W_base is None
+
+
+def test_refresh_in_place(korkut, create_alg):
+    # The random simulators modify the weight matrix in place.
+    alg = create_alg(korkut, apply_weight_norm=True, exsol_method='lu')
+    W = alg.W
+    W[:, 5] *= -1
+    alg.W = W
+    b = np.ones(W.shape[0])
+    np.testing.assert_allclose(alg.propagate_exact(b), _exact(W, 0.5, b),
+                               atol=1e-12)
+    assert alg._lowrank is not None
+
+
+    # Disabling the refresh after the preparation
+    alg.params.refresh_ratio = 0.0
+    W[:, 6] *= -1
+    alg.W = W
+    np.testing.assert_allclose(alg.propagate_exact(b), _exact(W, 0.5, b),
+                               atol=1e-12)
+    assert alg._lowrank is None and alg._W_base is None
+
+    with pytest.raises(TypeError):
+        alg.params.refresh_ratio = 1
+    with pytest.raises(ValueError):
+        alg.params.refresh_ratio = 1.5
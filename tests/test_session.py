@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+from sfa.session import PropagationSession
+
+
+@pytest.fixture
+def data(borisov):
+    return next(iter(borisov.values()))
+
+
+def _basal(alg, b_base, inputs):
+    b = np.array(b_base, dtype=np.float64)
+    for name, val in inputs.items():
+        b[alg.data.n2i[name]] = val
+    return b
+
+
+@pytest.mark.parametrize("params", [dict(),
+                                    dict(exsol_method='lu'),
+                                    dict(exsol_forbidden=True),
+                                    dict(krylov_method='gmres')])
+def test_session(data, create_alg, params):
+    alg = create_alg(data, apply_weight_norm=True, **params)
+    atol = 1e-12 if alg.uses_exact_solution else 1e-5
+    session = PropagationSession(alg)
+    assert session.inputs == data.inputs
+
+    b_base = np.zeros(len(data.n2i))
+    inputs = dict(data.inputs)
+    np.testing.assert_allclose(session.x,
+                               alg.compute(_basal(alg, b_base, inputs)),
+                               atol=atol)
+
+    names = sorted(n for n in data.n2i if n not in inputs)[:2]
+    values = {names[0]: 0.5, names[1]: -1.0}
+    x = session.update(values)
+    for name, val in values.items():
+        b_base[data.n2i[name]] = val
+    np.testing.assert_array_equal(session.b, _basal(alg, b_base, inputs))
+    np.testing.assert_allclose(x, alg.compute(session.b), atol=atol)
+
+    # The inputs override the basal activities of their nodes.
+    name_input = next(iter(inputs))
+    session.update({name_input: 0.25})
+    b_base[data.n2i[name_input]] = 0.25
+    assert session.b[data.n2i[name_input]] == inputs[name_input]
+
+    # The removed inputs return to their basal activities.
+    inputs = {name_input: 2.0}
+    x = session.set_inputs(inputs)
+    assert session.inputs == inputs
+    np.testing.assert_array_equal(session.b, _basal(alg, b_base, inputs))
+    np.testing.assert_allclose(x, alg.compute(session.b), atol=atol)
+
+    # No change
+    assert session.update({names[0]: 0.5}) is x
+
+    np.testing.assert_allclose(session.refresh(), x, atol=atol)
+
+
+def test_session_warm_start(data, create_alg):
+    alg = create_alg(data, apply_weight_norm=True, exsol_forbidden=True)
+    session = PropagationSession(alg)
+    name = sorted(n for n in data.n2i if n not in data.inputs)[0]
+
+    alg._num_iter = 0
+    session.update({name: 0.01})
+    n_warm = alg._num_iter
+
+    alg._num_iter = 0
+    alg.compute(session.b)
+    n_cold = alg._num_iter
+    assert n_warm < n_cold
+
+
+def test_session_new_weights(data, create_alg):
+    alg = create_alg(data, apply_weight_norm=True)
+    session = PropagationSession(alg)
+    name = sorted(n for n in data.n2i if n not in data.inputs)[0]
+
+    alg.W = 0.5*alg.W
+    x = session.update({name: 1.0})
+    np.testing.assert_allclose(x, alg.compute(session.b), atol=1e-12)
+
+
+@pytest.mark.parametrize("params", [dict(), dict(krylov_method='gmres')])
+def test_session_after_compute_batch(data, create_alg, params):
+    # compute_batch with the relative change applies the inputs
+    # to the basal activity of the algorithm.
+    alg = create_alg(data, apply_weight_norm=True, use_rel_change=True,
+                     **params)
+    alg.compute_batch()
+    assert np.any(alg.b != 0)
+
+    session = PropagationSession(alg)
+    x = session.set_inputs({})
+    np.testing.assert_array_equal(session.b, np.zeros(len(data.n2i)))
+    np.testing.assert_allclose(x, np.zeros(len(data.n2i)), atol=1e-12)
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+import scipy.sparse
+
+from sfa.analysis import analyze_perturb
+
+
+@pytest.mark.parametrize("use_rel_change", [False, True])
+@pytest.mark.parametrize("name", ['nelander', 'korkut'])
+def test_sparse_batch(request, create_alg, compute_batch_reference,
+                      name, use_rel_change):
+    data = request.getfixturevalue(name)
+    alg = create_alg(data, use_sparse=True, apply_weight_norm=True,
+                     use_rel_change=use_rel_change)
+    assert scipy.sparse.isspmatrix_csr(alg.W)
+    alg.compute_batch()
+
+    ref = create_alg(data, apply_weight_norm=True,
+                     use_rel_change=use_rel_change)
+    np.testing.assert_allclose(alg.W.toarray(), ref.W, atol=1e-15)
+    np.testing.assert_allclose(alg.result.df_sim.values,
+                               compute_batch_reference(ref), atol=1e-10)
+
+
+def test_sparse_iterative(nelander, create_alg):
+    alg = create_alg(nelander, use_sparse=True, exsol_forbidden=True)
+    alg.compute_batch()
+    ref = create_alg(nelander, exsol_forbidden=True)
+    ref.compute_batch()
+    np.testing.assert_allclose(alg.result.df_sim.values,
+                               ref.result.df_sim.values, atol=1e-12)
+
+
+@pytest.mark.parametrize("name", ['nelander', 'korkut'])
+def test_sparse_analyze_perturb(request, create_alg, name):
+    data = request.getfixturevalue(name)
+    targets = data.names_ptb[0]
+
+    alg = create_alg(data, use_sparse=True)
+    act, F = analyze_perturb(alg, data, targets)
+    assert scipy.sparse.isspmatrix_csr(F)
+
+    ref = create_alg(data)
+    act_ref, F_ref = analyze_perturb(ref, data, targets)
+    np.testing.assert_allclose(act, act_ref, atol=1e-12)
+    np.testing.assert_allclose(F.toarray(), F_ref, atol=1e-12)
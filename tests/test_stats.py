@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+
+import pandas as pd
+
+import sfa
+
+
+def test_calc_accuracy():
+    df1 = pd.DataFrame([[1.0, -2.0], [0.0, 3.0]])
+    df2 = pd.DataFrame([[2.0, 1.0], [0.0, 0.5]])
+    acc = sfa.calc_accuracy(df1, df2)
+    assert isinstance(acc, float)
+    assert acc == 0.75
+
+    acc, cons = sfa.calc_accuracy(df1.values[0], df2.values[0],
+                                  get_cons=True)
+    assert acc == 0.5
+    assert cons.tolist() == [True, False]
+
+
+def test_find_sign_changes():
+    df_ref = pd.DataFrame([[1.0, -2.0, 0.0]])
+    df = pd.DataFrame([[0.5, 1e-9, -1e-20]])
+    changed = sfa.find_sign_changes(df_ref, df)
+    assert isinstance(changed, pd.DataFrame)
+    assert changed.values.tolist() == [[False, True, True]]
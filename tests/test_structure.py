@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+import sfa.data.borisov_2009
+
+
+@pytest.fixture
+def borisov_fresh():
+    # The data objects are modified by the tests.
+    return list(sfa.data.borisov_2009.create_data().values())
+
+
+def test_shared_structure(borisov_fresh):
+    data1, data2 = borisov_fresh[:2]
+    structure = data1.structure
+    assert structure is not None
+    assert data2.structure is structure
+    assert data1.n2i is data2.n2i is structure.n2i
+    assert data1.df_ptb is data2.df_ptb is structure.df_ptb
+    assert data1.names_ptb is data2.names_ptb
+
+    # One read-only adjacency matrix is shared.
+    assert data1.A is data2.A is structure.A
+    assert not data1.A.flags.writeable
+    with pytest.raises(ValueError):
+        data1.A[0, 0] = 1
+
+    # The unchanged networks share the directed graph.
+    assert data1.dg is data2.dg is structure.dg
+
+
+def test_copy_adjacency(borisov_fresh, create_alg):
+    data1, data2 = borisov_fresh[:2]
+    A_orig = data2.A.copy()
+
+    i, j = [arr[0] for arr in data1.A.nonzero()]
+    A = data1.copy_A()
+    assert A is data1.A
+    assert A.flags.writeable
+    assert data1.copy_A() is A  # Copied only once
+    data1.A[i, j] = 0
+
+    alg = create_alg(data1)
+    assert alg.W[i, j] == 0
+
+    # The other data and the structure are not affected.
+    assert data2.A is data2.structure.A
+    np.testing.assert_array_equal(data2.A, A_orig)
+    alg = create_alg(data2)
+    assert alg.W[i, j] != 0
+
+    assert not data1.dg.has_edge(data1.i2n[j], data1.i2n[i])
+    assert data2.dg.has_edge(data2.i2n[j], data2.i2n[i])
+
+
+def test_assign_adjacency(borisov_fresh):
+    data1, data2 = borisov_fresh[:2]
+    dg = data1.dg
+    A = np.array(data1.A)
+    A[A != 0] *= -1
+    data1.A = A
+    assert data1.A is A
+    assert data1.dg is not dg
+    assert data2.A is data2.structure.A
+    assert data2.dg is dg
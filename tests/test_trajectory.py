@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+import numpy as np
+import pytest
+
+from sfa.algorithms.np import TrajectoryBuffer
+from sfa.analysis import analyze_perturb
+from sfa.analysis.perturb import diff_trj, resize_trj
+
+
+@pytest.mark.parametrize("in_file", [False, True])
+def test_trajectory_buffer(tmp_path, in_file):
+    fpath = str(tmp_path / "trj.dat") if in_file else None
+    states = np.arange(40*3, dtype=np.float64).reshape(40, 3)
+    buf = TrajectoryBuffer((3,), 40, fpath)
+    for x in states:
+        buf.append(x)
+    assert len(buf) == 40
+
+    trj = buf.to_array()
+    np.testing.assert_array_equal(trj, states)
+    if in_file:
+        assert isinstance(trj, np.memmap)
+        assert os.path.getsize(fpath) == states.nbytes
+
+
+def test_trajectory_stride(korkut, create_alg, tmp_path):
+    alg = create_alg(korkut, apply_weight_norm=True)
+    b = np.zeros(alg.W.shape[0])
+    b[:3] = 1
+    x, num_iter = alg.propagate_iterative(alg.W, b, b)
+    x_trj, trj = alg.propagate_iterative(alg.W, b, b, get_trj=True)
+    np.testing.assert_array_equal(x_trj, x)
+    assert trj.shape == (num_iter, b.size)
+    np.testing.assert_array_equal(trj[0], b)
+
+    for stride in [2, 3]:
+        _, trj_s = alg.propagate_iterative(alg.W, b, b, get_trj=True,
+                                           trj_stride=stride)
+        np.testing.assert_array_equal(trj_s, trj[::stride])
+
+    fpath = str(tmp_path / "trj.dat")
+    _, trj_m = alg.propagate_iterative(alg.W, b, b, get_trj=True,
+                                       trj_fpath=fpath)
+    assert isinstance(trj_m, np.memmap)
+    np.testing.assert_array_equal(trj_m, trj)
+
+    with pytest.raises(ValueError):
+        alg.propagate_iterative(alg.W, b, b, get_trj=True, trj_stride=0)
+
+
+def test_diff_trj():
+    rng = np.random.RandomState(0)
+    trj_long = rng.uniform(size=(7, 4))
+    trj_short = rng.uniform(size=(4, 4))
+    for trj_ctrl, trj_pert in [(trj_long, trj_short),
+                               (trj_short, trj_long),
+                               (trj_long, trj_long)]:
+        ctrl, pert = resize_trj(trj_ctrl, trj_pert)
+        np.testing.assert_array_equal(diff_trj(trj_ctrl, trj_pert),
+                                      pert - ctrl)
+
+
+def test_analyze_perturb_trajectory(korkut, create_alg):
+    alg = create_alg(korkut, apply_weight_norm=True)
+    targets = korkut.names_ptb[0]
+    act, F = analyze_perturb(alg, korkut, targets)
+    act_trj, F_trj, trj = analyze_perturb(alg, korkut, targets,
+                                          get_trj=True)
+    np.testing.assert_array_equal(act_trj, act)
+    np.testing.assert_array_equal(F_trj, F)
+    assert trj.shape[1] == act.size
+    # The trajectory ends before the last iteration of convergence.
+    np.testing.assert_allclose(trj[-1], act, atol=1e-5)
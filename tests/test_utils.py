@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import scipy.sparse
+
+import sfa
+
+
+def _create_matrix():
+    rng = np.random.RandomState(0)
+    A = rng.choice([-1, 0, 0, 1], size=(12, 12)).astype(np.float64)
+    A[3, :] = 0  # A node without incoming links
+    A[:, 5] = 0  # A node without outgoing links
+    return A
+
+
+def test_normalize():
+    A = _create_matrix()
+    W = sfa.normalize(A)
+    assert type(W) is np.ndarray
+
+    sum_row = np.abs(A).sum(axis=1)
+    sum_col = np.abs(A).sum(axis=0)
+    sum_row[sum_row == 0] = 1
+    sum_col[sum_col == 0] = 1
+    W_ref = np.diag(1/np.sqrt(sum_row)).dot(A).dot(np.diag(1/np.sqrt(sum_col)))
+    np.testing.assert_allclose(W, W_ref, rtol=1e-14)
+
+    W = sfa.normalize(A.astype(np.float32))
+    assert W.dtype == np.float32
+    np.testing.assert_allclose(W, W_ref, rtol=1e-6)
+
+
+def test_normalize_sparse():
+    A = _create_matrix()
+    W = sfa.normalize(scipy.sparse.csr_matrix(A))
+    assert scipy.sparse.issparse(W)
+    np.testing.assert_allclose(W.toarray(), sfa.normalize(A), rtol=1e-14)
+
+
+
+def test_rand_weights():
+    A = _create_matrix()
+    np.random.seed(0)
+    B = sfa.rand_weights(A, -3, 0)
+    assert B is not A
+    np.testing.assert_array_equal(np.sign(B), np.sign(A))
+    absw = np.abs(B[A != 0])
+    assert np.all((absw >= 1e-3) & (absw <= 1))
+
+    W = A.astype(np.float32)
+    assert sfa.rand_weights(W, -3, 0, inplace=True) is W
+    np.testing.assert_array_equal(np.sign(W), np.sign(A))
+
+
+def test_rand_flip_and_swap():
+    A = _create_matrix()
+    np.random.seed(0)
+    B = sfa.rand_flip(A, 5)
+    assert B is not A
+    np.testing.assert_array_equal(np.abs(B), np.abs(A))
+    assert 0 < np.count_nonzero(B != A) <= 5
+
+    B = sfa.rand_swap(A, 5)
+    assert np.count_nonzero(B) == np.count_nonzero(A)
+    assert np.sum(B == 1) == np.sum(A == 1)
+    assert np.any(B != A)